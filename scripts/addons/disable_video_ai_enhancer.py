@@ -5,12 +5,16 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 try:
-    import yaml
+    import yaml  # noqa: F401 - only checked here, so other import errors keep their own message
 except ImportError:
     print("ERROR: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+from scripts.addons.registry import FeatureRegistry  # noqa: E402
+
 
 def find_project_root() -> Path:
     """Locate the project root by searching for method/config/features.yml."""
@@ -27,21 +31,14 @@ def find_project_root() -> Path:
 
 def disable_addon(root: Path) -> None:
     """Disable the video_ai_enhancer addon in the feature registry."""
-    features_path = root / "method" / "config" / "features.yml"
-
-    with features_path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
+    with FeatureRegistry(root) as registry:
+        registered = registry.disable("video_ai_enhancer")
 
-    if "addons" not in config or "video_ai_enhancer" not in config["addons"]:
+    if not registered:
         print("✓ video_ai_enhancer addon was not enabled")
         return
 
-    config["addons"]["video_ai_enhancer"]["enabled"] = False
-
-    with features_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
-
-    print(f"✓ Disabled video_ai_enhancer addon in {features_path}")
+    print(f"✓ Disabled video_ai_enhancer addon in {registry.path}")
     print("\nNext steps:")
     print("  1. Add a change log entry in templates-and-examples/templates/change-logs/CHANGELOG-template.md")
     print("  2. Record the decision in docs/decisions/")
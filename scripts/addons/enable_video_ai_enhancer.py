@@ -5,12 +5,16 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 try:
-    import yaml
+    import yaml  # noqa: F401 - only checked here, so other import errors keep their own message
 except ImportError:
     print("ERROR: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+from scripts.addons.registry import FeatureRegistry  # noqa: E402
+
 
 def find_project_root() -> Path:
     """Locate the project root by searching for method/config/features.yml."""
@@ -27,30 +31,15 @@ def find_project_root() -> Path:
 
 def enable_addon(root: Path) -> None:
     """Enable the video_ai_enhancer addon in the feature registry."""
-    features_path = root / "method" / "config" / "features.yml"
-
-    with features_path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
+    with FeatureRegistry(root) as registry:
+        created = registry.enable("video_ai_enhancer")
 
-    if "addons" not in config:
-        config["addons"] = {}
-
-    if "video_ai_enhancer" not in config["addons"]:
-        config["addons"]["video_ai_enhancer"] = {
-            "enabled": True,
-            "version": "0.1.0-alpha",
-            "profile": "baseline",
-            "description": "RJW-IDD add-in for real-time video enhancement/upscaling pipelines with capture, quality, latency, and storage governance.",
-        }
+    if created:
         print("✓ Created video_ai_enhancer addon entry")
     else:
-        config["addons"]["video_ai_enhancer"]["enabled"] = True
         print("✓ Enabled video_ai_enhancer addon (was already defined)")
 
-    with features_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
-
-    print(f"✓ Updated {features_path}")
+    print(f"✓ Updated {registry.path}")
     print("\nNext steps:")
     print("  1. Set a profile: python scripts/addons/set_video_ai_profile.py --profile <profile>")
     print("  2. Add a change log entry in templates-and-examples/templates/change-logs/CHANGELOG-template.md")
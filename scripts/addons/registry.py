@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Transactional updates to the RJW-IDD feature registry (method/config/features.yml).
+
+Apply several add-on operations in one locked read-modify-write, optionally
+across many projects in parallel:
+
+  python scripts/addons/registry.py --op enable:3d_game_core --op profile:3d_game_core=driving
+  python scripts/addons/registry.py --op disable:video_ai_enhancer --projects ../a ../b --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tools.config_loader import dump_yaml, load_yaml  # noqa: E402
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+FEATURES_RELPATH = Path("method") / "config" / "features.yml"
+LOCK_TIMEOUT_SECONDS = 30.0
+LOCK_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class AddonSpec:
+    """Registry defaults and valid profiles for an add-on."""
+
+    name: str
+    enable_script: str
+    profiles: tuple[str, ...]
+    defaults: dict[str, Any]
+
+
+ADDONS: dict[str, AddonSpec] = {
+    "3d_game_core": AddonSpec(
+        name="3d_game_core",
+        enable_script="enable_3d_game_core.py",
+        profiles=(
+            "generic",
+            "first_person",
+            "third_person",
+            "isometric",
+            "platformer",
+            "driving",
+            "action_rpg",
+            "networked",
+        ),
+        defaults={
+            "enabled": True,
+            "version": "0.1.0-alpha",
+            "profile": "generic",
+            "description": "RJW-IDD add-in for all 3D games: profiles, determinism/rollback harnesses, tolerant replays, asset & perf gates, GDD/engine spec templates, IDD pacts.",
+        },
+    ),
+    "video_ai_enhancer": AddonSpec(
+        name="video_ai_enhancer",
+        enable_script="enable_video_ai_enhancer.py",
+        profiles=(
+            "baseline",
+            "live_stream",
+            "broadcast_mastering",
+            "mobile_edge",
+            "remote_collab",
+        ),
+        defaults={
+            "enabled": True,
+            "version": "0.1.0-alpha",
+            "profile": "baseline",
+            "description": "RJW-IDD add-in for real-time video enhancement/upscaling pipelines with capture, quality, latency, and storage governance.",
+        },
+    ),
+}
+
+ACTIONS = ("enable", "disable", "profile")
+
+
+class RegistryError(Exception):
+    """Raised when a registry operation cannot be applied."""
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A single add-on operation, parsed from ``action:addon[=profile]``."""
+
+    action: str
+    addon: str
+    profile: str | None = None
+
+    @classmethod
+    def parse(cls, text: str) -> Operation:
+        action, sep, target = text.partition(":")
+        if not sep or action not in ACTIONS:
+            raise RegistryError(
+                f"invalid operation '{text}'; expected enable:<addon>, disable:<addon> or profile:<addon>=<profile>"
+            )
+        addon, _, profile = target.partition("=")
+        if addon not in ADDONS:
+            raise RegistryError(f"unknown addon '{addon}'; expected one of {', '.join(ADDONS)}")
+        if action == "profile":
+            if profile not in ADDONS[addon].profiles:
+                raise RegistryError(
+                    f"invalid profile '{profile}' for {addon}; expected one of {', '.join(ADDONS[addon].profiles)}"
+                )
+            return cls(action, addon, profile)
+        return cls(action, addon)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a sidecar file, held for one transaction."""
+
+    def __init__(self, path: Path, timeout: float):
+        self.path = path
+        self.timeout = timeout
+        self._handle: Any | None = None
+
+    def acquire(self) -> None:
+        handle = self.path.open("a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:  # pragma: no cover - Windows
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise RegistryError(f"timed out waiting for lock on {self.path}") from None
+                time.sleep(LOCK_POLL_SECONDS)
+        self._handle = handle
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._handle.close()
+            self._handle = None
+
+
+class FeatureRegistry:
+    """Locked read-modify-write transaction over a project's features.yml.
+
+    Use as a context manager; changes are written atomically (temp file +
+    rename) on a clean exit and discarded if the block raises.
+    """
+
+    def __init__(self, root: Path, lock_timeout: float = LOCK_TIMEOUT_SECONDS):
+        self.path = root / FEATURES_RELPATH
+        self._lock = _FileLock(self.path.with_name(self.path.name + ".lock"), lock_timeout)
+        self.config: dict[str, Any] = {}
+        self.dirty = False
+
+    def __enter__(self) -> FeatureRegistry:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cannot locate {self.path}")
+        self._lock.acquire()
+        try:
+            # Read under the lock (bypassing the mtime cache) so concurrent writers are never lost
+            with self.path.open("rb") as handle:
+                self.config = load_yaml(handle) or {}
+        except BaseException:
+            self._lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None and self.dirty:
+                self._write()
+        finally:
+            self._lock.release()
+
+    def _addons(self) -> dict[str, Any]:
+        return self.config.setdefault("addons", {})
+
+    def _write(self) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                dump_yaml(self.config, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(tmp_name, self.path.stat().st_mode & 0o777)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def enable(self, addon: str) -> bool:
+        """Enable an add-on; returns True when a new registry entry was created."""
+        addons = self._addons()
+        self.dirty = True
+        if addon not in addons:
+            addons[addon] = dict(ADDONS[addon].defaults)
+            return True
+        addons[addon]["enabled"] = True
+        return False
+
+    def disable(self, addon: str) -> bool:
+        """Disable an add-on; returns False when it was never registered."""
+        addons = self.config.get("addons") or {}
+        if addon not in addons:
+            return False
+        addons[addon]["enabled"] = False
+        self.dirty = True
+        return True
+
+    def set_profile(self, addon: str, profile: str) -> None:
+        """Set an add-on's active profile; the add-on must already be registered."""
+        addons = self.config.get("addons") or {}
+        if addon not in addons:
+            raise RegistryError(
+                f"{addon} addon not found. Run {ADDONS[addon].enable_script} first."
+            )
+        addons[addon]["profile"] = profile
+        self.dirty = True
+
+    def apply(self, operation: Operation) -> str:
+        """Apply one operation and describe what changed."""
+        if operation.action == "enable":
+            created = self.enable(operation.addon)
+            return f"{'created' if created else 'enabled'} {operation.addon}"
+        if operation.action == "disable":
+            if self.disable(operation.addon):
+                return f"disabled {operation.addon}"
+            return f"{operation.addon} was not enabled"
+        assert operation.profile is not None
+        self.set_profile(operation.addon, operation.profile)
+        return f"set {operation.addon} profile to '{operation.profile}'"
+
+
+def apply_operations(root: Path, operations: list[Operation]) -> list[str]:
+    """Apply operations to one project in a single transaction (all or nothing)."""
+    with FeatureRegistry(root) as registry:
+        return [registry.apply(operation) for operation in operations]
+
+
+def apply_bulk(
+    roots: list[Path], operations: list[Operation], workers: int | None = None
+) -> dict[Path, tuple[bool, list[str]]]:
+    """Apply the same operations to many projects concurrently.
+
+    Returns ``{root: (succeeded, messages)}``; a failure in one project does
+    not affect the others.
+    """
+
+    def _run(root: Path) -> tuple[bool, list[str]]:
+        try:
+            return True, apply_operations(root, operations)
+        except Exception as exc:
+            return False, [str(exc)]
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(roots) or 1))) as pool:
+        return dict(zip(roots, pool.map(_run, roots)))
+
+
+def find_project_root() -> Path:
+    """Locate the project root by searching for method/config/features.yml."""
+    current = Path.cwd()
+    for parent in [current] + list(current.parents):
+        if (parent / FEATURES_RELPATH).exists():
+            return parent
+    raise FileNotFoundError(
+        "Cannot locate method/config/features.yml. "
+        "Run this script from within the RJW-IDD project structure."
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--op",
+        dest="operations",
+        action="append",
+        required=True,
+        help="Operation to apply, in order: enable:<addon>, disable:<addon>, profile:<addon>=<profile>.",
+    )
+    parser.add_argument(
+        "--projects",
+        nargs="+",
+        type=Path,
+        help="Project roots to update in parallel (default: the project containing the cwd).",
+    )
+    parser.add_argument("--workers", type=int, help="Maximum concurrent projects in bulk mode.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    try:
+        args = parse_args(argv)
+        operations = [Operation.parse(text) for text in args.operations]
+        roots = args.projects or [find_project_root()]
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    results = apply_bulk(roots, operations, args.workers)
+    failures = 0
+    for root, (ok, messages) in results.items():
+        if ok:
+            print(f"✓ {root / FEATURES_RELPATH}: {'; '.join(messages)}")
+        else:
+            failures += 1
+            print(f"ERROR: {root}: {'; '.join(messages)}", file=sys.stderr)
+
+    if len(results) > 1:
+        print(f"\n{len(results) - failures}/{len(results)} project(s) updated")
+    if failures == 0:
+        print("\nNext steps:")
+        print("  1. Add a change log entry in templates-and-examples/templates/change-logs/CHANGELOG-template.md")
+        print("  2. Record the decision in docs/decisions/")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
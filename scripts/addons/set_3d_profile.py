@@ -6,23 +6,17 @@ import argparse
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 try:
-    import yaml
+    import yaml  # noqa: F401 - only checked here, so other import errors keep their own message
 except ImportError:
     print("ERROR: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+from scripts.addons.registry import ADDONS, FeatureRegistry  # noqa: E402
 
-VALID_PROFILES = [
-    "generic",
-    "first_person",
-    "third_person",
-    "isometric",
-    "platformer",
-    "driving",
-    "action_rpg",
-    "networked",
-]
+VALID_PROFILES = list(ADDONS["3d_game_core"].profiles)
 
 
 def parse_args() -> argparse.Namespace:
@@ -51,24 +45,10 @@ def find_project_root() -> Path:
 
 def set_profile(root: Path, profile: str) -> None:
     """Update the 3d_game_core profile in the feature registry."""
-    features_path = root / "method" / "config" / "features.yml"
-
-    with features_path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
-
-    if "addons" not in config or "3d_game_core" not in config["addons"]:
-        print(
-            "ERROR: 3d_game_core addon not found. Run enable_3d_game_core.py first.",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-
-    config["addons"]["3d_game_core"]["profile"] = profile
-
-    with features_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+    with FeatureRegistry(root) as registry:
+        registry.set_profile("3d_game_core", profile)
 
-    print(f"✓ Set 3d_game_core profile to '{profile}' in {features_path}")
+    print(f"✓ Set 3d_game_core profile to '{profile}' in {registry.path}")
     print("\nNext steps:")
     print("  1. Add a change log entry in templates-and-examples/templates/change-logs/CHANGELOG-template.md")
     print("  2. Review profile-specific defaults in rjw-idd-methodology/addons/3d-game-core/profiles/")
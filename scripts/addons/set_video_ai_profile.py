@@ -6,20 +6,17 @@ import argparse
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 try:
-    import yaml
+    import yaml  # noqa: F401 - only checked here, so other import errors keep their own message
 except ImportError:
     print("ERROR: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+from scripts.addons.registry import ADDONS, FeatureRegistry  # noqa: E402
 
-VALID_PROFILES = [
-    "baseline",
-    "live_stream",
-    "broadcast_mastering",
-    "mobile_edge",
-    "remote_collab",
-]
+VALID_PROFILES = list(ADDONS["video_ai_enhancer"].profiles)
 
 
 def parse_args() -> argparse.Namespace:
@@ -48,24 +45,10 @@ def find_project_root() -> Path:
 
 def set_profile(root: Path, profile: str) -> None:
     """Update the video_ai_enhancer profile in the feature registry."""
-    features_path = root / "method" / "config" / "features.yml"
-
-    with features_path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
-
-    if "addons" not in config or "video_ai_enhancer" not in config["addons"]:
-        print(
-            "ERROR: video_ai_enhancer addon not found. Run enable_video_ai_enhancer.py first.",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-
-    config["addons"]["video_ai_enhancer"]["profile"] = profile
-
-    with features_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+    with FeatureRegistry(root) as registry:
+        registry.set_profile("video_ai_enhancer", profile)
 
-    print(f"✓ Set video_ai_enhancer profile to '{profile}' in {features_path}")
+    print(f"✓ Set video_ai_enhancer profile to '{profile}' in {registry.path}")
     print("\nNext steps:")
     print("  1. Add a change log entry in templates-and-examples/templates/change-logs/CHANGELOG-template.md")
     print("  2. Review profile-specific defaults in rjw-idd-methodology/addons/video-ai-enhancer/profiles/")
@@ -1,24 +1,85 @@
 #!/usr/bin/env python3
-"""RJW-IDD CI entrypoint orchestrating quality gates."""
+"""RJW-IDD CI entrypoint orchestrating quality gates.
+
+The gate is a declarative graph of steps (ids, evidence, red-green,
+change-log, living-docs, agent-response, governance, tests). Steps whose
+dependencies have passed run concurrently on a bounded worker pool; every
+step runs to completion so one CI pass reports all findings. A step whose
+dependency failed is recorded as ``blocked`` instead of being run.
+
+Each step streams its output to the console (prefixed with the step name)
+and to its own size-capped, line-timestamped ``<step>_<timestamp>.log``, and
+is recorded in ``ci_summary_<timestamp>.json`` with its status, return
+code, duration and output byte counts.
+
+Passing results are cached in ``guard_cache.json`` under the log directory,
+keyed by a fingerprint of the step's command, the content of its declared
+inputs (guard script, ledgers, change log, ...) and, for guards, the changed
+files. A later run with the same fingerprint reuses the pass and records the
+step as ``cached`` instead of executing it. Use ``--no-cache`` to force a
+full run.
+
+The ``tests`` step runs only the test files affected by the diff, chosen
+from the dependency map in ``tools/testing/impact_map.py`` (cached in
+``test_impact.json`` under the log directory), with a periodic full run
+that only counts once it passes. ``--coverage-file`` adds the per-test
+contexts of a pytest-cov run to the map. ``--tests full`` runs the whole
+suite and ``--tests off`` skips it.
+"""
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
+import platform
 import subprocess
 import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools" / "testing"))
+
+from changed_files import ChangedFilesIndex  # noqa: E402
+from impact_map import MAP_FILENAME, Selection, record_full_run, select_tests  # noqa: E402
+
+from tools.subprocess_runner import rotate_logs, run_streaming  # noqa: E402
+
+CACHE_FILENAME = "guard_cache.json"
+CACHE_VERSION = 1
+CACHE_ENTRIES_PER_STEP = 16
+DEFAULT_KEEP_LOGS = 10
+GUARD_SUPPORT = ("tools/testing/guard_runner.py", "tools/testing/changed_files.py")
+LEDGERS = ("artifacts/ledgers/requirement-ledger.csv", "artifacts/ledgers/test-ledger.csv")
+
+EVIDENCE_TRIGGERS = (
+    "research/",
+    "scripts/validate_evidence.py",
+    "tools/rjw_idd_evidence_harvester.py",
+)
+
 
 def _default_log_dir() -> Path:
     return Path(__file__).resolve().parents[2] / "logs" / "ci"
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description=__doc__)
+def _display_path(path: Path, repo_root: Path) -> str:
+    try:
+        return str(path.relative_to(repo_root))
+    except ValueError:
+        return str(path)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument(
         "--base-ref",
         default=os.environ.get("RJW_BASE_REF", "origin/main"),
@@ -35,55 +96,464 @@ def parse_args() -> argparse.Namespace:
         default=_default_log_dir(),
         help="Directory where CI guard artefacts are written (default: logs/ci).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=int(os.environ.get("RJW_CI_JOBS", "0")) or None,
+        help="Maximum steps run concurrently (default: one per CPU, capped at the number of steps).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Run every step even if a previous pass with identical inputs is recorded in {CACHE_FILENAME}.",
+    )
+    parser.add_argument(
+        "--tests",
+        choices=("auto", "full", "off"),
+        default=os.environ.get("RJW_CI_TESTS", "auto"),
+        help="Run affected tests (auto), the whole suite (full) or none (off). Default: auto.",
+    )
+    parser.add_argument(
+        "--coverage-file",
+        type=Path,
+        default=Path(os.environ["RJW_CI_COVERAGE_FILE"]) if os.environ.get("RJW_CI_COVERAGE_FILE") else None,
+        help="pytest-cov data recorded with --cov-context=test; refines the test selection map.",
+    )
+    parser.add_argument(
+        "--keep-logs",
+        type=int,
+        default=int(os.environ.get("RJW_CI_KEEP_LOGS", str(DEFAULT_KEEP_LOGS))),
+        help=f"Keep only the newest N logs per step and N summaries (default: {DEFAULT_KEEP_LOGS}; 0 keeps all).",
+    )
+    return parser.parse_args(argv)
+
+
+@dataclass
+class StepContext:
+    repo_root: Path
+    base_ref: str
+    head_ref: str
+    changed: ChangedFilesIndex
+    python: str = sys.executable
+    tests: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Step:
+    """One node of the CI graph.
+
+    ``command`` builds the argv for the step, or returns ``None`` when the
+    step does not apply to this change set (recorded as ``skipped``).
+    ``inputs`` lists the repo-relative files (or glob patterns) the step
+    reads; together with the changed files (when ``uses_changed``) and
+    ``salt`` they form the cache fingerprint; steps whose result depends on
+    more than they can declare set ``cacheable=False``.
+    """
+
+    name: str
+    command: Callable[[StepContext], list[str] | None]
+    depends_on: tuple[str, ...] = ()
+    description: str = ""
+    inputs: tuple[str, ...] = ()
+    uses_changed: bool = False
+    salt: Callable[[StepContext], str] | None = None
+    cacheable: bool = True
+
+
+@dataclass
+class StepResult:
+    step: str
+    status: str
+    returncode: int | None = None
+    duration: float = 0.0
+    log_path: str | None = None
+    depends_on: list[str] = field(default_factory=list)
+    command: list[str] | None = None
+    reason: str | None = None
+    fingerprint: str | None = None
+    output: dict[str, Any] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "step": self.step,
+            "status": self.status,
+            "returncode": self.returncode,
+            "duration": round(self.duration, 3),
+            "log_path": self.log_path,
+            "depends_on": self.depends_on,
+            "command": self.command,
+            "reason": self.reason,
+            "fingerprint": self.fingerprint,
+            "output": self.output,
+        }
+
+
+def _validate_ids(ctx: StepContext) -> list[str]:
+    return [ctx.python, str(ctx.repo_root / "scripts" / "validate_ids.py"), "--root", str(ctx.repo_root)]
+
+
+def _validate_evidence(ctx: StepContext) -> list[str] | None:
+    if not ctx.changed.has_any_prefix(EVIDENCE_TRIGGERS):
+        return None
+    research = ctx.repo_root / "research"
+    return [
+        ctx.python,
+        str(ctx.repo_root / "scripts" / "validate_evidence.py"),
+        "--input",
+        str(research / "evidence_index.json"),
+        "--raw",
+        str(research / "evidence_index_raw.json"),
+        "--cutoff-days",
+        "14",
+        "--fail-on-warning",
+    ]
+
+
+def _guard(name: str, *extra: str) -> Callable[[StepContext], list[str]]:
+    def build(ctx: StepContext) -> list[str]:
+        return [
+            ctx.python,
+            str(ctx.repo_root / "tools" / "testing" / "guard_runner.py"),
+            "--root",
+            str(ctx.repo_root),
+            "--only",
+            name,
+            *extra,
+            "--files",
+            *ctx.changed,
+        ]
+
+    return build
+
+
+def _run_tests(ctx: StepContext) -> list[str] | None:
+    if not ctx.tests:
+        return None
+    return [ctx.python, "-m", "pytest", "-q", *ctx.tests]
+
 
+def _utc_day(ctx: StepContext) -> str:
+    # Evidence freshness is judged against today's date, so a pass only holds for the day
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-def run_test_gate(
+
+def _guard_inputs(script: str, *files: str) -> tuple[str, ...]:
+    return (f"tools/testing/{script}", *GUARD_SUPPORT, *files)
+
+
+# Guards reading the ledgers and change log only make sense once those parse.
+STEPS: tuple[Step, ...] = (
+    Step(
+        "ids",
+        _validate_ids,
+        description="Ledgers, IDs and change-log references stay in sync.",
+        inputs=("scripts/validate_ids.py", *LEDGERS, "docs/change-log.md"),
+    ),
+    Step(
+        "evidence",
+        _validate_evidence,
+        description="Evidence freshness when research inputs change.",
+        inputs=("scripts/validate_evidence.py", "research/evidence_index.json", "research/evidence_index_raw.json"),
+        salt=_utc_day,
+    ),
+    Step(
+        "red-green",
+        _guard("red-green"),
+        description="Code changes ship alongside tests.",
+        inputs=_guard_inputs("red_green_guard.py"),
+        uses_changed=True,
+    ),
+    Step(
+        "change-log",
+        _guard("change-log"),
+        ("ids",),
+        "Governed changes add a change-log entry.",
+        inputs=_guard_inputs(
+            "change_log_guard.py", "templates-and-examples/templates/change-logs/CHANGELOG-template.md"
+        ),
+        uses_changed=True,
+    ),
+    Step(
+        "living-docs",
+        _guard("living-docs", "--fail-on-placeholder"),
+        description="Doc gaps are cleared and no placeholder rows remain.",
+        inputs=_guard_inputs("living_docs_guard.py", "docs/living-docs-reconciliation.md"),
+        uses_changed=True,
+    ),
+    Step(
+        "agent-response",
+        _guard("agent-response"),
+        description="Agent artefacts follow the dual-output policy.",
+        inputs=_guard_inputs("agent_response_guard.py"),
+        uses_changed=True,
+    ),
+    Step(
+        "governance",
+        _guard("governance"),
+        ("ids",),
+        "Specs, ledgers and decision logs stay aligned.",
+        inputs=_guard_inputs("governance_alignment_guard.py", LEDGERS[0], "docs/decisions/*"),
+        uses_changed=True,
+    ),
+    Step("tests", _run_tests, description="Tests affected by the change pass.", cacheable=False),
+)
+
+
+def validate_graph(steps: Iterable[Step]) -> list[Step]:
+    """Check names and dependencies; returns the steps in a valid run order."""
+    by_name: dict[str, Step] = {}
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"duplicate CI step '{step.name}'")
+        by_name[step.name] = step
+    for step in by_name.values():
+        for dep in step.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"CI step '{step.name}' depends on unknown step '{dep}'")
+
+    ordered: list[Step] = []
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(step: Step, trail: tuple[str, ...]) -> None:
+        if state.get(step.name) == 2:
+            return
+        if state.get(step.name) == 1:
+            raise ValueError(f"CI step cycle: {' -> '.join(trail + (step.name,))}")
+        state[step.name] = 1
+        for dep in step.depends_on:
+            visit(by_name[dep], trail + (step.name,))
+        state[step.name] = 2
+        ordered.append(step)
+
+    for step in by_name.values():
+        visit(step, ())
+    return ordered
+
+
+def _summarise_command(command: list[str]) -> list[str]:
+    """Collapse the changed-file list so logs and summaries stay readable."""
+    if "--files" not in command:
+        return list(command)
+    cut = command.index("--files") + 1
+    return command[:cut] + [f"<{len(command) - cut} file(s)>"]
+
+
+def run_step(step: Step, ctx: StepContext, *, log_dir: Path, timestamp: str) -> StepResult:
+    result = StepResult(step.name, "skipped", depends_on=list(step.depends_on))
+    command = step.command(ctx)
+    if command is None:
+        result.reason = "not applicable to this change set"
+        return result
+
+    result.command = _summarise_command(command)
+    log_path = log_dir / f"{step.name}_{timestamp}.log"
+    header = (
+        f"# {step.name} @ {timestamp}",
+        f"# base_ref={ctx.base_ref} head_ref={ctx.head_ref}",
+        f"# command: {' '.join(result.command)}",
+    )
+    start = time.perf_counter()
+    try:
+        # Lines are prefixed with the step name because concurrent steps share the console
+        run = run_streaming(
+            command, cwd=ctx.repo_root, log_path=log_path, header=header, echo_prefix=f"[{step.name}] "
+        )
+        returncode = run.returncode
+        result.output = run.summary()
+    except OSError as exc:
+        returncode = 1
+        message = f"{step.name}: failed to start: {exc}"
+        print(message, file=sys.stderr)
+        log_path.write_text("\n".join((*header, "", message, "")), encoding="utf-8")
+    result.duration = time.perf_counter() - start
+
+    result.returncode = returncode
+    result.status = "passed" if returncode == 0 else "failed"
+    result.log_path = _display_path(log_path, ctx.repo_root)
+    return result
+
+
+class GuardCache:
+    """Persistent record of passing steps keyed by an input fingerprint.
+
+    Only passes are stored, a bounded number per step. File digests are
+    memoised for the lifetime of the cache so inputs shared between steps
+    (ledgers, changed files) are hashed once per run.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict[str, dict[str, Any]]] = {}
+        self.dirty = False
+        self._digests: dict[Path, str] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == CACHE_VERSION:
+            entries = payload.get("entries")
+            if isinstance(entries, dict):
+                self.entries = entries
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps({"version": CACHE_VERSION, "entries": self.entries}, indent=2), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self.dirty = False
+
+    def _digest(self, path: Path) -> str:
+        cached = self._digests.get(path)
+        if cached is not None:
+            return cached
+        hasher = hashlib.sha256()
+        try:
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+        except IsADirectoryError:
+            digest = "directory"
+        except OSError:
+            digest = "missing"
+        self._digests[path] = digest
+        return digest
+
+    @staticmethod
+    def _expand(root: Path, pattern: str) -> list[str]:
+        if not any(char in pattern for char in "*?["):
+            return [pattern]
+        return sorted(path.relative_to(root).as_posix() for path in root.glob(pattern) if path.is_file())
+
+    def fingerprint(self, step: Step, ctx: StepContext, command: list[str]) -> str:
+        root = str(ctx.repo_root)
+        hasher = hashlib.sha256()
+        hasher.update(f"{CACHE_VERSION}\0{step.name}\0{platform.python_version()}\0".encode())
+        # The interpreter path and checkout location do not affect the result
+        for arg in command[1:]:
+            hasher.update(arg.replace(root, "<root>").encode() + b"\0")
+        for pattern in step.inputs:
+            for relative in self._expand(ctx.repo_root, pattern):
+                hasher.update(f"in\0{relative}\0{self._digest(ctx.repo_root / relative)}\0".encode())
+        if step.uses_changed:
+            for relative in ctx.changed:
+                hasher.update(f"changed\0{relative}\0{self._digest(ctx.repo_root / relative)}\0".encode())
+        if step.salt is not None:
+            hasher.update(f"salt\0{step.salt(ctx)}".encode())
+        return hasher.hexdigest()
+
+    def lookup(self, step: str, fingerprint: str) -> dict[str, Any] | None:
+        return self.entries.get(step, {}).get(fingerprint)
+
+    def record(self, result: StepResult, timestamp: str) -> None:
+        if result.status != "passed" or result.fingerprint is None:
+            return
+        with self._lock:
+            entries = self.entries.setdefault(result.step, {})
+            entries.pop(result.fingerprint, None)
+            entries[result.fingerprint] = {
+                "timestamp": timestamp,
+                "log_path": result.log_path,
+                "duration": round(result.duration, 3),
+            }
+            while len(entries) > CACHE_ENTRIES_PER_STEP:
+                entries.pop(next(iter(entries)))
+            self.dirty = True
+
+    def runner(self, step: Step, ctx: StepContext, *, log_dir: Path, timestamp: str) -> StepResult:
+        """``run_graph`` runner that reuses cached passes and records new ones."""
+        command = step.command(ctx)
+        if command is None or not step.cacheable:
+            return run_step(step, ctx, log_dir=log_dir, timestamp=timestamp)
+        fingerprint = self.fingerprint(step, ctx, command)
+        hit = self.lookup(step.name, fingerprint)
+        if hit is not None:
+            log_path = hit.get("log_path")
+            if log_path is not None and not (ctx.repo_root / log_path).is_file():
+                # --keep-logs rotation may have removed the passing run's log
+                log_path = None
+            return StepResult(
+                step.name,
+                "cached",
+                0,
+                depends_on=list(step.depends_on),
+                log_path=log_path,
+                command=_summarise_command(command),
+                reason=f"inputs unchanged since passing run {hit.get('timestamp')}",
+                fingerprint=fingerprint,
+            )
+        result = run_step(step, ctx, log_dir=log_dir, timestamp=timestamp)
+        result.fingerprint = fingerprint
+        self.record(result, timestamp)
+        return result
+
+
+def run_graph(
+    steps: Iterable[Step],
+    ctx: StepContext,
     *,
-    repo_root: Path,
-    base_ref: str,
-    head_ref: str,
     log_dir: Path,
     timestamp: str,
-) -> dict[str, Any]:
+    jobs: int | None = None,
+    runner: Callable[..., StepResult] = run_step,
+) -> list[StepResult]:
+    """Run every step once its dependencies have passed.
+
+    Independent steps overlap on up to ``jobs`` workers. Failures never stop
+    unrelated steps; dependents of a failed or blocked step are marked
+    ``blocked``. Results are returned in graph order.
+    """
+    ordered = validate_graph(steps)
     log_dir.mkdir(parents=True, exist_ok=True)
-    script_path = repo_root / "scripts" / "ci" / "test_gate.sh"
-    env = os.environ.copy()
-    env["RJW_BASE_REF"] = base_ref
-    env["RJW_HEAD_REF"] = head_ref
-
-    result = subprocess.run(
-        ["bash", str(script_path)],
-        cwd=repo_root,
-        env=env,
-        capture_output=True,
-        text=True,
-    )
+    results: dict[str, StepResult] = {}
+    pending = list(ordered)
+    running: dict[Future[StepResult], Step] = {}
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(ordered) or 1))
 
-    log_path = log_dir / f"test_gate_{timestamp}.log"
-    with log_path.open("w", encoding="utf-8") as handle:
-        handle.write(f"# scripts/ci/test_gate.sh @ {timestamp}\n")
-        handle.write(f"# base_ref={base_ref} head_ref={head_ref}\n\n")
-        if result.stdout:
-            handle.write(result.stdout)
-        if result.stderr:
-            handle.write("\n# stderr\n")
-            handle.write(result.stderr)
-
-    if result.stdout:
-        sys.stdout.write(result.stdout)
-    if result.stderr:
-        sys.stderr.write(result.stderr)
-
-    status = "passed" if result.returncode == 0 else "failed"
-    return {
-        "step": "test_gate",
-        "status": status,
-        "returncode": result.returncode,
-        "log_path": str(log_path.relative_to(repo_root)),
-        "base_ref": base_ref,
-        "head_ref": head_ref,
-    }
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for step in list(pending):
+                deps = [results.get(dep) for dep in step.depends_on]
+                if any(dep is None for dep in deps):
+                    continue
+                pending.remove(step)
+                broken = [dep.step for dep in deps if dep.status in ("failed", "blocked")]
+                if broken:
+                    results[step.name] = StepResult(
+                        step.name,
+                        "blocked",
+                        depends_on=list(step.depends_on),
+                        reason=f"dependency failed: {', '.join(broken)}",
+                    )
+                    continue
+                future = pool.submit(runner, step, ctx, log_dir=log_dir, timestamp=timestamp)
+                running[future] = step
+            if not running:
+                # Newly blocked steps may have unblocked (or blocked) others
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    results[step.name] = future.result()
+                except Exception as exc:  # pragma: no cover - defensive
+                    results[step.name] = StepResult(
+                        step.name, "failed", 1, depends_on=list(step.depends_on), reason=f"runner error: {exc}"
+                    )
+
+    return [results[step.name] for step in ordered]
 
 
 def write_summary(
@@ -92,10 +562,12 @@ def write_summary(
     timestamp: str,
     steps: list[dict[str, Any]],
     repo_root: Path,
+    extra: dict[str, Any] | None = None,
 ) -> Path:
     log_dir.mkdir(parents=True, exist_ok=True)
     summary = {
         "timestamp": timestamp,
+        **(extra or {}),
         "steps": steps,
     }
     summary_path = log_dir / f"ci_summary_{timestamp}.json"
@@ -103,34 +575,83 @@ def write_summary(
     return summary_path
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     repo_root = Path(__file__).resolve().parents[2]
     log_dir = args.log_dir if args.log_dir.is_absolute() else repo_root / args.log_dir
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
-    steps: list[dict[str, Any]] = []
-    steps.append(
-        run_test_gate(
-            repo_root=repo_root,
-            base_ref=args.base_ref,
-            head_ref=args.head_ref,
-            log_dir=log_dir,
-            timestamp=timestamp,
+    try:
+        changed = ChangedFilesIndex.from_git(repo_root, args.base_ref, args.head_ref)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        print(f"ci entrypoint: could not diff {args.base_ref}..{args.head_ref}: {exc}", file=sys.stderr)
+        return 1
+
+    ctx = StepContext(repo_root=repo_root, base_ref=args.base_ref, head_ref=args.head_ref, changed=changed)
+    start = time.perf_counter()
+    selection: Selection | None = None
+    if changed and args.tests != "off":
+        coverage_file = args.coverage_file
+        if coverage_file is not None and not coverage_file.is_absolute():
+            coverage_file = repo_root / coverage_file
+        selection = select_tests(
+            repo_root,
+            changed,
+            cache_path=log_dir / MAP_FILENAME,
+            coverage_file=coverage_file,
+            force_full=args.tests == "full",
         )
-    )
+        ctx.tests = selection.tests
+        print(f"ci entrypoint: tests: {selection.reason}")
+    if changed:
+        cache = None if args.no_cache else GuardCache(log_dir / CACHE_FILENAME)
+        runner = cache.runner if cache is not None else run_step
+        results = run_graph(STEPS, ctx, log_dir=log_dir, timestamp=timestamp, jobs=args.jobs, runner=runner)
+        if cache is not None:
+            cache.save()
+        if selection is not None and selection.full:
+            if any(result.step == "tests" and result.status == "passed" for result in results):
+                record_full_run(repo_root, log_dir / MAP_FILENAME)
+        if args.keep_logs:
+            for step in STEPS:
+                rotate_logs(log_dir, f"{step.name}_*.log", args.keep_logs)
+    else:
+        print("ci entrypoint: no changes detected, skipping")
+        results = [
+            StepResult(step.name, "skipped", depends_on=list(step.depends_on), reason="no changes detected")
+            for step in validate_graph(STEPS)
+        ]
+    steps = [result.to_dict() for result in results]
+    cached = [result.step for result in results if result.status == "cached"]
+    if cached:
+        print(f"ci entrypoint: skipped {len(cached)} step(s) with unchanged inputs: {', '.join(cached)}")
 
-    summary_path = write_summary(log_dir=log_dir, timestamp=timestamp, steps=steps, repo_root=repo_root)
+    summary_path = write_summary(
+        log_dir=log_dir,
+        timestamp=timestamp,
+        steps=steps,
+        repo_root=repo_root,
+        extra={
+            "base_ref": args.base_ref,
+            "head_ref": args.head_ref,
+            "changed_files": len(changed),
+            "cached": cached,
+            "test_selection": selection.to_dict() if selection is not None else None,
+            "duration": round(time.perf_counter() - start, 3),
+        },
+    )
+    if args.keep_logs:
+        rotate_logs(log_dir, "ci_summary_*.json", args.keep_logs)
 
+    failed = [result.step for result in results if result.status in ("failed", "blocked")]
     summary_output = {
-        "summary": str(summary_path.relative_to(repo_root)),
+        "summary": _display_path(summary_path, repo_root),
+        "failed": failed,
         "steps": steps,
     }
     print(json.dumps(summary_output, indent=2))
 
-    if any(step["status"] != "passed" for step in steps):
-        return 1
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -5,54 +5,148 @@ Configuration Enforcement Checker
 Validates that features.yml matches actually enabled features.
 Used in CI to detect config drift.
 
+Filesystem probes are answered from a ProjectSnapshot, which scans the
+relevant directories once with os.scandir, and features.yml is only
+re-parsed when it changes on disk (see tools/config_loader.py).
+
 Exit codes:
   0 = config aligned
   1 = drift detected
   2 = errors found
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 
-import yaml  # type: ignore[import]
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.config_loader import load_config  # noqa: E402
+
+FEATURES_RELPATH = Path('method') / 'config' / 'features.yml'
+# Directories (relative to the project and kit roots) whose contents answer
+# every existence probe made by discover_enabled_features.
+SNAPSHOT_DIRS = (
+    Path('bin'),
+    Path('add-ons'),
+    Path('docs') / 'prompts',
+    Path('rjw-idd-methodology') / 'addons',
+    Path('method') / 'config',
+)
+SNAPSHOT_DEPTH = 2
+
+_SNAPSHOTS: dict[Path, 'ProjectSnapshot'] = {}
+
+
+class ProjectSnapshot:
+    """In-memory view of the project paths that config enforcement probes."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self._entries: set[str] = set()
+        self._scanned: set[str] = set()
+        self._fallback: dict[str, bool] = {}
+
+        self._scan(project_root, 0)
+        nested = project_root / 'rjw-idd-starter-kit'
+        self.kit_root = nested if self.exists(nested) else project_root
+
+        roots = [project_root] if self.kit_root == project_root else [project_root, self.kit_root]
+        for root in roots:
+            if root != project_root:
+                self._scan(root, 0)
+            for relative in SNAPSHOT_DIRS:
+                for parent in reversed(list(relative.parents)[:-1]):
+                    self._scan(root / parent, 0)
+                self._scan(root / relative, SNAPSHOT_DEPTH - 1)
+
+    def _scan(self, directory: Path, depth: int) -> None:
+        key = str(directory)
+        if key in self._scanned:
+            return
+        if str(directory.parent) in self._scanned and key not in self._entries:
+            # Parent listing already proves the directory is absent
+            self._scanned.add(key)
+            return
+        try:
+            with os.scandir(directory) as entries:
+                children = []
+                for entry in entries:
+                    child = directory / entry.name
+                    self._entries.add(str(child))
+                    if depth > 0 and entry.is_dir(follow_symlinks=True):
+                        children.append(child)
+        except (FileNotFoundError, NotADirectoryError):
+            self._scanned.add(key)
+            return
+        except OSError:
+            # Leave unreadable directories to the per-path fallback
+            return
+        self._scanned.add(key)
+        for child in children:
+            self._scan(child, depth - 1)
+
+    def exists(self, path: Path) -> bool:
+        """Answer an existence query from the snapshot, stat-ing only unscanned paths."""
+        if str(path.parent) in self._scanned:
+            return str(path) in self._entries
+        key = str(path)
+        if key not in self._fallback:
+            self._fallback[key] = path.exists()
+        return self._fallback[key]
+
+    def any_exists(self, paths: list[Path]) -> bool:
+        return any(self.exists(path) for path in paths)
+
+    def features_file(self) -> Optional[Path]:
+        """Return features.yml from the project root, falling back to the kit root."""
+        for root in (self.project_root, self.kit_root):
+            candidate = root / FEATURES_RELPATH
+            if self.exists(candidate):
+                return candidate
+        return None
+
+
+def get_snapshot(project_root: Path, refresh: bool = False) -> ProjectSnapshot:
+    """Return the memoised snapshot for project_root (rebuilt when refresh=True)."""
+    key = project_root.resolve()
+    if refresh or key not in _SNAPSHOTS:
+        _SNAPSHOTS[key] = ProjectSnapshot(project_root)
+    return _SNAPSHOTS[key]
 
 
 def resolve_starter_kit_root(project_root: Path) -> Path:
     """Return the starter kit directory whether nested or standalone."""
-    nested = project_root / 'rjw-idd-starter-kit'
-    if nested.exists():
-        return nested
-    return project_root
+    return get_snapshot(project_root).kit_root
 
 
-def load_features_yml(project_root: Path) -> dict:
+def load_features_yml(project_root: Path, snapshot: Optional[ProjectSnapshot] = None) -> dict:
     """Load features.yml configuration"""
-    features_file = project_root / 'method' / 'config' / 'features.yml'
-
-    if not features_file.exists():
-        # Try alternative location (standalone starter kit copied into a larger repo)
-        kit_root = resolve_starter_kit_root(project_root)
-        features_file = kit_root / 'method' / 'config' / 'features.yml'
+    snapshot = snapshot or get_snapshot(project_root)
+    # Falls back to the kit root (standalone starter kit copied into a larger repo)
+    features_file = snapshot.features_file()
 
-    if not features_file.exists():
+    if features_file is None:
         raise FileNotFoundError("features.yml not found")
 
-    with open(features_file) as f:
-        return yaml.safe_load(f)
+    return load_config(features_file)
 
 
-def discover_enabled_features(project_root: Path) -> dict[str, bool]:
+def discover_enabled_features(
+    project_root: Path, snapshot: Optional[ProjectSnapshot] = None
+) -> dict[str, bool]:
     """Discover which features are actually enabled"""
+    snapshot = snapshot or get_snapshot(project_root)
     try:
-        config = load_features_yml(project_root)
+        config = load_features_yml(project_root, snapshot)
     except Exception:
         config = {}
 
     declared = _extract_declared_features(config)
     features: dict[str, bool] = dict(declared)
 
-    kit_root = resolve_starter_kit_root(project_root)
+    kit_root = snapshot.kit_root
 
     cli_path = kit_root / 'bin' / 'rjw'
     prompt_pack_locations = [
@@ -88,22 +182,22 @@ def discover_enabled_features(project_root: Path) -> dict[str, bool]:
         ],
     ]
 
-    if features.get('guard', False) and not cli_path.exists():
+    if features.get('guard', False) and not snapshot.exists(cli_path):
         features['guard'] = False
-    if features.get('init', False) and not cli_path.exists():
+    if features.get('init', False) and not snapshot.exists(cli_path):
         features['init'] = False
     if features.get('prompts_version', False):
-        if not any(path.exists() for path in prompt_pack_locations):
+        if not snapshot.any_exists(prompt_pack_locations):
             features['prompts_version'] = False
-    if features.get('game_addin', False) and not any(path.exists() for path in game_addon_candidates):
+    if features.get('game_addin', False) and not snapshot.any_exists(game_addon_candidates):
         features['game_addin'] = False
-    if features.get('video_ai_enhancer', False) and not any(path.exists() for path in video_addon_candidates):
+    if features.get('video_ai_enhancer', False) and not snapshot.any_exists(video_addon_candidates):
         features['video_ai_enhancer'] = False
     if features.get('yolo_mode', False):
-        if not all(any(path.exists() for path in group) for group in yolo_prompt_candidates):
+        if not all(snapshot.any_exists(group) for group in yolo_prompt_candidates):
             features['yolo_mode'] = False
     if features.get('turbo_mode', False):
-        if not all(any(path.exists() for path in group) for group in turbo_prompt_candidates):
+        if not all(snapshot.any_exists(group) for group in turbo_prompt_candidates):
             features['turbo_mode'] = False
 
     return features
@@ -219,6 +313,7 @@ def generate_report(issues: list[dict], declared: dict, actual: dict) -> str:
 
 def main():
     project_root = Path.cwd()
+    snapshot = get_snapshot(project_root)
 
     print("RJW-IDD Configuration Enforcement Checker")
     print("=" * 50)
@@ -227,11 +322,11 @@ def main():
     try:
         # Load declared configuration
         print("Loading features.yml...")
-        declared_config = load_features_yml(project_root)
+        declared_config = load_features_yml(project_root, snapshot)
 
         # Discover actual state
         print("Discovering enabled features...")
-        actual_features = discover_enabled_features(project_root)
+        actual_features = discover_enabled_features(project_root, snapshot)
 
         # Check for drift
         print("Checking for drift...")
@@ -8,6 +8,10 @@ Validates that code and documentation stay in sync by checking:
 3. Referenced files/functions exist
 4. Version numbers are consistent
 
+Python fence validation results are cached on disk by content hash
+(``.doc-sync-cache.json``), identical fences are parsed once per run, and
+uncached fences are parsed in a process pool when there are enough of them.
+
 Exit codes:
   0 = sync OK
   1 = drift detected
@@ -15,9 +19,22 @@ Exit codes:
 """
 
 import ast
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+# Markdown trees whose Python fences are validated
+DOC_ROOTS = ('docs', 'tutorials', 'manual')
+PYTHON_LANGUAGES = ('python', 'py')
+CACHE_FILENAME = '.doc-sync-cache.json'
+# Below this many uncached fences a process pool costs more than it saves
+PARALLEL_THRESHOLD = 16
 
 
 def find_doc_sync_tags(content: str, filepath: Path) -> list[dict]:
@@ -78,6 +95,60 @@ def validate_python_code(code: str) -> tuple[bool, str]:
         return False, f"Syntax error: {e.msg} at line {e.lineno}"
 
 
+def fence_digest(code: str) -> str:
+    """Content hash used to dedup and cache fence validation results"""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def _cache_version() -> str:
+    # ast grammar changes between interpreter versions, so results are per-version
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def load_fence_cache(cache_path: Path) -> dict[str, list]:
+    """Load cached validation results, discarding caches from other Python versions"""
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('python') != _cache_version():
+        return {}
+    entries = data.get('entries')
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_fence_cache(cache_path: Path, entries: dict[str, list]) -> None:
+    """Persist validation results; a failed write only costs a re-parse next run"""
+    payload = {'python': _cache_version(), 'entries': entries}
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        tmp_path.write_text(json.dumps(payload), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def validate_fences(codes: dict[str, str], workers: Optional[int] = None) -> dict[str, list]:
+    """Validate unique fences keyed by digest, in a process pool when worthwhile"""
+    digests = list(codes)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    results = None
+    if workers > 1 and len(digests) >= PARALLEL_THRESHOLD:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(digests) // (workers * 4))
+                results = list(pool.map(validate_python_code, [codes[d] for d in digests], chunksize=chunksize))
+        except (OSError, RuntimeError):
+            # Sandboxed environments may forbid spawning workers
+            results = None
+    if results is None:
+        results = [validate_python_code(codes[d]) for d in digests]
+
+    return {digest: list(result) for digest, result in zip(digests, results)}
+
+
 def check_doc_sync_drift(project_root: Path) -> list[dict]:
     issues: list[dict] = []
 
@@ -131,43 +202,98 @@ def check_doc_sync_drift(project_root: Path) -> list[dict]:
     return issues
 
 
-def check_code_examples(project_root: Path) -> list[dict]:
-    """Validate code examples in documentation"""
-    issues: list[dict] = []
+def iter_doc_files(project_root: Path):
+    """Yield markdown files under every documentation root"""
+    for root_name in DOC_ROOTS:
+        doc_dir = project_root / root_name
+        if doc_dir.exists():
+            yield from sorted(doc_dir.rglob('*.md'))
 
-    docs_dir = project_root / 'docs'
-    if not docs_dir.exists():
-        return issues
 
-    for md_file in docs_dir.rglob('*.md'):
+def check_code_examples(
+    project_root: Path,
+    stats: Optional[dict] = None,
+    cache_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> list[dict]:
+    """Validate code examples in documentation
+
+    When ``stats`` is given it is filled with fence counts, cache hits and
+    the time spent parsing. ``cache_path`` defaults to ``.doc-sync-cache.json``
+    under ``project_root``.
+    """
+    issues: list[dict] = []
+    python_blocks: list[tuple[str, dict]] = []
+    unique_codes: dict[str, str] = {}
+
+    for md_file in iter_doc_files(project_root):
         try:
             content = md_file.read_text()
             blocks = find_code_fences(content, md_file)
-
-            for block in blocks:
-                if block['language'] in ['python', 'py']:
-                    valid, error = validate_python_code(block['content'])
-                    if not valid:
-                        issues.append({
-                            'type': 'invalid_code',
-                            'file': block['file'],
-                            'line': block['line'],
-                            'message': f'Invalid Python code: {error}'
-                        })
         except Exception as e:
             issues.append({
                 'type': 'error',
                 'file': str(md_file),
                 'message': f'Failed to process: {e}'
             })
+            continue
+
+        for block in blocks:
+            if block['language'] in PYTHON_LANGUAGES:
+                digest = fence_digest(block['content'])
+                unique_codes.setdefault(digest, block['content'])
+                python_blocks.append((digest, block))
+
+    if cache_path is None:
+        cache_path = project_root / CACHE_FILENAME
+    cache = load_fence_cache(cache_path)
+
+    misses = {digest: code for digest, code in unique_codes.items() if digest not in cache}
+    parse_start = time.perf_counter()
+    if misses:
+        cache.update(validate_fences(misses, workers))
+        save_fence_cache(cache_path, {digest: cache[digest] for digest in unique_codes})
+    parse_time = time.perf_counter() - parse_start
+
+    for digest, block in python_blocks:
+        valid, error = cache[digest]
+        if not valid:
+            issues.append({
+                'type': 'invalid_code',
+                'file': block['file'],
+                'line': block['line'],
+                'message': f'Invalid Python code: {error}'
+            })
+
+    if stats is not None:
+        stats.update({
+            'fences': len(python_blocks),
+            'unique_fences': len(unique_codes),
+            'cache_hits': len(unique_codes) - len(misses),
+            'parse_time': parse_time,
+        })
 
     return issues
 
 
-def generate_report(issues: list[dict]) -> str:
+def format_fence_stats(stats: dict) -> list[str]:
+    """Summarise fence validation cache effectiveness"""
+    unique = stats.get('unique_fences', 0)
+    hits = stats.get('cache_hits', 0)
+    ratio = hits / unique if unique else 0.0
+    return [
+        f"Python fences: {stats.get('fences', 0)} ({unique} unique)",
+        f"Cache hits: {hits}/{unique} ({ratio:.1%})",
+        f"Parse time: {stats.get('parse_time', 0.0):.3f}s",
+    ]
+
+
+def generate_report(issues: list[dict], stats: Optional[dict] = None) -> str:
     """Generate human-readable report"""
+    stats_lines = format_fence_stats(stats) if stats else []
+
     if not issues:
-        return "✔ No doc-sync issues found"
+        return '\n'.join(["✔ No doc-sync issues found", *stats_lines])
 
     report = []
     report.append(f"Found {len(issues)} doc-sync issue(s):")
@@ -191,6 +317,8 @@ def generate_report(issues: list[dict]) -> str:
             report.append(f"    {item['message']}")
         report.append("")
 
+    report.extend(stats_lines)
+
     return '\n'.join(report)
 
 
@@ -206,13 +334,14 @@ def main():
     drift_issues = check_doc_sync_drift(project_root)
 
     print("Validating code examples...")
-    code_issues = check_code_examples(project_root)
+    fence_stats: dict = {}
+    code_issues = check_code_examples(project_root, stats=fence_stats)
 
     # Combine all issues
     all_issues = drift_issues + code_issues
 
     # Generate report
-    report = generate_report(all_issues)
+    report = generate_report(all_issues, fence_stats)
     print()
     print(report)
 
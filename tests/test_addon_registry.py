@@ -0,0 +1,96 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'scripts' / 'addons' / 'registry.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for addon registry tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from scripts.addons import registry  # noqa: E402
+from tools.config_loader import load_config  # noqa: E402
+
+
+def _make_project(root: Path) -> Path:
+    features = root / 'method' / 'config' / 'features.yml'
+    features.parent.mkdir(parents=True)
+    features.write_text("features:\n  guard: true\n")
+    return features
+
+
+def test_apply_operations_in_one_transaction(tmp_path):
+    features = _make_project(tmp_path)
+    operations = [
+        registry.Operation.parse('enable:3d_game_core'),
+        registry.Operation.parse('profile:3d_game_core=driving'),
+        registry.Operation.parse('disable:video_ai_enhancer'),
+    ]
+
+    messages = registry.apply_operations(tmp_path, operations)
+
+    config = load_config(features)
+    assert config['features'] == {'guard': True}
+    assert config['addons']['3d_game_core']['enabled'] is True
+    assert config['addons']['3d_game_core']['profile'] == 'driving'
+    assert messages[-1] == 'video_ai_enhancer was not enabled'
+
+
+def test_failed_transaction_leaves_registry_untouched(tmp_path):
+    features = _make_project(tmp_path)
+    before = features.read_text()
+    operations = [
+        registry.Operation.parse('enable:3d_game_core'),
+        registry.Operation.parse('profile:video_ai_enhancer=live_stream'),
+    ]
+
+    with pytest.raises(registry.RegistryError, match='enable_video_ai_enhancer.py'):
+        registry.apply_operations(tmp_path, operations)
+
+    assert features.read_text() == before
+    assert [p.name for p in features.parent.iterdir() if p.suffix == '.tmp'] == []
+
+
+def test_operation_parse_rejects_unknown_profile():
+    with pytest.raises(registry.RegistryError, match='invalid profile'):
+        registry.Operation.parse('profile:3d_game_core=fps')
+
+
+def test_bulk_mode_updates_every_project(tmp_path):
+    roots = []
+    for index in range(4):
+        root = tmp_path / f'project-{index}'
+        _make_project(root)
+        roots.append(root)
+    roots.append(tmp_path / 'missing')
+
+    results = registry.apply_bulk(roots, [registry.Operation.parse('enable:video_ai_enhancer')], workers=3)
+
+    assert [ok for ok, _ in results.values()] == [True, True, True, True, False]
+    for root in roots[:-1]:
+        config = load_config(root / 'method' / 'config' / 'features.yml')
+        assert config['addons']['video_ai_enhancer']['profile'] == 'baseline'
+
+
+def test_concurrent_scripts_do_not_lose_updates(tmp_path):
+    features = _make_project(tmp_path)
+    scripts_dir = pkg_root / 'scripts' / 'addons'
+    commands = [
+        [sys.executable, str(scripts_dir / 'enable_3d_game_core.py')],
+        [sys.executable, str(scripts_dir / 'enable_video_ai_enhancer.py')],
+    ] * 3
+
+    procs = [subprocess.Popen(cmd, cwd=tmp_path, stdout=subprocess.DEVNULL) for cmd in commands]
+    assert [proc.wait() for proc in procs] == [0] * len(commands)
+
+    addons = load_config(features)['addons']
+    assert addons['3d_game_core']['enabled'] and addons['video_ai_enhancer']['enabled']
@@ -0,0 +1,367 @@
+import errno
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'backup_manager.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for backup manager tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import backup_archive, backup_io, backup_manager, backup_store  # noqa: E402
+from tools.backup_manager import BackupConfig, BackupManager  # noqa: E402
+from tools.backup_store import MANIFEST_NAME, STORE_DIRNAME, Manifest, ObjectStore  # noqa: E402
+
+
+def _project(tmp_path: Path) -> Path:
+    source = tmp_path / 'project' / 'specs'
+    (source / 'nested').mkdir(parents=True)
+    (source / 'a.md').write_text('alpha\n', encoding='utf-8')
+    (source / 'nested' / 'b.md').write_text('beta\n', encoding='utf-8')
+    (source / 'nested' / 'copy_of_a.md').write_text('alpha\n', encoding='utf-8')
+    (source / 'debug.log').write_text('noise\n', encoding='utf-8')
+    return source
+
+
+def _manager(tmp_path: Path, source: Path, **options) -> BackupManager:
+    config = BackupConfig(
+        source_paths=[source],
+        backup_root=tmp_path / 'backups',
+        exclude_patterns=['*.log'],
+        **options,
+    )
+    return BackupManager(config)
+
+
+def _metadata(result) -> dict:
+    return json.loads((result.backup_path / 'backup_metadata.json').read_text(encoding='utf-8'))
+
+
+def test_incremental_snapshots_deduplicate_and_skip_unchanged_files(tmp_path):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source)
+
+    first = manager.create_backup('first')
+    assert first.success and first.size_bytes == 6 + 5 + 6
+    meta = _metadata(first)
+    assert meta['format'] == 'incremental' and meta['file_count'] == 3 and meta['hashed_files'] == 3
+    assert meta['stored_bytes'] == 11, 'identical files share one blob'
+    assert not (first.backup_path / 'specs').exists()
+
+    (source / 'nested' / 'b.md').write_text('beta, revised\n', encoding='utf-8')
+    second = manager.create_backup('second')
+    meta = _metadata(second)
+    assert meta['hashed_files'] == 1 and meta['reused_files'] == 2
+    assert meta['stored_bytes'] == len('beta, revised\n')
+
+    manifest = Manifest.read(second.backup_path / MANIFEST_NAME)
+    assert sorted(entry.path for entry in manifest.files) == [
+        'specs/a.md',
+        'specs/nested/b.md',
+        'specs/nested/copy_of_a.md',
+    ]
+    assert second.size_bytes == manifest.size_bytes
+
+
+def test_incremental_restore_round_trips_content_and_mtime(tmp_path):
+    source = _project(tmp_path)
+    os.utime(source / 'a.md', ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    manager = _manager(tmp_path, source)
+    backup = manager.create_backup()
+
+    restored = manager.restore_backup(backup.backup_path, tmp_path / 'restore')
+
+    assert restored.success and restored.size_bytes == backup.size_bytes
+    assert (tmp_path / 'restore' / 'specs' / 'nested' / 'b.md').read_text(encoding='utf-8') == 'beta\n'
+    assert (tmp_path / 'restore' / 'specs' / 'a.md').stat().st_mtime_ns == 1_600_000_000_000_000_000
+    assert not (tmp_path / 'restore' / 'specs' / 'debug.log').exists()
+
+
+
+def test_incremental_backup_works_without_hard_links(tmp_path, monkeypatch):
+    def no_link(src, dst):
+        raise PermissionError(errno.EPERM, 'Operation not permitted', dst)
+
+    monkeypatch.setattr(backup_store.os, 'link', no_link)
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source)
+
+    backup = manager.create_backup()
+
+    assert backup.success
+    assert _metadata(backup)['stored_bytes'] == 11, 'identical files still share one blob'
+    assert not list((tmp_path / 'backups' / STORE_DIRNAME / 'tmp').iterdir())
+    restored = manager.restore_backup(backup.backup_path, tmp_path / 'restore')
+    assert restored.success
+    assert (tmp_path / 'restore' / 'specs' / 'nested' / 'copy_of_a.md').read_text(encoding='utf-8') == 'alpha\n'
+
+def test_cleanup_collects_unreferenced_blobs_and_list_uses_manifest_size(tmp_path):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source, retention_days=1)
+    old = manager.create_backup('old')
+    (source / 'nested' / 'b.md').unlink()
+    manager.create_backup('new')
+    store = ObjectStore(tmp_path / 'backups' / STORE_DIRNAME)
+    assert len(list(store.iter_digests())) == 2
+
+    listed = {backup['name']: backup for backup in manager.list_backups()}
+    assert STORE_DIRNAME not in listed
+    assert listed[old.backup_path.name]['size_bytes'] == 17
+
+    stale = old.backup_path.with_name('old_20000101_000000')
+    old.backup_path.rename(stale)
+    assert manager.cleanup_old_backups() == 1
+    assert len(list(store.iter_digests())) == 1
+
+
+def test_copy_mode_keeps_full_directory_copies(tmp_path):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source, mode='copy')
+
+    backup = manager.create_backup()
+
+    assert (backup.backup_path / 'specs' / 'nested' / 'b.md').read_text(encoding='utf-8') == 'beta\n'
+    assert Manifest.read(backup.backup_path / MANIFEST_NAME).index()['specs/a.md'].size == 6
+    assert not (tmp_path / 'backups' / STORE_DIRNAME).exists(), 'copies never touch the blob store'
+    with pytest.raises(ValueError, match='Unknown backup mode'):
+        _manager(tmp_path, source, mode='tape')
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'xz', 'none'])
+def test_archive_mode_streams_a_standard_compressed_tar(tmp_path, codec):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source, mode='archive', compression=codec)
+
+    result = manager.create_backup()
+
+    meta = _metadata(result)
+    archive = result.backup_path / meta['archive']
+    assert meta['codec'] == codec and archive.name.endswith(backup_archive.EXTENSIONS[codec])
+    assert result.size_bytes == 17 and result.throughput_mb_s is not None
+    assert result.compression_ratio == pytest.approx(17 / archive.stat().st_size, rel=1e-2)
+    with tarfile.open(archive) as handle:
+        assert sorted(handle.getnames()) == [
+            '.backup-index.json',
+            'specs/a.md',
+            'specs/nested/b.md',
+            'specs/nested/copy_of_a.md',
+        ]
+
+    restored = manager.restore_backup(result.backup_path, tmp_path / 'restore')
+    assert restored.success and restored.size_bytes == 17
+    assert (tmp_path / 'restore' / 'specs' / 'nested' / 'b.md').read_text(encoding='utf-8') == 'beta\n'
+    assert not (tmp_path / 'restore' / '.backup-index.json').exists()
+
+
+def test_archive_members_allow_single_file_restore_by_seeking(tmp_path):
+    rng = random.Random(7)
+    files = []
+    for index in range(12):
+        path = tmp_path / 'src' / f'file_{index}.bin'
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(bytes(rng.randrange(4) for _ in range(20_000)))
+        files.append((path, f'src/{path.name}'))
+    archive = tmp_path / 'out.tar.gz'
+
+    stats = backup_archive.write_archive(archive, files, codec='gzip', chunk_size=32 * 1024, workers=4)
+
+    entries = backup_archive.read_index(archive, 'gzip', stats.index_offset)
+    assert entries == backup_archive.read_index(archive, 'gzip')
+    assert len({entry.member_offset for entry in entries}) > 4, 'files are spread over many members'
+    target = entries[9]
+    assert backup_archive.read_member(archive, 'gzip', target) == files[9][0].read_bytes()
+
+    listing = subprocess.run(['tar', '-tzf', str(archive)], capture_output=True, text=True, check=False)
+    assert listing.returncode == 0 and 'src/file_11.bin' in listing.stdout
+
+
+def test_restore_file_reads_one_member_from_archive_and_store(tmp_path):
+    source = _project(tmp_path)
+    for mode in ('archive', 'incremental'):
+        manager = _manager(tmp_path, source, mode=mode, compression='xz')
+        backup = manager.create_backup(mode)
+
+        result = manager.restore_file(backup.backup_path, 'specs/nested/b.md', tmp_path / mode)
+
+        assert result.success and result.size_bytes == 5
+        assert (tmp_path / mode / 'b.md').read_text(encoding='utf-8') == 'beta\n'
+        assert not manager.restore_file(backup.backup_path, 'specs/missing.md', tmp_path / mode).success
+
+
+def test_compression_setting_resolves_codecs():
+    assert backup_archive.resolve_codec(False) == 'none'
+    assert backup_archive.resolve_codec('gz') == 'gzip'
+    assert backup_archive.resolve_codec(True) == ('zstd' if backup_archive.zstd_available() else 'gzip')
+    with pytest.raises(ValueError, match='Unknown compression'):
+        backup_archive.resolve_codec('brotli')
+
+
+def test_exclusion_matcher_prunes_directories_before_walking(tmp_path, monkeypatch):
+    root = tmp_path / 'tree'
+    for relative in ('keep/a.py', 'keep/__pycache__/a.pyc', '.venv/lib/site.py', 'logs/x.log', 'venv.txt'):
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text(relative, encoding='utf-8')
+    matcher = backup_io.ExclusionMatcher(['.venv/', '__pycache__', '*.log'])
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(Path(path).name)
+        return real_scandir(path)
+
+    monkeypatch.setattr(backup_io.os, 'scandir', scandir)
+    walked = [relative for _, relative, _ in backup_io.walk_files(str(root), matcher)]
+
+    assert sorted(walked) == ['keep/a.py', 'venv.txt']
+    assert '.venv' not in listed and '__pycache__' not in listed
+    assert not backup_io.ExclusionMatcher(['.venv/']).excludes_file('.venv', '.venv')
+
+
+def test_fast_copy_round_trips_data(tmp_path):
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    (tmp_path / 'in.bin').write_bytes(payload)
+    (tmp_path / 'empty').write_bytes(b'')
+
+    assert backup_io.fast_copy(tmp_path / 'in.bin', tmp_path / 'out.bin') == len(payload)
+    assert (tmp_path / 'out.bin').read_bytes() == payload
+    assert backup_io.fast_copy(tmp_path / 'empty', tmp_path / 'empty.out') == 0
+
+
+@pytest.mark.parametrize('mode', ['copy', 'incremental'])
+def test_parallel_backup_and_restore_match_single_worker(tmp_path, mode):
+    source = _project(tmp_path)
+    for index in range(40):
+        (source / 'many' / f'{index % 5}').mkdir(parents=True, exist_ok=True)
+        (source / 'many' / f'{index % 5}' / f'{index}.txt').write_text(str(index) * index, encoding='utf-8')
+    restored = {}
+    for workers in (1, 8):
+        manager = _manager(tmp_path / f'w{workers}', source, mode=mode, workers=workers)
+        backup = manager.create_backup()
+        target = tmp_path / f'restore{workers}'
+        assert manager.restore_backup(backup.backup_path, target).size_bytes == backup.size_bytes
+        restored[workers] = {
+            path.relative_to(target).as_posix(): path.read_bytes() for path in target.rglob('*') if path.is_file()
+        }
+
+    assert restored[1] == restored[8] and len(restored[1]) == 43
+
+
+def _damage(tmp_path, backup, mode):
+    """Flip a byte in a.md's data and delete b.md's; returns the paths verify should flag."""
+    if mode == 'copy':
+        rotten, gone = backup.backup_path / 'specs' / 'a.md', backup.backup_path / 'specs' / 'nested' / 'b.md'
+        corrupt = ['specs/a.md']
+    else:
+        manifest = Manifest.read(backup.backup_path / MANIFEST_NAME).index()
+        store = ObjectStore(tmp_path / 'backups' / STORE_DIRNAME)
+        rotten = store.path_for(manifest['specs/a.md'].sha256)
+        gone = store.path_for(manifest['specs/nested/b.md'].sha256)
+        corrupt = ['specs/a.md', 'specs/nested/copy_of_a.md']  # both reference the same blob
+    rotten.write_text('alphA\n', encoding='utf-8')
+    gone.unlink()
+    return corrupt, ['specs/nested/b.md']
+
+
+@pytest.mark.parametrize('mode', ['incremental', 'copy'])
+def test_verify_detects_bit_rot_and_missing_files(tmp_path, mode):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source, mode=mode)
+    backup = manager.create_backup()
+    assert manager.list_backups()[0]['status'] == 'unverified'
+
+    clean = manager.verify_backup(backup.backup_path)
+    assert clean.ok and clean.files_checked == 3 and clean.bytes_checked > 0
+
+    corrupt, missing = _damage(tmp_path, backup, mode)
+    damaged = manager.verify_backup(backup.backup_path, bandwidth_mb_s=100)
+    assert damaged.status == 'damaged'
+    assert damaged.corrupt == corrupt and damaged.missing == missing
+
+    listed = manager.list_backups()[0]
+    assert listed['status'] == 'damaged' and listed['size_bytes'] == 17
+    assert _metadata(backup)['verification']['corrupt'] == len(corrupt)
+
+
+def test_scrub_covers_archives_and_copy_restore_ignores_manifest(tmp_path):
+    source = _project(tmp_path)
+    archived = _manager(tmp_path, source, mode='archive', compression='gzip').create_backup('archive')
+    copied = _manager(tmp_path, source, mode='copy').create_backup('copy')
+    manager = _manager(tmp_path, source)
+    assert [result.status for result in manager.scrub()] == ['ok', 'ok']
+
+    restored = manager.restore_backup(copied.backup_path, tmp_path / 'restore')
+    assert restored.size_bytes == 17 and not (tmp_path / 'restore' / MANIFEST_NAME).exists()
+
+    archive = archived.backup_path / _metadata(archived)['archive']
+    data = bytearray(archive.read_bytes())
+    data[len(data) // 3] ^= 0xFF
+    archive.write_bytes(bytes(data))
+    assert manager.verify_backup(archived.backup_path).status == 'damaged'
+
+
+def test_bandwidth_limiter_paces_reads(tmp_path):
+    (tmp_path / 'blob').write_bytes(b'x' * (3 * backup_io.HASH_CHUNK))
+    limiter = backup_io.BandwidthLimiter(20 * backup_io.HASH_CHUNK)
+
+    started = time.monotonic()
+    size, _ = backup_io.hash_file(tmp_path / 'blob', limiter)
+
+    assert size == 3 * backup_io.HASH_CHUNK and time.monotonic() - started >= 0.14
+
+
+def test_zstd_archive_round_trips_with_parallel_members(tmp_path):
+    pytest.importorskip('zstandard')
+    files = []
+    for index in range(48):
+        path = tmp_path / 'src' / f'file_{index}.bin'
+        path.parent.mkdir(exist_ok=True)
+        # Incompressible halves keep several encoders busy at once.
+        path.write_bytes(os.urandom(150_000) + bytes(150_000))
+        files.append((path, f'src/{path.name}'))
+    archive = tmp_path / 'out.tar.zst'
+
+    stats = backup_archive.write_archive(archive, files, codec='zstd', chunk_size=64 * 1024, workers=8)
+
+    entries = backup_archive.read_index(archive, 'zstd', stats.index_offset)
+    assert len({entry.member_offset for entry in entries}) > 8
+    assert backup_archive.read_member(archive, 'zstd', entries[5]) == files[5][0].read_bytes()
+    restored = backup_archive.extract_archive(archive, 'zstd', tmp_path / 'restore')
+    assert restored == sum(path.stat().st_size for path, _ in files)
+    assert all((tmp_path / 'restore' / name).read_bytes() == path.read_bytes() for path, name in files)
+
+
+def test_scrub_hashes_shared_blobs_once_across_snapshots(tmp_path, monkeypatch):
+    source = _project(tmp_path)
+    manager = _manager(tmp_path, source)
+    snapshots = [manager.create_backup(f'day{index}') for index in range(3)]
+    hashed = []
+    real_hash_file = backup_manager.hash_file
+
+    def counting_hash_file(path, limiter=None):
+        hashed.append(Path(path).name)
+        return real_hash_file(path, limiter)
+
+    monkeypatch.setattr(backup_manager, 'hash_file', counting_hash_file)
+
+    assert [result.status for result in manager.scrub()] == ['ok'] * 3
+    assert len(hashed) == 2, 'two distinct blobs, however many snapshots share them'
+
+    manifest = Manifest.read(snapshots[0].backup_path / MANIFEST_NAME).index()
+    ObjectStore(tmp_path / 'backups' / STORE_DIRNAME).path_for(manifest['specs/nested/b.md'].sha256).unlink()
+    results = manager.scrub()
+    assert all(result.missing == ['specs/nested/b.md'] for result in results)
@@ -0,0 +1,87 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'benchmark_history.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for benchmark history tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import benchmark_history, performance_benchmark  # noqa: E402
+from tools.benchmark_history import HistoryStore, build_series, detect_change_points  # noqa: E402
+
+
+def _entry(sha, median, host='h1', python='3.11.7'):
+    return {
+        'schema': benchmark_history.SCHEMA_VERSION,
+        'recorded_at': '2025-01-01T00:00:00Z',
+        'git_sha': sha,
+        'git_dirty': False,
+        'host': {'id': host},
+        'python': python,
+        'suites': ['cli'],
+        'benchmarks': {'cli': {'median': median, 'q1': median, 'q3': median, 'n': 5}},
+    }
+
+
+def test_store_appends_lines_and_skips_corrupt_ones(tmp_path):
+    store = HistoryStore(tmp_path / 'perf' / 'history.ndjson')
+    store.append(_entry('a' * 40, 1.0))
+    with store.path.open('a', encoding='utf-8') as handle:
+        handle.write('{truncated\n')
+    store.append(_entry('b' * 40, 1.1, host='h2'))
+
+    assert [entry['git_sha'][0] for entry in store.entries()] == ['a', 'b']
+    series = build_series(store.entries(), host='h1')
+    assert len(series) == 1 and series[0].values == [1.0]
+    assert len(build_series(store.entries())) == 2
+
+
+def test_change_points_find_steps_but_not_noise():
+    rng = random.Random(3)
+    noise = [1.0 + rng.uniform(-0.02, 0.02) for _ in range(30)]
+    assert detect_change_points(noise) == []
+
+    stepped = noise[:12] + [value * 1.25 for value in noise[12:24]] + [value * 1.0 for value in noise[24:]]
+    points = detect_change_points(stepped)
+    assert [point.index for point in points] == [12, 24]
+    assert points[0].change > 0.2 and points[1].change < -0.15
+
+
+def test_report_renders_table_and_html(tmp_path, capsys):
+    history = tmp_path / 'history.ndjson'
+    store = HistoryStore(history)
+    for index in range(12):
+        store.append(_entry(f'{index:02d}' + 'f' * 38, 1.0 if index < 6 else 1.5, host=benchmark_history.host_fingerprint()['id']))
+    html_path = tmp_path / 'report.html'
+
+    assert benchmark_history.main(['report', '--history', str(history), '--html', str(html_path)]) == 0
+    out = capsys.readouterr().out
+    assert 'cli' in out and '+50.0%' in out and '06ffffff +50.0%' in out
+    page = html_path.read_text(encoding='utf-8')
+    assert '<svg' in page and 'class="cp"' in page and '<script' not in page
+
+
+def test_benchmark_record_appends_history(tmp_path, monkeypatch):
+    def fake_time_subprocess(self, command):
+        return {'time': 0.1, 'return_code': 0, 'stdout': '', 'stderr': '', 'error': None}
+
+    monkeypatch.setattr(performance_benchmark, 'cpu_pinning_hints', lambda: [])
+    monkeypatch.setattr(performance_benchmark.PerformanceBenchmark, '_time_subprocess', fake_time_subprocess)
+    history = tmp_path / 'history.ndjson'
+    args = ['--project-root', str(tmp_path), '--repetitions', '2', '--record', '--history', str(history)]
+
+    assert performance_benchmark.main(args) == 0
+    entry = json.loads(history.read_text(encoding='utf-8'))
+    assert entry['host']['id'] and entry['python']
+    assert entry['benchmarks']['evidence_harvester']['median'] == 0.1
+    assert 'import_times' not in entry['benchmarks']
@@ -0,0 +1,194 @@
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'scripts' / 'ci' / 'entrypoint.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for CI entrypoint tests")
+
+
+pkg_root = _starter_kit_root()
+_spec = importlib.util.spec_from_file_location('ci_entrypoint', pkg_root / 'scripts' / 'ci' / 'entrypoint.py')
+entrypoint = importlib.util.module_from_spec(_spec)
+sys.modules['ci_entrypoint'] = entrypoint
+_spec.loader.exec_module(entrypoint)
+
+
+def _ctx(tmp_path, files=('src/app.py',)):
+    return entrypoint.StepContext(
+        repo_root=tmp_path, base_ref='base', head_ref='head', changed=entrypoint.ChangedFilesIndex(files)
+    )
+
+
+def _noop(ctx):
+    return ['noop']
+
+
+def test_graph_rejects_unknown_dependencies_and_cycles():
+    with pytest.raises(ValueError, match='unknown step'):
+        entrypoint.validate_graph([entrypoint.Step('a', _noop, ('missing',))])
+    with pytest.raises(ValueError, match='cycle'):
+        entrypoint.validate_graph([entrypoint.Step('a', _noop, ('b',)), entrypoint.Step('b', _noop, ('a',))])
+
+    ordered = [step.name for step in entrypoint.validate_graph(entrypoint.STEPS)]
+    assert set(ordered) == {'ids', 'evidence', 'red-green', 'change-log', 'living-docs', 'agent-response', 'governance', 'tests'}
+    assert ordered.index('ids') < ordered.index('governance')
+
+
+def test_independent_steps_overlap_and_failures_block_dependents(tmp_path):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def runner(step, ctx, *, log_dir, timestamp):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        status = 'failed' if step.name == 'ids' else 'passed'
+        return entrypoint.StepResult(step.name, status, 0 if status == 'passed' else 1)
+
+    steps = [
+        entrypoint.Step('ids', _noop),
+        entrypoint.Step('red-green', _noop),
+        entrypoint.Step('living-docs', _noop),
+        entrypoint.Step('governance', _noop, ('ids',)),
+        entrypoint.Step('report', _noop, ('governance',)),
+    ]
+    results = entrypoint.run_graph(
+        steps, _ctx(tmp_path), log_dir=tmp_path / 'logs', timestamp='T', jobs=4, runner=runner
+    )
+    statuses = {result.step: result.status for result in results}
+
+    assert peak >= 2
+    assert statuses == {
+        'ids': 'failed',
+        'red-green': 'passed',
+        'living-docs': 'passed',
+        'governance': 'blocked',
+        'report': 'blocked',
+    }
+
+
+def test_run_step_writes_log_and_records_duration(tmp_path):
+    def command(ctx):
+        return [sys.executable, '-c', "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"]
+
+    def not_applicable(ctx):
+        return None
+
+    steps = [entrypoint.Step('probe', command), entrypoint.Step('evidence', not_applicable)]
+    results = entrypoint.run_graph(steps, _ctx(tmp_path), log_dir=tmp_path / 'logs', timestamp='T')
+    probe, evidence = results
+
+    assert probe.status == 'failed' and probe.returncode == 3
+    assert probe.duration > 0
+    log = (tmp_path / probe.log_path).read_text(encoding='utf-8')
+    assert ' stdout | out' in log and ' stderr | err' in log
+    assert probe.output['stdout_bytes'] == 4 and probe.output['stderr_bytes'] == 4
+    assert evidence.status == 'skipped' and evidence.log_path is None
+
+
+def test_evidence_step_only_applies_to_research_changes(tmp_path):
+    step = {step.name: step for step in entrypoint.STEPS}['evidence']
+
+    assert step.command(_ctx(tmp_path, ['src/app.py'])) is None
+    assert '--fail-on-warning' in step.command(_ctx(tmp_path, ['research/evidence_index.json']))
+
+
+def test_cache_reuses_passes_until_an_input_changes(tmp_path):
+    (tmp_path / 'ledger.csv').write_text('a\n', encoding='utf-8')
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'app.py').write_text('x = 1\n', encoding='utf-8')
+    calls = []
+
+    def command(ctx):
+        calls.append(1)
+        return [sys.executable, '-c', 'pass']
+
+    def failing(ctx):
+        return [sys.executable, '-c', 'raise SystemExit(1)']
+
+    steps = [
+        entrypoint.Step('ids', command, inputs=('ledger.csv',)),
+        entrypoint.Step('red-green', command, inputs=('ledger.csv',), uses_changed=True),
+        entrypoint.Step('governance', failing, ('ids',)),
+    ]
+    cache_path = tmp_path / 'logs' / entrypoint.CACHE_FILENAME
+
+    def run():
+        cache = entrypoint.GuardCache(cache_path)
+        results = entrypoint.run_graph(
+            steps, _ctx(tmp_path), log_dir=tmp_path / 'logs', timestamp=str(len(calls)), runner=cache.runner
+        )
+        cache.save()
+        return {result.step: result.status for result in results}
+
+    assert run() == {'ids': 'passed', 'red-green': 'passed', 'governance': 'failed'}
+    assert run() == {'ids': 'cached', 'red-green': 'cached', 'governance': 'failed'}
+
+    (tmp_path / 'src' / 'app.py').write_text('x = 2\n', encoding='utf-8')
+    assert run() == {'ids': 'cached', 'red-green': 'passed', 'governance': 'failed'}
+
+    (tmp_path / 'ledger.csv').write_text('b\n', encoding='utf-8')
+    assert run() == {'ids': 'passed', 'red-green': 'passed', 'governance': 'failed'}
+    assert 'governance' not in entrypoint.GuardCache(cache_path).entries
+
+
+
+def test_cached_step_drops_log_path_once_the_log_is_rotated(tmp_path):
+    steps = [entrypoint.Step('ids', lambda ctx: [sys.executable, '-c', 'pass'])]
+    log_dir = tmp_path / 'logs'
+    cache = entrypoint.GuardCache(log_dir / entrypoint.CACHE_FILENAME)
+
+    def run(timestamp):
+        return entrypoint.run_graph(steps, _ctx(tmp_path), log_dir=log_dir, timestamp=timestamp, runner=cache.runner)[0]
+
+    first = run('1')
+    assert first.status == 'passed'
+    cached = run('2')
+    assert cached.status == 'cached'
+    assert cached.log_path == first.log_path
+
+    (tmp_path / first.log_path).unlink()
+
+    rotated = run('3')
+    assert rotated.status == 'cached'
+    assert rotated.log_path is None
+
+
+
+def test_keep_logs_defaults_to_rotation_and_honours_environment(monkeypatch):
+    monkeypatch.delenv('RJW_CI_KEEP_LOGS', raising=False)
+    assert entrypoint.parse_args([]).keep_logs == entrypoint.DEFAULT_KEEP_LOGS > 0
+
+    monkeypatch.setenv('RJW_CI_KEEP_LOGS', '0')
+    assert entrypoint.parse_args([]).keep_logs == 0
+    assert entrypoint.parse_args(['--keep-logs', '3']).keep_logs == 3
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason='bash not available')
+def test_test_gate_script_delegates_to_entrypoint():
+    result = subprocess.run(
+        ['bash', str(pkg_root / 'scripts' / 'ci' / 'test_gate.sh'), '--help'],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHON_BIN': sys.executable},
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert 'usage: entrypoint.py' in result.stdout
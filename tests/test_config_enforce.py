@@ -0,0 +1,67 @@
+import os
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'scripts' / 'config_enforce.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for config enforcement tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+import scripts.config_enforce as config_enforce  # noqa: E402
+
+FEATURES = """features:
+  guard: true
+  yolo_mode: true
+  turbo_mode: true
+"""
+
+
+def _make_project(root: Path) -> None:
+    (root / 'method' / 'config').mkdir(parents=True)
+    (root / 'method' / 'config' / 'features.yml').write_text(FEATURES)
+    (root / 'bin').mkdir()
+    (root / 'bin' / 'rjw').write_text('#!/bin/sh\n')
+    (root / 'docs' / 'prompts' / 'user').mkdir(parents=True)
+    (root / 'docs' / 'prompts' / 'agent').mkdir(parents=True)
+    (root / 'docs' / 'prompts' / 'user' / 'core-yolo-flow.md').write_text('yolo')
+    (root / 'docs' / 'prompts' / 'agent' / 'PROMPT-AGENT-yolo-mode.md').write_text('yolo')
+
+
+def test_snapshot_answers_probes_like_the_filesystem(tmp_path):
+    _make_project(tmp_path)
+    snapshot = config_enforce.ProjectSnapshot(tmp_path)
+
+    for relative in ('bin/rjw', 'docs/prompts/user/core-yolo-flow.md', 'docs/prompts/user/core-turbo-flow.md',
+                     'add-ons/3d-game-core', 'method/config/features.yml', 'prompt-pack.json'):
+        assert snapshot.exists(tmp_path / relative) == (tmp_path / relative).exists(), relative
+
+
+def test_discover_enabled_features_uses_snapshot(tmp_path):
+    _make_project(tmp_path)
+    snapshot = config_enforce.get_snapshot(tmp_path, refresh=True)
+
+    actual = config_enforce.discover_enabled_features(tmp_path, snapshot)
+
+    assert actual == {'guard': True, 'yolo_mode': True, 'turbo_mode': False}
+
+
+def test_features_yml_cache_tracks_mtime(tmp_path):
+    _make_project(tmp_path)
+    features_file = tmp_path / 'method' / 'config' / 'features.yml'
+    snapshot = config_enforce.ProjectSnapshot(tmp_path)
+
+    assert config_enforce.load_features_yml(tmp_path, snapshot)['features']['guard'] is True
+
+    features_file.write_text("features:\n  guard: false\n")
+    stat = features_file.stat()
+    os.utime(features_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert config_enforce.load_features_yml(tmp_path, snapshot) == {'features': {'guard': False}}
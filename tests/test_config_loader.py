@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'config_loader.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for config loader tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+import tools.config_loader as config_loader  # noqa: E402
+
+
+def test_load_config_returns_independent_copies(tmp_path):
+    features = tmp_path / 'features.yml'
+    features.write_text("features:\n  guard: true\n")
+    config_loader.clear_cache()
+
+    first = config_loader.load_config(features)
+    first['features']['guard'] = False
+
+    assert config_loader.load_config(features) == {'features': {'guard': True}}
+
+
+def test_load_config_uses_disk_cache_across_processes(tmp_path, monkeypatch):
+    features = tmp_path / 'features.yml'
+    features.write_text("addons:\n  3d_game_core:\n    enabled: true\n")
+    cache_dir = tmp_path / 'cache'
+    config_loader.clear_cache()
+    config_loader.load_config(features, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob('*.json'))) == 1
+
+    config_loader.clear_cache()
+    monkeypatch.setattr(config_loader, 'load_yaml', lambda source: {'parsed': True})
+
+    assert config_loader.load_config(features, cache_dir=cache_dir) == {
+        'addons': {'3d_game_core': {'enabled': True}}
+    }
+
+
+def test_load_config_keeps_non_string_keys_out_of_disk_cache(tmp_path):
+    ports = tmp_path / 'ports.yml'
+    ports.write_text("ports:\n  8080: web\n  true: enabled\n")
+    cache_dir = tmp_path / 'cache'
+    config_loader.clear_cache()
+    fresh = config_loader.load_config(ports, cache_dir=cache_dir)
+
+    config_loader.clear_cache()
+
+    assert config_loader.load_config(ports, cache_dir=cache_dir) == fresh == {'ports': {8080: 'web', True: 'enabled'}}
+    assert not list(cache_dir.glob('*.json'))
+
+
+def test_load_config_prunes_stale_disk_entries(tmp_path):
+    features = tmp_path / 'features.yml'
+    other = tmp_path / 'other.yml'
+    features.write_text("features:\n  guard: true\n")
+    other.write_text("features: {}\n")
+    cache_dir = tmp_path / 'cache'
+    config_loader.clear_cache()
+    config_loader.load_config(features, cache_dir=cache_dir)
+    config_loader.load_config(other, cache_dir=cache_dir)
+
+    features.write_text("features:\n  guard: false\n  init: true\n")
+    config_loader.clear_cache()
+
+    assert config_loader.load_config(features, cache_dir=cache_dir) == {'features': {'guard': False, 'init': True}}
+    assert len(list(cache_dir.glob('*.json'))) == 2
+
+
+def test_dump_yaml_round_trips_in_insertion_order():
+    data = {'features': {'init': True, 'guard': False}}
+
+    text = config_loader.dump_yaml(data)
+
+    assert text.index('init') < text.index('guard')
+    assert config_loader.load_yaml(text) == data
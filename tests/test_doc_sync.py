@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'scripts' / 'doc_sync.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for doc sync tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+import scripts.doc_sync as doc_sync  # noqa: E402
+
+
+def _write_docs(root: Path) -> None:
+    fences = "```python\nx = 1\n```\n\n```py\ndef broken(:\n```\n"
+    for folder in ('docs', 'tutorials', 'manual'):
+        (root / folder).mkdir()
+        (root / folder / 'page.md').write_text(fences)
+
+
+def test_check_code_examples_covers_all_doc_roots_and_dedups(tmp_path):
+    _write_docs(tmp_path)
+    stats: dict = {}
+
+    issues = doc_sync.check_code_examples(tmp_path, stats=stats, workers=1)
+
+    assert sorted(Path(issue['file']).parent.name for issue in issues) == ['docs', 'manual', 'tutorials']
+    assert stats['fences'] == 6
+    assert stats['unique_fences'] == 2
+    assert stats['cache_hits'] == 0
+
+
+def test_check_code_examples_reuses_disk_cache(tmp_path):
+    _write_docs(tmp_path)
+    doc_sync.check_code_examples(tmp_path, workers=1)
+    stats: dict = {}
+
+    issues = doc_sync.check_code_examples(tmp_path, stats=stats, workers=1)
+
+    assert len(issues) == 3
+    assert stats['cache_hits'] == stats['unique_fences'] == 2
+    assert 'Cache hits: 2/2 (100.0%)' in doc_sync.generate_report(issues, stats)
+
+
+def test_validate_fences_parallel_matches_serial():
+    codes = {doc_sync.fence_digest(f"x = {i}"): f"x = {i}" for i in range(doc_sync.PARALLEL_THRESHOLD)}
+    codes[doc_sync.fence_digest("def (:")] = "def (:"
+
+    assert doc_sync.validate_fences(codes, workers=2) == doc_sync.validate_fences(codes, workers=1)
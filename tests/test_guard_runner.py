@@ -0,0 +1,116 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'testing' / 'guard_runner.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for guard runner tests")
+
+
+pkg_root = _starter_kit_root()
+GUARD_DIR = pkg_root / 'tools' / 'testing'
+if str(GUARD_DIR) not in sys.path:
+    sys.path.insert(0, str(GUARD_DIR))
+
+import guard_runner  # noqa: E402
+from changed_files import ChangedFilesIndex  # noqa: E402
+
+STANDALONE = {
+    'red-green': ['red_green_guard.py'],
+    'change-log': ['change_log_guard.py'],
+    'living-docs': ['living_docs_guard.py', '--fail-on-placeholder'],
+    'agent-response': ['agent_response_guard.py'],
+    'governance': ['governance_alignment_guard.py'],
+}
+
+
+def test_index_prefix_queries_preserve_diff_order():
+    index = ChangedFilesIndex(['specs/SPEC-0002.md', 'docs\\decisions\\DEC-0001.md', 'docs/a.md', 'tmp/x'])
+
+    assert index.has_prefix('docs/decisions/DEC-')
+    assert not index.has_prefix('artifacts/ledgers/')
+    assert index.with_any_prefix(('docs/', 'specs/')) == ['specs/SPEC-0002.md', 'docs/decisions/DEC-0001.md', 'docs/a.md']
+    assert index.excluding(('tmp/', 'workspace/')) == ['specs/SPEC-0002.md', 'docs/decisions/DEC-0001.md', 'docs/a.md']
+
+
+def test_runner_matches_standalone_guards(tmp_path):
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'living-docs-reconciliation.md').write_text('| gap | open |\n')
+    (tmp_path / 'specs').mkdir()
+    (tmp_path / 'specs' / 'SPEC-0001.md').write_text('spec\n')
+    (tmp_path / 'tools.py').write_text('x = 1\n')
+    files = ['tools.py', 'specs/SPEC-0001.md']
+
+    outcomes = guard_runner.run_guards(tmp_path, ChangedFilesIndex(files), fail_on_placeholder=True)
+
+    assert [outcome.name for outcome in outcomes] == list(STANDALONE)
+    for outcome in outcomes:
+        script, *options = STANDALONE[outcome.name]
+        result = subprocess.run(
+            [sys.executable, str(GUARD_DIR / script), '--root', str(tmp_path), *options, '--files', *files],
+            capture_output=True,
+            text=True,
+        )
+        assert outcome.returncode == result.returncode, outcome.name
+        assert outcome.messages == result.stderr.splitlines(), outcome.name
+
+
+def test_runner_cli_reports_every_failure(tmp_path, capsys):
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'living-docs-reconciliation.md').write_text('')
+    (tmp_path / 'app.py').write_text('x = 1\n')
+
+    code = guard_runner.main(['--root', str(tmp_path), '--files', 'app.py'])
+
+    captured = capsys.readouterr()
+    assert code == 1
+    assert 'diff lacks test updates' in captured.err
+    assert 'change-log guard: detected updates' in captured.err
+    assert 'living-doc guard: detected implementation' in captured.err
+    assert 'failed: red-green, change-log, living-docs, agent-response' in captured.out
+
+
+def test_guards_import_as_package_modules(tmp_path):
+    script = 'import sys; sys.path.insert(0, sys.argv[1]); from tools.testing import ' + ', '.join(
+        path[0][:-3] for path in STANDALONE.values()
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script, str(pkg_root)], cwd=tmp_path, capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+    help_run = subprocess.run(
+        [sys.executable, '-m', 'tools.testing.living_docs_guard', '--help'],
+        cwd=pkg_root,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert help_run.returncode == 0, help_run.stderr
+
+
+def test_tracer_is_only_imported_for_trace(tmp_path):
+    (tmp_path / 'tests').mkdir()
+    (tmp_path / 'tests' / 'test_app.py').write_text('')
+    script = (
+        'import sys; sys.path.insert(0, sys.argv[1]); import guard_runner; '
+        'guard_runner.main(sys.argv[2:]); print("tools.performance_monitor" in sys.modules)'
+    )
+
+    def run(*extra):
+        result = subprocess.run(
+            [sys.executable, '-c', script, str(GUARD_DIR), '--root', str(tmp_path), '--files', 'tests/test_app.py', *extra],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout.splitlines()[-1]
+
+    assert run() == 'False'
+    assert run('--trace', str(tmp_path / 'guards.trace.json')) == 'True'
+    assert (tmp_path / 'guards.trace.json').exists()
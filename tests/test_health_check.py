@@ -0,0 +1,134 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'health_check.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for health check tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import health_check  # noqa: E402
+from tools.health_check import HealthChecker  # noqa: E402
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('', encoding='utf-8')
+
+
+def test_python_file_walk_prunes_ignored_directories(tmp_path):
+    for relative in (
+        'tools/a.py',
+        'scripts/nested/b.py',
+        'artifacts/keep.py',
+        'README.md',
+        '.venv/lib/site.py',
+        'node_modules/pkg/x.py',
+        'artifacts/method-history/old/c.py',
+        'pkg.egg-info/d.py',
+        'tools/__pycache__/a.py',
+    ):
+        _touch(tmp_path / relative)
+    (tmp_path / 'loop').symlink_to(tmp_path, target_is_directory=True)
+
+    found = sorted(Path(path).relative_to(tmp_path).as_posix() for path in health_check.iter_python_files(tmp_path))
+
+    assert found == ['artifacts/keep.py', 'scripts/nested/b.py', 'tools/a.py']
+
+
+def test_dependencies_come_from_distribution_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(health_check, 'installed_distributions', lambda: {'pytest': '8.0.0', 'pre-commit': '3.5.0'})
+    monkeypatch.setattr(health_check.importlib.util, 'find_spec', lambda name: None)
+    checker = HealthChecker(str(tmp_path))
+
+    checker.check_dependencies()
+    deps = checker.results['dependencies']
+
+    assert deps['pytest'] == {'version': '8.0.0', 'status': 'ok'}
+    assert deps['pre-commit']['version'] == '3.5.0'
+    assert deps['mypy'] == {'version': 'not installed', 'status': 'warning'}
+
+
+def test_service_probes_run_concurrently(tmp_path, monkeypatch):
+    active = peak = 0
+    lock = threading.Lock()
+
+    def slow_probe(check):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return check.name != 'docker', f'{check.name}-1.0'
+
+    monkeypatch.setattr(health_check, 'probe_service', slow_probe)
+    checker = HealthChecker(str(tmp_path))
+
+    checker.check_services()
+
+    assert peak == len(health_check.SERVICE_CHECKS)
+    assert checker.results['services']['git'] == {'version': 'git-1.0', 'status': 'ok'}
+    assert checker.results['services']['docker']['status'] == 'warning'
+
+
+def test_npm_version_is_read_from_its_package_manifest(tmp_path):
+    package = tmp_path / 'lib' / 'node_modules' / 'npm'
+    (package / 'bin').mkdir(parents=True)
+    (package / 'package.json').write_text(json.dumps({'version': '10.1.0'}), encoding='utf-8')
+    script = package / 'bin' / 'npm-cli.js'
+    script.write_text('', encoding='utf-8')
+    launcher = tmp_path / 'npm'
+    launcher.symlink_to(script)
+
+    assert health_check._node_package_version(str(launcher)) == '10.1.0'
+    assert health_check._node_package_version(str(tmp_path / 'lib')) is None
+
+
+def test_run_all_checks_reports_per_check_timings(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(health_check, 'probe_service', lambda check: (True, '1.0'))
+    _touch(tmp_path / 'pyproject.toml')
+    _touch(tmp_path / 'tools' / 'a.py')
+
+    payload = HealthChecker(str(tmp_path)).run_all_checks()
+
+    timings = payload['timings_ms']
+    assert list(timings) == ['environment', 'dependencies', 'configuration', 'services', 'performance', 'total']
+    assert timings['total'] >= max(value for key, value in timings.items() if key != 'total')
+    assert 'import_time' not in payload['performance']
+    assert payload['performance']['file_count']['count'] == 1
+    assert 'Check Timings' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('stdout, expected', [('0.25\n', 0.25), ('', None)])
+def test_deep_mode_times_imports_in_a_fresh_interpreter(tmp_path, monkeypatch, stdout, expected):
+    class Result:
+        returncode = 0
+
+    Result.stdout = stdout
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        return Result()
+
+    monkeypatch.setattr(health_check.subprocess, 'run', fake_run)
+    checker = HealthChecker(str(tmp_path), deep=True)
+
+    checker.check_performance()
+
+    assert calls[0][:2] == [sys.executable, '-c']
+    assert checker.results['performance']['import_time']['time'] == expected
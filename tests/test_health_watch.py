@@ -0,0 +1,160 @@
+import http.client
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'health_watch.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for health watch tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import health_check, health_watch  # noqa: E402
+from tools.health_watch import FlapDetector, HealthWatcher  # noqa: E402
+
+
+def _watcher(tmp_path, monkeypatch, **options):
+    probes = []
+
+    def probe(check):
+        probes.append(check.name)
+        return True, '1.0'
+
+    monkeypatch.setattr(health_check, 'probe_service', probe)
+    monkeypatch.setattr(health_check, 'installed_distributions', lambda: {'pytest': '8.0.0'})
+    (tmp_path / 'pyproject.toml').write_text('', encoding='utf-8')
+    return HealthWatcher(tmp_path, clock=lambda: 1_700_000_000.0, **options), probes
+
+
+def _get(server, path):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    connection.request('GET', path)
+    response = connection.getresponse()
+    return response.status, response.getheader('Content-Type'), response.read().decode('utf-8')
+
+
+def test_expensive_checks_rerun_only_when_inputs_change(tmp_path, monkeypatch):
+    watcher, probes = _watcher(tmp_path, monkeypatch, full_refresh=0)
+
+    first = watcher.run_once()
+    second = watcher.run_once()
+    assert first['reused'] == [] and second['reused'] == ['dependencies', 'services']
+    assert len(probes) == len(health_check.SERVICE_CHECKS)
+    assert second['results']['services']['git'] == {'version': '1.0', 'status': 'ok'}
+
+    monkeypatch.setenv('PATH', '/opt/new/bin:' + health_watch.os.environ.get('PATH', ''))
+    third = watcher.run_once()
+    assert third['reused'] == ['dependencies']
+    assert len(probes) == 2 * len(health_check.SERVICE_CHECKS)
+
+    (tmp_path / 'pyproject.toml').write_text('[project]\n', encoding='utf-8')
+    health_watch.os.utime(tmp_path / 'pyproject.toml', ns=(1, 1))
+    assert watcher.run_once()['reused'] == ['services']
+
+
+def test_flap_detection_has_hysteresis():
+    detector = FlapDetector(window=10)
+    assert not any(detector.record(status) for status in ['ok'] * 4)
+    for status in ['warning', 'ok', 'warning', 'ok']:
+        detector.record(status)
+    assert detector.flapping
+
+    for _ in range(4):
+        detector.record('ok')
+    assert detector.flapping, 'stays flapping until the change rate drops below the low threshold'
+    for _ in range(6):
+        detector.record('ok')
+    assert not detector.flapping
+
+
+def test_history_is_bounded_and_flapping_checks_are_reported(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch, history=6)
+    for index in range(8):
+        path = tmp_path / '.editorconfig'
+        if index % 2:
+            path.write_text('', encoding='utf-8')
+        else:
+            path.unlink(missing_ok=True)
+        snapshot = watcher.run_once()
+
+    assert len(watcher.history) == 6 and watcher.history[-1]['timestamp'] == 1_700_000_000.0
+    assert 'configuration..editorconfig' in snapshot['flapping']
+    assert 'environment.python_version' not in snapshot['flapping']
+
+
+def test_http_endpoints_serve_prometheus_and_json(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    server = health_watch.make_server(watcher, listen='127.0.0.1:0')
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, _, body = _get(server, '/health')
+        assert status == 503
+        status, _, body = _get(server, '/metrics')
+        assert 'rjw_health_up 0' in body
+
+        watcher.run_once()
+        status, content_type, body = _get(server, '/metrics')
+        assert status == 200 and content_type.startswith('text/plain; version=0.0.4')
+        assert 'rjw_health_up 1' in body
+        assert 'rjw_health_check_status{category="services",check="git"} 0' in body
+        assert 'rjw_health_check_flapping{category="services",check="git"} 0' in body
+        assert 'rjw_health_runs_total 1' in body
+
+        status, _, body = _get(server, '/health')
+        assert status == 200 and json.loads(body)['results']['dependencies']['pytest']['version'] == '8.0.0'
+        assert json.loads(_get(server, '/history')[2])['runs'] == 1
+        assert _get(server, '/nope')[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_watch_serves_on_a_unix_socket_and_cleans_it_up(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    socket_path = tmp_path / 'health.sock'
+    server = health_watch.make_server(watcher, unix_socket=socket_path)
+    lines = []
+    stop = threading.Event()
+
+    def out(line):
+        lines.append(line)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(socket_path))
+        client.sendall(b'GET /metrics HTTP/1.0\r\n\r\n')
+        response = b''
+        while chunk := client.recv(65536):
+            response += chunk
+        client.close()
+        lines.append(response.decode('utf-8'))
+        stop.set()
+
+    health_watch.watch(watcher, interval=0, server=server, stop=stop, out=out)
+
+    assert lines[0].endswith('ms') and 'run 1: ' in lines[0]
+    assert 'rjw_health_overall_status' in lines[1]
+    assert not socket_path.exists()
+
+
+def test_prometheus_labels_are_escaped():
+    snapshot = {
+        'timestamp': 1.0,
+        'overall_status': 'ok',
+        'results': {'configuration': {'a"b\\c': {'status': 'weird'}}},
+        'timings_ms': {'total': 1.5},
+        'reused': [],
+        'flapping': [],
+    }
+    body = health_watch.render_prometheus(snapshot, 1)
+    assert 'check="a\\"b\\\\c"} 3' in body
+    assert 'rjw_health_check_duration_seconds{category="total"} 0.001500' in body
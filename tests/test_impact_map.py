@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'testing' / 'impact_map.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for impact map tests")
+
+
+pkg_root = _starter_kit_root()
+GUARD_DIR = pkg_root / 'tools' / 'testing'
+if str(GUARD_DIR) not in sys.path:
+    sys.path.insert(0, str(GUARD_DIR))
+
+import impact_map  # noqa: E402
+
+
+def _write(root: Path, relative: str, text: str) -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _project(tmp_path: Path) -> Path:
+    _write(tmp_path, 'tools/base.py', 'VALUE = 1\n')
+    _write(tmp_path, 'tools/feature.py', 'from tools.base import VALUE\n')
+    _write(tmp_path, 'tools/testing/guard.py', 'from . import helpers\n')
+    _write(tmp_path, 'tools/testing/helpers.py', '')
+    _write(tmp_path, 'scripts/ci/run.py', 'print("hi")\n')
+    _write(tmp_path, 'tests/test_feature.py', 'from tools import feature\n')
+    _write(tmp_path, 'tests/test_guard.py', 'import guard\n')
+    _write(tmp_path, 'tests/test_run.py', "SCRIPT = ROOT / 'scripts' / 'ci' / 'run.py'\n")
+    return tmp_path
+
+
+def test_affected_tests_follow_imports_and_file_references(tmp_path):
+    impact = impact_map.ImpactMap(_project(tmp_path))
+    impact.refresh()
+
+    assert impact.affected_tests(['tools/base.py']) == ['tests/test_feature.py']
+    assert impact.affected_tests(['tools/testing/helpers.py']) == ['tests/test_guard.py']
+    assert impact.affected_tests(['scripts/ci/run.py']) == ['tests/test_run.py']
+    assert impact.affected_tests(['tests/test_run.py', 'docs/readme.md']) == ['tests/test_run.py']
+
+
+def test_map_is_cached_and_refreshed_incrementally(tmp_path):
+    root = _project(tmp_path)
+    cache = tmp_path / 'logs' / 'ci' / impact_map.MAP_FILENAME
+
+    first = impact_map.ImpactMap(root, cache)
+    assert first.refresh() == 8
+    first.save()
+
+    _write(root, 'tools/base.py', 'VALUE = 2\nimport tools.extra\n')
+    _write(root, 'tools/extra.py', '')
+    second = impact_map.ImpactMap(root, cache)
+    assert second.refresh() == 2
+    assert second.affected_tests(['tools/extra.py']) == ['tests/test_feature.py']
+
+
+def test_full_run_policy(tmp_path):
+    root = _project(tmp_path)
+    cache = tmp_path / 'map.json'
+    all_tests = ['tests/test_feature.py', 'tests/test_guard.py', 'tests/test_run.py']
+
+    def select(changed, **options):
+        return impact_map.select_tests(root, changed, cache_path=cache, **options)
+
+    first = select(['tools/base.py'], full_every=3)
+    assert first.full and first.reason == 'no previous full run recorded' and first.tests == all_tests
+    assert select(['tools/base.py'], full_every=3).full, 'a selected full run only counts once it passes'
+    impact_map.record_full_run(root, cache)
+
+    assert select(['tools/base.py'], full_every=3).tests == ['tests/test_feature.py']
+    assert select(['tools/base.py'], full_every=3).tests == ['tests/test_feature.py']
+    assert select(['tools/base.py'], full_every=3).full
+
+    infra = select(['tests/conftest.py'], full_every=0)
+    assert infra.full and 'conftest.py' in infra.reason
+    assert not select(['tools/base.py'], full_every=0).full
+    assert select(['tools/base.py'], full_every=0, max_age_hours=1e-9).full
+
+
+def test_unmapped_changes_fall_back_to_a_full_run(tmp_path):
+    root = _project(tmp_path)
+    _write(root, 'tools/budgets.yml', 'limit: 1\n')
+    _write(root, 'tools/loader.py', "BUDGETS = 'budgets.yml'\n")
+    _write(root, 'tests/test_loader.py', 'import loader\n')
+    _write(root, 'tests/fixtures/data.json', '{}')
+    _write(root, 'tests/test_fixture.py', "DATA = HERE / 'fixtures' / 'data.json'\n")
+    _write(root, 'tools/orphan.py', '')
+    cache = tmp_path / 'map.json'
+    impact_map.select_tests(root, ['tools/base.py'], cache_path=cache)
+    impact_map.record_full_run(root, cache)
+
+    def select(changed):
+        return impact_map.select_tests(root, changed, cache_path=cache, full_every=0)
+
+    assert select(['tools/budgets.yml']).tests == ['tests/test_loader.py']
+    assert select(['tests/fixtures/data.json', 'docs/notes.md']).tests == ['tests/test_fixture.py']
+    for changed in (['tools/orphan.py'], ['prompt-pack.json'], ['tools/base.py', 'tools/deleted.py']):
+        selection = select(changed)
+        assert selection.full and selection.reason.startswith('no test maps to'), changed
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'import_profiler.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for import profiler tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import import_profiler  # noqa: E402
+from tools.import_profiler import ImportProfile, ModuleCost  # noqa: E402
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings.latin_1
+import time:       200 |        300 | encodings
+rjw-importtime-probe
+import time:       500 |        500 |     yaml.reader
+import time:      2000 |       2500 |   yaml.loader
+import time:      1000 |       3500 | yaml
+import time:       300 |        300 | json
+"""
+
+
+def _profile(entry, costs, total_us=40_000):
+    profile = ImportProfile(entry, totals_us=[total_us])
+    for module, cumulative_ms, parent in costs:
+        profile.modules[module] = ModuleCost(module, cumulative_ms * 500, cumulative_ms * 1000, parent)
+    return profile
+
+
+def test_parse_builds_tree_after_probe_marker():
+    roots = import_profiler.parse_importtime(SAMPLE)
+
+    assert [root.module for root in roots] == ['yaml', 'json']
+    yaml = roots[0]
+    assert yaml.cumulative_us == 3500 and yaml.children[0].module == 'yaml.loader'
+    assert [record.module for record in yaml.walk()] == ['yaml', 'yaml.loader', 'yaml.reader']
+
+
+def test_only_outermost_new_heavy_import_is_reported():
+    budgets = {
+        'heavy_import_ms': 20,
+        'entry_points': {'bin/rjw': {'total_ms': 50, 'heavy_imports': ['tools.rjw_cli']}},
+    }
+    profile = _profile(
+        'bin/rjw',
+        [
+            ('tools.rjw_cli', 45, None),
+            ('pandas', 30, 'tools.rjw_cli'),
+            ('numpy', 25, 'pandas'),
+            ('re', 5, None),
+        ],
+        total_us=60_000,
+    )
+
+    violations = import_profiler.check_budgets([profile], budgets)
+
+    assert len(violations) == 2
+    assert 'take 60.0ms, budget is 50.0ms' in violations[0]
+    assert "new heavy import 'pandas'" in violations[1]
+
+
+def test_update_budgets_lists_near_threshold_modules_with_headroom():
+    profile = _profile('scripts/x.py', [('yaml', 25, None), ('json', 15, None), ('re', 5, None)], total_us=10_000)
+
+    budgets = import_profiler.budgets_from_profiles([profile], {'heavy_import_ms': 20, 'headroom': 1.5})
+
+    entry = budgets['entry_points']['scripts/x.py']
+    assert entry['heavy_imports'] == ['json', 'yaml']
+    assert entry['total_ms'] == import_profiler.MIN_TOTAL_MS
+    assert import_profiler.check_budgets([profile], budgets) == []
+
+
+def test_profiles_a_script_without_running_main(tmp_path):
+    (tmp_path / 'bin').mkdir()
+    (tmp_path / 'bin' / 'helper_mod.py').write_text('import json\nVALUE = 1\n', encoding='utf-8')
+    (tmp_path / 'bin' / 'tool').write_text(
+        'from dataclasses import dataclass\nimport helper_mod\n\n@dataclass\nclass Opt:\n    name: str = "x"\n\n'
+        'if __name__ == "__main__":\n    raise SystemExit("main ran")\n',
+        encoding='utf-8',
+    )
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'scripts' / '__init__.py').write_text('', encoding='utf-8')
+
+    assert import_profiler.discover_entry_points(tmp_path, ('bin/tool', 'scripts/*.py')) == ['bin/tool']
+    profile = import_profiler.profile_entry_point(tmp_path, 'bin/tool', warmup=0, repetitions=2)
+
+    assert profile.error is None
+    assert 'helper_mod' in profile.modules and len(profile.totals_us) == 2
+    assert profile.modules['json'].parent == 'helper_mod'
+
+
+def test_format_lists_heavy_imports_without_top():
+    profile = _profile('scripts/x.py', [('yaml', 25, None), ('re', 5, None)])
+
+    lines = import_profiler.format_profile(profile, top=0, threshold_ms=20).splitlines()
+
+    assert lines[1] == '  heavy: yaml 25.0ms' and len(lines) == 2
+    light = _profile('scripts/y.py', [('re', 5, None)])
+    assert len(import_profiler.format_profile(light, top=0, threshold_ms=20).splitlines()) == 1
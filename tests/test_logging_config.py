@@ -0,0 +1,124 @@
+import json
+import logging
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'logging_config.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for logging config tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import logging_config  # noqa: E402
+from tools.logging_config import BoundedQueueHandler, get_logger, setup_logging  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _restore_logging():
+    loggers = [logging.getLogger(), logging.getLogger('rjw_idd')]
+    saved = [(logger, logger.handlers[:], logger.level) for logger in loggers]
+    yield
+    logging_config.shutdown_logging()
+    for logger, handlers, level in saved:
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handler.close()
+        logger.handlers = handlers
+        logger.setLevel(level)
+    logging_config._active_settings = None
+
+
+def _record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.makeLogRecord({'msg': message, 'levelno': level, 'levelname': logging.getLevelName(level)})
+
+
+def test_repeated_setup_with_the_same_settings_is_free(tmp_path, monkeypatch):
+    calls = []
+    real_dict_config = logging_config.logging.config.dictConfig
+    monkeypatch.setattr(logging_config.logging.config, 'dictConfig', lambda config: calls.append(real_dict_config(config)))
+
+    for _ in range(3):
+        setup_logging(log_file=tmp_path / 'app.log')
+    assert len(calls) == 1
+
+    setup_logging(log_file=tmp_path / 'app.log', level='DEBUG')
+    assert len(calls) == 2
+    with pytest.raises(ValueError, match='Unknown overflow policy'):
+        setup_logging(overflow='spill')
+
+
+def test_async_mode_writes_json_lines_from_a_background_thread(tmp_path):
+    log_file = tmp_path / 'nested' / 'app.log'
+    setup_logging(log_file=log_file, async_mode=True, json_format=True)
+    assert all(isinstance(handler, BoundedQueueHandler) for handler in logging.getLogger('rjw_idd').handlers)
+
+    get_logger('backup').info('copied %d files', 3, extra={'backup': 'nightly'})
+    try:
+        raise RuntimeError('boom')
+    except RuntimeError:
+        get_logger('backup').exception('failed')
+    logging_config.shutdown_logging()
+
+    lines = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+    copied = next(line for line in lines if line['message'] == 'copied 3 files')
+    assert copied['logger'] == 'rjw_idd.backup' and copied['level'] == 'INFO' and copied['backup'] == 'nightly'
+    failed = next(line for line in lines if line['message'].startswith('failed'))
+    assert 'RuntimeError: boom' in failed['message'] + failed.get('exception', '')
+    assert not any(isinstance(handler, BoundedQueueHandler) for handler in logging.getLogger('rjw_idd').handlers)
+
+
+def test_full_queue_drops_and_counts_or_blocks():
+    dropping = BoundedQueueHandler(queue.Queue(maxsize=1), overflow='drop')
+    for level in (logging.INFO, logging.INFO, logging.ERROR):
+        dropping.handle(_record('x', level))
+    assert dict(dropping.dropped) == {'INFO': 1, 'ERROR': 1}
+
+    log_queue = queue.Queue(maxsize=1)
+    blocking = BoundedQueueHandler(log_queue, overflow='block')
+    blocking.handle(_record('first'))
+    writer = threading.Thread(target=blocking.handle, args=(_record('second'),))
+    writer.start()
+    writer.join(0.1)
+    assert writer.is_alive(), 'the caller waits for room instead of dropping'
+    assert log_queue.get().getMessage() == 'first'
+    writer.join(5)
+    assert log_queue.get().getMessage() == 'second' and not blocking.dropped
+
+
+def test_file_log_rotates_by_size(tmp_path):
+    log_file = tmp_path / 'app.log'
+    setup_logging(log_file=log_file, max_bytes=512, backup_count=2)
+
+    for index in range(60):
+        get_logger('rotation').debug('line %03d %s', index, 'x' * 40)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['app.log', 'app.log.1', 'app.log.2']
+    assert log_file.stat().st_size <= 512
+
+
+def test_plain_setup_does_not_need_the_tools_package(tmp_path):
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import logging_config; "
+        "logging_config.setup_logging(log_file=sys.argv[2])"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script, str(pkg_root / 'tools'), str(tmp_path / 'app.log')],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    assert 'json' not in logging_config.LOGGING_CONFIG['formatters']
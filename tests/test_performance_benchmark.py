@@ -0,0 +1,177 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'performance_benchmark.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for performance benchmark tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import microbenchmarks, performance_benchmark  # noqa: E402
+from tools.performance_benchmark import (  # noqa: E402
+    PerformanceBenchmark,
+    compare_samples,
+    mann_whitney_greater,
+    summarise_samples,
+)
+
+
+def _fake_timer(times):
+    calls = []
+
+    def fake_time_subprocess(self, command):
+        calls.append(command)
+        return {'time': next(times), 'return_code': 0, 'stdout': '', 'stderr': '', 'error': None}
+
+    return fake_time_subprocess, calls
+
+
+def test_summary_rejects_outliers_and_reports_median_iqr():
+    stats = summarise_samples([1.0, 1.1, 0.9, 1.0, 1.05, 0.95, 9.0])
+
+    assert stats.rejected == [9.0]
+    assert stats.median == pytest.approx(1.0)
+    assert stats.iqr == pytest.approx(0.075)
+    assert stats.to_dict()['n'] == 6
+
+
+def test_mann_whitney_exact_and_tied_p_values():
+    u, p = mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+    assert u == 25 and p == pytest.approx(1 / 252)
+
+    _, p_reverse = mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+    assert p_reverse == pytest.approx(1.0)
+
+    _, p_tied = mann_whitney_greater([1.0] * 6, [1.0] * 6)
+    assert p_tied == 1.0
+
+
+@pytest.mark.parametrize('method', ['mann-whitney', 'bootstrap'])
+def test_only_significant_material_slowdowns_are_regressions(method):
+    baseline = [1.00, 1.01, 0.99, 1.02, 0.98, 1.00, 1.01, 0.99]
+    slower = [value * 1.3 for value in baseline]
+    noisy = [0.9, 1.1, 1.0, 1.05, 0.95, 1.02, 0.97, 1.03]
+    slightly = [value * 1.02 for value in baseline]
+
+    assert compare_samples('cli', slower, baseline, method=method).verdict == 'regression'
+    assert compare_samples('cli', baseline, slower, method=method).verdict == 'improvement'
+    assert compare_samples('cli', noisy, baseline, method=method).verdict == 'unchanged'
+    assert compare_samples('cli', slightly, baseline, method=method).verdict == 'unchanged'
+
+
+def test_cli_benchmark_warms_up_then_collects_repetitions(tmp_path, monkeypatch):
+    fake, calls = _fake_timer(iter([5.0, 1.0, 1.1, 0.9]))
+    monkeypatch.setattr(PerformanceBenchmark, '_time_subprocess', fake)
+    bench = PerformanceBenchmark(str(tmp_path), warmup=1, repetitions=3)
+
+    bench._benchmark_cli(key='probe', title='probe', command=['probe'])
+    record = bench.results['benchmarks']['probe']
+
+    assert len(calls) == 4
+    assert record['samples'] == [1.0, 1.1, 0.9]
+    assert record['execution_time'] == pytest.approx(1.0)
+    assert record['stats']['q1'] == pytest.approx(0.95)
+
+
+def test_main_fails_only_on_significant_regression(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(performance_benchmark, 'cpu_pinning_hints', lambda: [])
+    baseline_path = tmp_path / 'baseline.json'
+
+    fake, _ = _fake_timer(iter([0.1 + (i % 5) * 0.001 for i in range(1000)]))
+    monkeypatch.setattr(PerformanceBenchmark, '_time_subprocess', fake)
+    args = ['--project-root', str(tmp_path), '--repetitions', '6', '--warmup', '0']
+    assert performance_benchmark.main([*args, '--save-baseline', str(baseline_path)]) == 0
+    saved = json.loads(baseline_path.read_text(encoding='utf-8'))
+    assert len(saved['benchmarks']['evidence_harvester']['samples']) == 6
+
+    assert performance_benchmark.main([*args, '--baseline', str(baseline_path)]) == 0
+
+    fake, _ = _fake_timer(iter([0.2 + (i % 5) * 0.001 for i in range(1000)]))
+    monkeypatch.setattr(PerformanceBenchmark, '_time_subprocess', fake)
+    assert performance_benchmark.main([*args, '--baseline', str(baseline_path)]) == 1
+    assert 'regression' in capsys.readouterr().out
+
+
+def test_micro_suite_reports_throughput_and_scaling(tmp_path, monkeypatch):
+    monkeypatch.setattr(performance_benchmark, 'cpu_pinning_hints', lambda: [])
+    small = {
+        bench.name: microbenchmarks.MicroBenchmark(
+            bench.name, bench.target, bench.unit, (('100', 100), ('1k', 1000)), bench.prepare
+        )
+        for bench in microbenchmarks.MICRO_BENCHMARKS
+        if bench.unit != 'MB'
+    }
+    monkeypatch.setattr(microbenchmarks, 'MICRO_BENCHMARKS', tuple(small.values()))
+
+    bench = PerformanceBenchmark(str(tmp_path), warmup=0, repetitions=2)
+    results = bench.run_micro_benchmarks(names=['validate_record', 'requirement_ledger'])
+
+    record = results['benchmarks']['micro.validate_record.1k']
+    assert record['status'] == 'ok' and len(record['samples']) == 2
+    assert record['throughput'] > 0 and record['throughput_unit'] == 'records/s'
+    assert set(results['scaling']) == {'validate_record', 'requirement_ledger'}
+    assert [point['scale'] for point in results['scaling']['requirement_ledger']['points']] == ['100', '1k']
+
+    with pytest.raises(ValueError, match='unknown microbenchmark'):
+        microbenchmarks.select(['nope'])
+
+
+def test_synthetic_inputs_are_seeded_and_sized():
+    assert microbenchmarks.generate_evidence_records(50) == microbenchmarks.generate_evidence_records(50)
+    doc = microbenchmarks.generate_markdown(64 * 1024)
+    assert 64 * 1024 <= len(doc) < 66 * 1024 and '```python' in doc
+    assert microbenchmarks.scaling_exponent([(1000, 0.01), (10_000, 0.1), (100_000, 1.0)]) == pytest.approx(1.0)
+    assert microbenchmarks.scaling_exponent([(1000, 0.01)]) is None
+
+
+def test_parallel_mode_overlaps_cli_benchmarks_and_keeps_report_order(tmp_path, monkeypatch, capsys):
+    active = peak = 0
+    lock = threading.Lock()
+
+    def slow_time_subprocess(self, command):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return {'time': 0.02, 'return_code': 0, 'stdout': '', 'stderr': '', 'error': None}
+
+    monkeypatch.setattr(performance_benchmark, 'cpu_pinning_hints', lambda: [])
+    monkeypatch.setattr(PerformanceBenchmark, '_time_subprocess', slow_time_subprocess)
+    monkeypatch.setattr(PerformanceBenchmark, '_time_import', lambda self, module: 0.01)
+    bench = PerformanceBenchmark(str(tmp_path), warmup=0, repetitions=2, jobs=4)
+
+    results = bench.run_all_benchmarks()
+
+    assert peak >= 2
+    keys = [spec.key for spec in performance_benchmark.CLI_BENCHMARKS]
+    assert list(results['benchmarks'])[: len(keys)] == keys
+    assert results['metadata']['execution'] == 'parallel'
+    imports = results['benchmarks']['import_times']
+    assert imports['mode'] == 'fresh' and imports['module_stats']['tools.logging_config']['n'] == 2
+    out = capsys.readouterr().out
+    assert out.index('Evidence Harvester') < out.index('Mypy Type Check') < out.index('Module Import Times')
+
+
+def test_fresh_import_probe_runs_in_a_new_interpreter(tmp_path):
+    (tmp_path / 'probe_mod.py').write_text('VALUE = 1\n', encoding='utf-8')
+    bench = PerformanceBenchmark(str(tmp_path), warmup=0, repetitions=2)
+
+    samples = bench._measure_import('probe_mod')
+    assert len(samples) == 2 and all(sample > 0 for sample in samples)
+    assert 'probe_mod' not in sys.modules
+    assert bench._measure_import('missing_mod_xyz').startswith('error:')
@@ -0,0 +1,239 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'performance_monitor.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for performance monitor tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import performance_monitor  # noqa: E402
+from tools.performance_monitor import PerformanceMonitor, Tracer  # noqa: E402
+
+
+def test_spans_nest_per_thread_and_export_chrome_trace(tmp_path):
+    tracer = Tracer(capacity=16)
+
+    with tracer.span('outer', kind='run'):
+        with tracer.span('inner') as inner:
+            inner.set(items=3)
+
+    def worker():
+        with tracer.span('thread'):
+            pass
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    spans = {record.name: record for record in tracer.spans()}
+    assert spans['inner'].parent_id == spans['outer'].span_id
+    assert spans['outer'].parent_id == 0 and spans['thread'].parent_id == 0
+    assert spans['outer'].start_ns <= spans['inner'].start_ns <= spans['inner'].end_ns <= spans['outer'].end_ns
+
+    trace = json.loads(tracer.export_chrome_trace(tmp_path / 'trace.json').read_text(encoding='utf-8'))
+    events = {event['name']: event for event in trace['traceEvents']}
+    assert events['inner']['ph'] == 'X'
+    assert events['inner']['args'] == {'items': 3, 'span_id': spans['inner'].span_id, 'parent_id': spans['outer'].span_id}
+    assert events['outer']['args']['kind'] == 'run'
+
+
+def test_ring_buffer_keeps_newest_spans():
+    tracer = Tracer(capacity=4)
+    for index in range(10):
+        with tracer.span(f'span-{index}'):
+            pass
+
+    assert [record.name for record in tracer.spans()] == ['span-6', 'span-7', 'span-8', 'span-9']
+    assert tracer.dropped == 6
+    assert len(tracer._buffer) == 4
+
+
+def test_ring_buffer_is_allocated_as_spans_arrive():
+    tracer = Tracer(enabled=False)
+    assert tracer._buffer == []
+
+    tracer.enabled = True
+    with tracer.span('first'):
+        pass
+    assert len(tracer._buffer) == 1 and tracer.spans()[0].name == 'first'
+
+
+def test_disabled_tracer_returns_shared_noop_span():
+    tracer = Tracer(enabled=False)
+
+    with tracer.span('ignored') as span:
+        span.set(value=1)
+
+    assert span is performance_monitor.NOOP_SPAN
+    assert tracer.spans() == []
+
+
+def test_measure_records_span_and_bounds_metrics():
+    monitor = PerformanceMonitor(max_metrics=3, trace=True)
+    for index in range(5):
+        with monitor.measure('op', index=index):
+            pass
+
+    assert [metric.metadata['index'] for metric in monitor.metrics] == [2, 3, 4]
+    assert [record.name for record in monitor.tracer.spans()] == ['op'] * 5
+
+
+def test_histogram_percentiles_within_relative_accuracy():
+    histogram = performance_monitor.LatencyHistogram(relative_accuracy=0.01)
+    values = [index / 10000 for index in range(1, 10001)]
+    for value in values:
+        histogram.record(value)
+
+    summary = histogram.summary()
+    assert summary['count'] == 10000 and summary['min'] == values[0] and summary['max'] == values[-1]
+    for label, expected in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p999', 0.999)):
+        assert abs(summary[label] - expected) / expected <= 0.011
+    assert len(histogram.buckets) < 1000
+
+
+def test_histograms_merge_across_processes_and_reset_per_window():
+    first = PerformanceMonitor()
+    second = PerformanceMonitor()
+    for _ in range(3):
+        with first.measure('guard'):
+            pass
+    with second.measure('guard'):
+        pass
+    with second.measure('harvest'):
+        pass
+
+    payload = json.loads(json.dumps(second.export_histograms()))
+    first.merge_histograms(payload)
+    stats = first.get_summary_stats()
+    assert stats['total_measurements'] == 5
+    assert stats['per_operation']['guard']['count'] == 4
+    assert stats['per_operation']['harvest']['count'] == 1
+    assert 'measurements' not in stats
+
+    window = first.snapshot(reset=True)
+    assert window['guard'].count == 4
+    assert first.get_summary_stats() == {}
+
+
+def test_measure_captures_requested_resources_only(tmp_path):
+    monitor = PerformanceMonitor(trace=True)
+
+    with monitor.measure('plain'):
+        pass
+    with monitor.measure('alloc', track_memory=True, track_allocations=True, track_cpu=True, track_rss=True):
+        kept = [bytearray(1024) for _ in range(200)]
+        with monitor.measure('inner', track_memory=True):
+            scratch = bytearray(512 * 1024)
+            del scratch
+
+    plain, inner, alloc = monitor.metrics
+    assert plain.resources() == {}
+    assert inner.memory_usage >= 500 * 1024 and inner.memory_net < 500 * 1024
+    # The inner block's peak is credited to the enclosing block
+    assert alloc.memory_usage >= 500 * 1024
+    assert alloc.memory_net >= 200 * 1024
+    assert alloc.cpu_user is not None and alloc.cpu_usage == alloc.cpu_user + alloc.cpu_system
+    assert alloc.rss_delta is not None
+    assert len(kept) == 200
+
+    monitor.save_report(tmp_path / 'report.json')
+    report = json.loads((tmp_path / 'report.json').read_text(encoding='utf-8'))
+    assert report['per_operation']['alloc']['resources']['memory_peak_max'] >= 500 * 1024
+    top = report['top_allocation_sites'][0]
+    assert 'test_performance_monitor.py' in top['site'] and top['size'] >= 200 * 1024
+    assert top['operations'] == ['alloc']
+
+
+
+def test_memory_tracking_is_independent_across_threads():
+    monitor = PerformanceMonitor()
+    a_peaked, b_open, a_done = threading.Event(), threading.Event(), threading.Event()
+    errors = []
+
+    def thread_a():
+        try:
+            with monitor.measure('a', track_memory=True):
+                scratch = bytearray(1024 * 1024)
+                del scratch
+                a_peaked.set()
+                b_open.wait(5)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+        finally:
+            a_done.set()
+
+    def thread_b():
+        try:
+            a_peaked.wait(5)
+            with monitor.measure('b', track_allocations=True):
+                b_open.set()
+                a_done.wait(5)
+                kept = bytearray(256 * 1024)
+            assert len(kept) == 256 * 1024
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=thread_a), threading.Thread(target=thread_b)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    metrics = {metric.operation: metric for metric in monitor.metrics}
+    # A's peak survives B's reset, and is not handed to B on exit
+    assert metrics['a'].memory_usage >= 1024 * 1024
+    assert 256 * 1024 <= metrics['b'].memory_usage < 1024 * 1024
+    assert metrics['b'].memory_net >= 256 * 1024
+    assert metrics['b'].allocation_sites
+    assert not performance_monitor.tracemalloc.is_tracing()
+
+def _busy_leaf(deadline):
+    total = 0
+    while performance_monitor.time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def _busy_root(seconds):
+    return _busy_leaf(performance_monitor.time.perf_counter() + seconds)
+
+
+def test_sampling_profile_writes_folded_and_speedscope(tmp_path):
+    monitor = PerformanceMonitor()
+    output = tmp_path / 'harvest'
+
+    profiled = monitor.profile_function(output, mode='sample', interval=0.002)(_busy_root)
+    assert profiled(0.2) > 0
+
+    folded = (tmp_path / 'harvest.folded').read_text(encoding='utf-8').splitlines()
+    stack, count = folded[0].rsplit(' ', 1)
+    frames = stack.split(';')
+    assert frames[0].startswith('_busy_root (') and frames[1].startswith('_busy_leaf (')
+    assert int(count) > 10
+
+    speedscope = json.loads((tmp_path / 'harvest.speedscope.json').read_text(encoding='utf-8'))
+    profile = speedscope['profiles'][0]
+    assert profile['type'] == 'sampled' and profile['name'].endswith('_busy_root')
+    assert len(profile['samples']) == len(profile['weights'])
+    names = {frame['name'] for frame in speedscope['shared']['frames']}
+    assert {'_busy_root', '_busy_leaf'} <= names
+
+
+def test_sampling_profile_reports_overhead_on_console(capsys):
+    monitor = PerformanceMonitor()
+
+    monitor.profile_function(mode='sample', interval=0.002)(_busy_root)(0.05)
+
+    out = capsys.readouterr().out
+    assert 'sampler overhead' in out and '_busy_leaf' in out
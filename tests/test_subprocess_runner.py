@@ -0,0 +1,100 @@
+import io
+import re
+import sys
+from pathlib import Path
+
+
+def _starter_kit_root() -> Path:
+    here = Path(__file__).resolve()
+    for candidate in here.parents:
+        if (candidate / 'tools' / 'subprocess_runner.py').exists():
+            return candidate
+    raise RuntimeError("Cannot locate starter kit root for subprocess runner tests")
+
+
+pkg_root = _starter_kit_root()
+if str(pkg_root) not in sys.path:
+    sys.path.insert(0, str(pkg_root))
+
+from tools import subprocess_runner  # noqa: E402
+
+NOISY = (
+    "import sys, time\n"
+    "for i in range(2000):\n"
+    "    print(f'line {i:04d}')\n"
+    "sys.stdout.flush()\n"
+    "time.sleep(0.2)\n"
+    "print('boom', file=sys.stderr)\n"
+    "sys.exit(2)\n"
+)
+
+
+def test_streams_to_console_and_timestamped_log(tmp_path):
+    console = io.StringIO()
+    log_path = tmp_path / 'run.log'
+
+    result = subprocess_runner.run_streaming(
+        [sys.executable, '-c', "import sys; print('hello'); print('oops', file=sys.stderr)"],
+        log_path=log_path,
+        header=('# header',),
+        echo=console,
+        echo_prefix='[probe] ',
+    )
+
+    assert result.returncode == 0
+    assert sorted(console.getvalue().splitlines()) == ['[probe] hello', '[probe] oops']
+    lines = log_path.read_text(encoding='utf-8').splitlines()
+    assert lines[0] == '# header'
+    stamped = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z (stdout|stderr) \| ')
+    assert sorted(line.split(' | ')[1] for line in lines[2:]) == ['hello', 'oops']
+    assert all(stamped.match(line) for line in lines[2:])
+    assert result.summary()['stdout_bytes'] == len('hello\n')
+    assert result.summary()['stderr_bytes'] == len('oops\n')
+
+
+def test_log_and_excerpts_keep_head_and_tail_within_caps(tmp_path):
+    log_path = tmp_path / 'run.log'
+
+    result = subprocess_runner.run_streaming(
+        [sys.executable, '-c', NOISY],
+        log_path=log_path,
+        echo=False,
+        head_bytes=2000,
+        tail_bytes=2000,
+        keep_lines=5,
+    )
+
+    assert result.returncode == 2
+    assert result.stdout.lines == 2000 and result.stdout.bytes == 2000 * len('line 0000\n')
+    assert result.stdout.excerpt()[:5] == [f'line {i:04d}' for i in range(5)]
+    assert result.stdout.excerpt()[5] == '... 1990 line(s) omitted ...'
+    assert result.stdout.excerpt()[-1] == 'line 1999'
+    assert result.stderr.excerpt() == ['boom']
+
+    text = log_path.read_text(encoding='utf-8')
+    assert log_path.stat().st_size < 4500
+    assert 'stdout | line 0000' in text and 'stderr | boom' in text
+    assert 'omitted ...' in text and result.omitted_bytes > 0
+
+
+def test_timeout_kills_child():
+    result = subprocess_runner.run_streaming(
+        [sys.executable, '-c', 'import time; time.sleep(30)'], echo=False, timeout=0.5
+    )
+
+    assert result.timed_out and result.returncode != 0
+
+
+def test_rotate_logs_keeps_newest(tmp_path):
+    for stamp in ('20250101T000000Z', '20250102T000000Z', '20250103T000000Z'):
+        (tmp_path / f'ids_{stamp}.log').write_text('x', encoding='utf-8')
+    (tmp_path / 'red-green_20250101T000000Z.log').write_text('x', encoding='utf-8')
+
+    removed = subprocess_runner.rotate_logs(tmp_path, 'ids_*.log', keep=2)
+
+    assert [path.name for path in removed] == ['ids_20250101T000000Z.log']
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'ids_20250102T000000Z.log',
+        'ids_20250103T000000Z.log',
+        'red-green_20250101T000000Z.log',
+    ]
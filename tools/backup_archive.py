@@ -0,0 +1,401 @@
+"""Streaming compressed tar archives with an index for single-file restore.
+
+``write_archive`` walks the sources and streams each file straight into a
+tar archive that is compressed on the fly, so no staging copy is made. The
+compressed output is a sequence of independent members of about
+``CHUNK_SIZE`` uncompressed bytes each: gzip members, xz streams or zstd
+frames. Every codec treats concatenated members as one stream, so the result
+is still an ordinary ``.tar.gz`` / ``.tar.xz`` / ``.tar.zst`` that any tar
+tool can read. The independent members give two extra properties:
+
+* members are compressed on a thread pool (zlib, lzma and zstandard all
+  release the GIL), which makes gzip and xz multi-threaded;
+* a file can be read by seeking to the member holding its tar header, which
+  is what ``read_member`` does.
+
+The last tar entry, ``INDEX_NAME``, is a JSON index. For each file it holds
+the compressed offset of that member and the offset inside it. The
+index's own offset is returned to the caller, which stores it in the backup
+metadata so lookups need one seek.
+
+zstd needs the optional ``zstandard`` package (``pip install .[backup]``).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import tarfile
+import threading
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+INDEX_NAME = ".backup-index.json"
+INDEX_VERSION = 1
+CHUNK_SIZE = 4 << 20
+COPY_CHUNK = 1 << 20
+CODECS = ("zstd", "gzip", "xz", "none")
+EXTENSIONS = {"zstd": ".tar.zst", "gzip": ".tar.gz", "xz": ".tar.xz", "none": ".tar"}
+DEFAULT_LEVELS = {"zstd": 3, "gzip": 6, "xz": 6, "none": 0}
+# An xz preset-6 encoder needs ~94 MiB, so cap concurrent xz members.
+XZ_MAX_WORKERS = 4
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def resolve_codec(compression: bool | str | None) -> str:
+    """Map ``BackupConfig.compression`` to a codec name.
+
+    ``True`` picks zstd when ``zstandard`` is installed and gzip otherwise;
+    ``False``/``None`` mean an uncompressed tar.
+    """
+    if compression is True:
+        return "zstd" if zstd_available() else "gzip"
+    if not compression:
+        return "none"
+    codec = str(compression).lower()
+    if codec in {"gz", "gzip"}:
+        return "gzip"
+    if codec in {"zst", "zstd", "zstandard"}:
+        if not zstd_available():
+            raise RuntimeError("zstd compression requires the zstandard package (pip install zstandard)")
+        return "zstd"
+    if codec in {"xz", "lzma"}:
+        return "xz"
+    if codec == "none":
+        return "none"
+    raise ValueError(f"Unknown compression {compression!r}; expected one of {', '.join(CODECS)}")
+
+
+def _compressor(codec: str, level: int) -> Callable[[bytes], bytes]:
+    """One-shot compressor producing a complete, independently decodable member."""
+    if codec == "gzip":
+        def compress(data: bytes) -> bytes:
+            engine = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+            return engine.compress(data) + engine.flush()
+    elif codec == "xz":
+        def compress(data: bytes) -> bytes:
+            return lzma.compress(data, format=lzma.FORMAT_XZ, preset=level)
+    elif codec == "zstd":
+        # ZstdCompressor instances are not thread-safe; give each pool thread its own.
+        local = threading.local()
+
+        def compress(data: bytes) -> bytes:
+            engine = getattr(local, "engine", None)
+            if engine is None:
+                engine = local.engine = zstandard.ZstdCompressor(level=level, write_content_size=True)
+            return engine.compress(data)
+    else:
+        def compress(data: bytes) -> bytes:
+            return data
+    return compress
+
+
+def _decompressing_reader(codec: str, raw: BinaryIO) -> IO[bytes]:
+    """Stream reader that decodes every member from ``raw``'s current position."""
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if codec == "xz":
+        return lzma.LZMAFile(raw, mode="rb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("reading zstd archives requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=False)
+    return raw
+
+
+class _ChunkedCompressor(io.RawIOBase):
+    """Write-only file object that compresses fixed-size chunks on a thread pool.
+
+    ``tarfile`` writes into it; every ``chunk_size`` uncompressed bytes become
+    one compressed member, written to ``raw`` in order. ``mark()`` names the
+    position of the next byte as (member number, offset within member) and
+    ``member_offsets`` turns member numbers into compressed file offsets once
+    the member has been written.
+    """
+
+    def __init__(self, raw: BinaryIO, codec: str, level: int, *, chunk_size: int, workers: int):
+        self.raw = raw
+        self.compress = _compressor(codec, level)
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers) if codec != "none" else None
+        self.pending: deque[Future[bytes]] = deque()
+        self.buffer = bytearray()
+        self.members = 0
+        self.member_offsets: list[int] = []
+        self.position = 0
+        self.compressed_bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        self.buffer += view
+        self.position += len(view)
+        if len(self.buffer) >= self.chunk_size:
+            self.cut()
+        return len(view)
+
+    def mark(self) -> tuple[int, int]:
+        return self.members, len(self.buffer)
+
+    def cut(self) -> None:
+        """End the current member so the next write starts a fresh one."""
+        if not self.buffer:
+            return
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        self.members += 1
+        if self.pool is None:
+            self._emit(data)
+            return
+        self.pending.append(self.pool.submit(self.compress, data))
+        while len(self.pending) > 2 * self.workers:
+            self._emit(self.pending.popleft().result())
+
+    def _emit(self, member: bytes) -> None:
+        self.member_offsets.append(self.compressed_bytes)
+        self.raw.write(member)
+        self.compressed_bytes += len(member)
+
+    def drain(self) -> None:
+        """Write every member submitted so far."""
+        while self.pending:
+            self._emit(self.pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.cut()
+            self.drain()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            super().close()
+
+
+class _HashingReader:
+    """Read-through wrapper that hashes whatever ``tarfile`` copies."""
+
+    def __init__(self, handle: BinaryIO):
+        self.handle = handle
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.handle.read(size)
+        self.digest.update(data)
+        return data
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Where one file lives in the archive."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    mode: int
+    sha256: str
+    member_offset: int
+    offset: int
+
+
+@dataclass
+class ArchiveStats:
+    path: Path
+    codec: str
+    files: int
+    input_bytes: int
+    archive_bytes: int
+    index_offset: int
+
+    @property
+    def ratio(self) -> float | None:
+        return self.input_bytes / self.archive_bytes if self.archive_bytes else None
+
+
+def write_archive(
+    destination: Path,
+    files: Iterable[tuple[Path, str]],
+    *,
+    codec: str,
+    level: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int | None = None,
+) -> ArchiveStats:
+    """Stream ``(source path, archive name)`` pairs into a compressed tar at ``destination``."""
+    level = DEFAULT_LEVELS[codec] if level is None else level
+    workers = workers or min(8, os.cpu_count() or 1)
+    if codec == "xz":
+        workers = min(workers, XZ_MAX_WORKERS)
+    placed: list[tuple[IndexEntry, int]] = []
+    input_bytes = 0
+    with destination.open("wb") as raw:
+        writer = _ChunkedCompressor(raw, codec, level, chunk_size=chunk_size, workers=workers)
+        try:
+            with tarfile.open(fileobj=writer, mode="w", format=tarfile.PAX_FORMAT) as archive:
+                for source, name in files:
+                    tarinfo = archive.gettarinfo(str(source), arcname=name)
+                    member, offset = writer.mark()
+                    with source.open("rb") as handle:
+                        reader = _HashingReader(handle)
+                        archive.addfile(tarinfo, reader)  # type: ignore[arg-type]
+                    input_bytes += tarinfo.size
+                    entry = IndexEntry(
+                        path=name,
+                        size=tarinfo.size,
+                        mtime_ns=source.stat().st_mtime_ns,
+                        mode=tarinfo.mode & 0o7777,
+                        sha256=reader.digest.hexdigest(),
+                        member_offset=-1,
+                        offset=offset,
+                    )
+                    placed.append((entry, member))
+
+                # Flush every data member so their compressed offsets are known,
+                # then write the index as the first entry of a fresh member.
+                writer.cut()
+                writer.drain()
+                index_offset = writer.compressed_bytes
+                entries = [
+                    {**asdict(entry), "member_offset": writer.member_offsets[member]} for entry, member in placed
+                ]
+                index_data = json.dumps(
+                    {"version": INDEX_VERSION, "codec": codec, "files": entries}, separators=(",", ":")
+                ).encode("utf-8")
+                index_info = tarfile.TarInfo(INDEX_NAME)
+                index_info.size = len(index_data)
+                index_info.mode = 0o644
+                archive.addfile(index_info, io.BytesIO(index_data))
+        finally:
+            writer.close()
+    return ArchiveStats(
+        path=destination,
+        codec=codec,
+        files=len(placed),
+        input_bytes=input_bytes,
+        archive_bytes=writer.compressed_bytes,
+        index_offset=index_offset,
+    )
+
+
+def _read_entry(raw: BinaryIO, codec: str, member_offset: int, offset: int) -> tuple[tarfile.TarInfo, bytes]:
+    """Decode the tar entry that starts ``offset`` bytes into the member at ``member_offset``."""
+    raw.seek(member_offset)
+    stream = _decompressing_reader(codec, raw)
+    remaining = offset
+    while remaining:
+        skipped = stream.read(min(remaining, COPY_CHUNK))
+        if not skipped:
+            raise ValueError("archive ended before the indexed entry")
+        remaining -= len(skipped)
+    with tarfile.open(fileobj=stream, mode="r|") as archive:
+        tarinfo = archive.next()
+        if tarinfo is None:
+            raise ValueError("no tar entry at the indexed position")
+        extracted = archive.extractfile(tarinfo)
+        return tarinfo, extracted.read() if extracted is not None else b""
+
+
+def read_index(archive_path: Path, codec: str, index_offset: int | None = None) -> list[IndexEntry]:
+    """Load the appended index, by seeking when its offset is known and by scanning otherwise."""
+    with archive_path.open("rb") as raw:
+        if index_offset is not None:
+            tarinfo, data = _read_entry(raw, codec, index_offset, 0)
+            if tarinfo.name != INDEX_NAME:
+                raise ValueError(f"{archive_path} has no index at offset {index_offset}")
+        else:
+            data = b""
+            with tarfile.open(fileobj=_decompressing_reader(codec, raw), mode="r|") as archive:
+                for tarinfo in archive:
+                    if tarinfo.name == INDEX_NAME:
+                        extracted = archive.extractfile(tarinfo)
+                        data = extracted.read() if extracted is not None else b""
+            if not data:
+                raise ValueError(f"{archive_path} has no {INDEX_NAME}")
+    payload = json.loads(data)
+    if payload.get("version") != INDEX_VERSION:
+        raise ValueError(f"unsupported archive index version {payload.get('version')!r}")
+    return [IndexEntry(**item) for item in payload["files"]]
+
+
+def read_member(archive_path: Path, codec: str, entry: IndexEntry) -> bytes:
+    """Random-access read of one file: seek to its member and decode only from there."""
+    with archive_path.open("rb") as raw:
+        tarinfo, data = _read_entry(raw, codec, entry.member_offset, entry.offset)
+    if tarinfo.name != entry.path:
+        raise ValueError(f"index points at {tarinfo.name!r}, expected {entry.path!r}")
+    return data
+
+
+def safe_destination(root: Path, name: str) -> Path:
+    """``root / name`` for a relative archive name, refusing anything that escapes ``root``."""
+    relative = PurePosixPath(name)
+    if relative.is_absolute() or ".." in relative.parts:
+        raise ValueError(f"Refusing to restore unsafe path from archive: {name}")
+    return root.joinpath(*relative.parts)
+
+
+def hash_members(archive_path: Path, codec: str, throttle: Callable[[int], None] | None = None) -> dict[str, str]:
+    """SHA-256 of every file in the archive, from one sequential decoding pass.
+
+    Corrupt compressed data surfaces as the codec's or ``tarfile``'s own error.
+    """
+    digests: dict[str, str] = {}
+    with archive_path.open("rb") as raw, tarfile.open(fileobj=_decompressing_reader(codec, raw), mode="r|") as archive:
+        for tarinfo in archive:
+            if tarinfo.name == INDEX_NAME or not tarinfo.isfile():
+                continue
+            source = archive.extractfile(tarinfo)
+            if source is None:
+                continue
+            digest = hashlib.sha256()
+            while chunk := source.read(COPY_CHUNK):
+                digest.update(chunk)
+                if throttle is not None:
+                    throttle(len(chunk))
+            digests[tarinfo.name] = digest.hexdigest()
+    return digests
+
+
+def extract_archive(archive_path: Path, codec: str, destination: Path) -> int:
+    """Stream-extract every file except the index; returns bytes restored."""
+    restored = 0
+    with archive_path.open("rb") as raw, tarfile.open(fileobj=_decompressing_reader(codec, raw), mode="r|") as archive:
+        for tarinfo in archive:
+            if tarinfo.name == INDEX_NAME or not tarinfo.isfile():
+                continue
+            target = safe_destination(destination, tarinfo.name)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source = archive.extractfile(tarinfo)
+            if source is None:
+                continue
+            with target.open("wb") as handle:
+                while chunk := source.read(COPY_CHUNK):
+                    handle.write(chunk)
+            os.chmod(target, tarinfo.mode & 0o777)
+            os.utime(target, (tarinfo.mtime, tarinfo.mtime))
+            restored += tarinfo.size
+    return restored
@@ -1,22 +1,68 @@
 #!/usr/bin/env python3
-"""Backup and Disaster Recovery automation for RJW-IDD."""
+"""Backup and Disaster Recovery automation for RJW-IDD.
+
+Every mode walks the sources once with directory pruning and a single
+compiled exclusion regex, and copies or hashes files on a thread pool
+(``BackupConfig.workers``); see ``tools/backup_io.py``.
+
+Backups are incremental by default: file contents go into a shared
+content-addressed store under ``<backup_root>/objects`` and each snapshot
+directory holds only a manifest (see ``tools/backup_store.py``). Files whose
+size, mtime and inode match the previous snapshot are not read again.
+``mode="archive"`` streams the sources into one compressed tar using the
+``compression`` setting (see ``tools/backup_archive.py``), and ``mode="copy"``
+keeps the original full directory copy.
+
+Every backup records a SHA-256 per file: in its manifest (incremental and
+copy) or in the archive's index. ``verify_backup`` and ``scrub`` re-hash
+them in parallel under an optional bandwidth limit, report missing and
+corrupt files, and store the outcome in the backup's metadata, where
+``list_backups`` reads it back together with the cached size.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import shutil
+import stat
 import sys
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Any
 
+from tools.backup_archive import (
+    EXTENSIONS,
+    extract_archive,
+    hash_members,
+    read_index,
+    read_member,
+    resolve_codec,
+    write_archive,
+)
+from tools.backup_io import (
+    BandwidthLimiter,
+    ExclusionMatcher,
+    copy_and_hash,
+    fast_copy,
+    hash_file,
+    run_parallel,
+    walk_files,
+)
+from tools.backup_store import MANIFEST_NAME, STORE_DIRNAME, FileEntry, Manifest, ObjectStore
 from tools.logging_config import get_logger, setup_logging
 
 logger = get_logger(__name__)
 
+BACKUP_MODES = ("incremental", "archive", "copy")
+METADATA_NAME = "backup_metadata.json"
+# Outcomes of verify_backup; list_backups reports "unverified" until one has run.
+VERIFY_STATUSES = ("ok", "damaged", "unverifiable")
+
 
 @dataclass
 class BackupConfig:
@@ -25,11 +71,17 @@ class BackupConfig:
     source_paths: list[Path]
     backup_root: Path
     retention_days: int = 30
-    compression: bool = True
+    # Archive codec: True (zstd if installed, else gzip), False, or "zstd"/"gzip"/"xz"/"none".
+    compression: bool | str = True
     encryption_key: str | None = None
     exclude_patterns: list[str] = field(default_factory=list)
+    mode: str = "incremental"
+    # Threads for copying, hashing and restoring; None picks a default from the CPU count.
+    workers: int | None = None
 
     def __post_init__(self) -> None:
+        if self.mode not in BACKUP_MODES:
+            raise ValueError(f"Unknown backup mode {self.mode!r}; expected one of {', '.join(BACKUP_MODES)}")
         self.backup_root.mkdir(parents=True, exist_ok=True)
 
 
@@ -43,6 +95,37 @@ class BackupResult:
     duration_seconds: float
     error_message: str | None = None
     timestamp: datetime = field(default_factory=datetime.now)
+    compression_ratio: float | None = None
+    throughput_mb_s: float | None = None
+
+
+@dataclass
+class VerifyResult:
+    """Result of re-hashing one backup against its recorded checksums."""
+
+    backup_path: Path
+    status: str
+    files_checked: int = 0
+    bytes_checked: int = 0
+    duration_seconds: float = 0.0
+    missing: list[str] = field(default_factory=list)
+    corrupt: list[str] = field(default_factory=list)
+    error_message: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def summary(self) -> dict[str, Any]:
+        """The part persisted to the backup's metadata."""
+        return {
+            "status": self.status,
+            "checked_at": datetime.now().isoformat(),
+            "files_checked": self.files_checked,
+            "bytes_checked": self.bytes_checked,
+            "missing": len(self.missing),
+            "corrupt": len(self.corrupt),
+        }
 
 
 class BackupManager:
@@ -51,6 +134,7 @@ class BackupManager:
     def __init__(self, config: BackupConfig):
         self.config = config
         self.logger = get_logger(f"{__name__}.backup")
+        self._matcher: tuple[tuple[str, ...], ExclusionMatcher] | None = None
 
     def create_backup(self, name: str | None = None) -> BackupResult:
         """Create a backup of configured paths."""
@@ -67,16 +151,12 @@ class BackupManager:
         try:
             backup_path.mkdir(parents=True, exist_ok=True)
 
-            total_size = 0
-            for source_path in self.config.source_paths:
-                if not source_path.exists():
-                    self.logger.warning(f"Source path does not exist: {source_path}")
-                    continue
-
-                # Copy files with exclusion
-                dest_path = backup_path / source_path.name
-                self._copy_with_exclusions(source_path, dest_path)
-                total_size += self._get_directory_size(dest_path)
+            if self.config.mode == "incremental":
+                total_size, details = self._create_incremental(backup_path, timestamp)
+            elif self.config.mode == "archive":
+                total_size, details = self._create_archive(backup_path)
+            else:
+                total_size, details = self._create_copy(backup_path, timestamp)
 
             # Create metadata
             metadata = {
@@ -85,20 +165,27 @@ class BackupManager:
                 "size_bytes": total_size,
                 "compression": self.config.compression,
                 "retention_days": self.config.retention_days,
+                "format": self.config.mode,
+                **details,
             }
 
-            metadata_file = backup_path / "backup_metadata.json"
+            metadata_file = backup_path / METADATA_NAME
             with metadata_file.open('w') as f:
                 json.dump(metadata, f, indent=2)
 
             duration = time.time() - start_time
-            self.logger.info(f"Backup completed: {backup_path} ({total_size} bytes in {duration:.2f}s)")
+            throughput = _throughput_mb_s(total_size, duration)
+            self.logger.info(
+                f"Backup completed: {backup_path} ({total_size} bytes in {duration:.2f}s, {throughput:.1f} MB/s)"
+            )
 
             return BackupResult(
                 success=True,
                 backup_path=backup_path,
                 size_bytes=total_size,
-                duration_seconds=duration
+                duration_seconds=duration,
+                compression_ratio=details.get("compression_ratio"),
+                throughput_mb_s=throughput,
             )
 
         except Exception as e:
@@ -118,6 +205,144 @@ class BackupManager:
                 error_message=error_msg
             )
 
+    def _create_copy(self, backup_path: Path, timestamp: datetime) -> tuple[int, dict[str, Any]]:
+        """Copy the sources file by file, checksumming each copy into a manifest."""
+        candidates = [
+            item
+            for source_path in self._existing_sources()
+            for item in self._iter_source_files(source_path)
+        ]
+        for directory in sorted({(backup_path / key).parent for _, key, _ in candidates}):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def copy_file(item: tuple[str, str, os.stat_result]) -> FileEntry:
+            file_path, key, info = item
+            size, digest = copy_and_hash(file_path, backup_path / key)
+            shutil.copystat(file_path, backup_path / key)
+            return FileEntry(key, size, info.st_mtime_ns, info.st_ino, stat.S_IMODE(info.st_mode), digest)
+
+        manifest = Manifest(
+            created=timestamp.isoformat(),
+            sources=[str(p) for p in self.config.source_paths],
+            files=run_parallel(copy_file, candidates, workers=self.config.workers),
+        )
+        manifest.write(backup_path / MANIFEST_NAME)
+        return manifest.size_bytes, {"file_count": len(manifest.files)}
+
+    def _create_incremental(self, backup_path: Path, timestamp: datetime) -> tuple[int, dict[str, Any]]:
+        """Store changed files as blobs and write this snapshot's manifest."""
+        store = ObjectStore(self.config.backup_root / STORE_DIRNAME)
+        previous = self._latest_manifest(exclude=backup_path)
+        known = previous.index() if previous else {}
+        candidates = [
+            item
+            for source_path in self._existing_sources()
+            for item in self._iter_source_files(source_path)
+        ]
+
+        def snapshot_file(item: tuple[str, str, os.stat_result]) -> tuple[FileEntry, int, bool]:
+            file_path, key, info = item
+            prior = known.get(key)
+            if prior is not None and prior.matches(info) and store.has(prior.sha256):
+                digest, size, written, read = prior.sha256, prior.size, 0, False
+            else:
+                digest, size, written = store.add_file(Path(file_path))
+                read = True
+            entry = FileEntry(key, size, info.st_mtime_ns, info.st_ino, stat.S_IMODE(info.st_mode), digest)
+            return entry, written, read
+
+        # Changed files are hashed and stored concurrently; unchanged ones only cost the stat.
+        outcomes = run_parallel(snapshot_file, candidates, workers=self.config.workers)
+        files = [entry for entry, _, _ in outcomes]
+        stored_bytes = sum(written for _, written, _ in outcomes)
+        hashed = sum(1 for _, _, read in outcomes if read)
+
+        manifest = Manifest(
+            created=timestamp.isoformat(),
+            sources=[str(p) for p in self.config.source_paths],
+            files=files,
+        )
+        manifest.write(backup_path / MANIFEST_NAME)
+        self.logger.info(
+            f"Incremental snapshot: {len(files)} files, {hashed} read, {stored_bytes} new bytes stored"
+        )
+        details = {
+            "file_count": len(files),
+            "hashed_files": hashed,
+            "reused_files": len(files) - hashed,
+            "stored_bytes": stored_bytes,
+        }
+        return manifest.size_bytes, details
+
+    def _create_archive(self, backup_path: Path) -> tuple[int, dict[str, Any]]:
+        """Stream every source file into one compressed tar with an appended index."""
+        codec = resolve_codec(self.config.compression)
+        archive_path = backup_path / f"backup{EXTENSIONS[codec]}"
+
+        def files() -> Iterator[tuple[Path, str]]:
+            for source_path in self._existing_sources():
+                for file_path, key, _ in self._iter_source_files(source_path):
+                    yield Path(file_path), key
+
+        stats = write_archive(archive_path, files(), codec=codec)
+        ratio = stats.ratio
+        self.logger.info(
+            f"Archive written: {archive_path.name} ({stats.input_bytes} -> {stats.archive_bytes} bytes, "
+            f"ratio {ratio or 0:.2f})"
+        )
+        details = {
+            "codec": codec,
+            "archive": archive_path.name,
+            "archive_bytes": stats.archive_bytes,
+            "index_offset": stats.index_offset,
+            "file_count": stats.files,
+            "compression_ratio": ratio,
+        }
+        return stats.input_bytes, details
+
+    def _latest_manifest(self, exclude: Path | None = None) -> Manifest | None:
+        """Manifest of the most recent incremental snapshot, if any."""
+        latest: tuple[str, Path] | None = None
+        for backup_dir in self._backup_dirs():
+            if backup_dir == exclude or not (backup_dir / MANIFEST_NAME).is_file():
+                continue
+            metadata = self._read_metadata(backup_dir)
+            if metadata.get("format") == "copy":
+                continue
+            stamp = str(metadata.get("timestamp", ""))
+            if latest is None or stamp > latest[0]:
+                latest = (stamp, backup_dir)
+        if latest is None:
+            return None
+        try:
+            return Manifest.read(latest[1] / MANIFEST_NAME)
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable manifest in {latest[1]}: {e}")
+            return None
+
+    def _restore_incremental(self, backup_path: Path, restore_to: Path) -> int:
+        manifest = Manifest.read(backup_path / MANIFEST_NAME)
+        store = ObjectStore(self.config.backup_root / STORE_DIRNAME)
+        targets = []
+        for entry in manifest.files:
+            relative = PurePosixPath(entry.path)
+            if relative.is_absolute() or ".." in relative.parts:
+                raise ValueError(f"Refusing to restore unsafe path from manifest: {entry.path}")
+            targets.append((entry, restore_to.joinpath(*relative.parts)))
+        for directory in sorted({dest_file.parent for _, dest_file in targets}):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def restore_file(target: tuple[FileEntry, Path]) -> None:
+            entry, dest_file = target
+            # A full re-hash is verify_backup's job; a size check catches truncated blobs for free.
+            if store.copy_out(entry.sha256, dest_file) != entry.size:
+                raise ValueError(f"Stored blob for {entry.path} does not match its recorded size")
+            os.chmod(dest_file, entry.mode)
+            os.utime(dest_file, ns=(entry.mtime_ns, entry.mtime_ns))
+
+        run_parallel(restore_file, targets, workers=self.config.workers)
+        return manifest.size_bytes
+
     def restore_backup(self, backup_path: Path, restore_to: Path) -> BackupResult:
         """Restore from a backup."""
         start_time = time.time()
@@ -127,25 +352,24 @@ class BackupManager:
                 raise FileNotFoundError(f"Backup does not exist: {backup_path}")
 
             # Validate backup metadata
-            metadata_file = backup_path / "backup_metadata.json"
-            if metadata_file.exists():
-                with metadata_file.open() as f:
-                    metadata = json.load(f)
+            metadata = self._read_metadata(backup_path)
+            if metadata:
                 self.logger.info(f"Restoring backup from {metadata.get('timestamp', 'unknown')}")
+            verification = metadata.get("verification", {})
+            if verification.get("status", "ok") != "ok":
+                self.logger.warning(
+                    f"Last verification of {backup_path.name} reported {verification['status']}: "
+                    f"{verification.get('missing', 0)} missing, {verification.get('corrupt', 0)} corrupt files"
+                )
 
-            # Restore files
-            total_size = 0
-            for item in backup_path.iterdir():
-                if item.name == "backup_metadata.json":
-                    continue
-
-                dest_path = restore_to / item.name
-                if item.is_file():
-                    shutil.copy2(item, dest_path)
-                    total_size += item.stat().st_size
-                elif item.is_dir():
-                    shutil.copytree(item, dest_path, dirs_exist_ok=True)
-                    total_size += self._get_directory_size(item)
+            restore_to.mkdir(parents=True, exist_ok=True)
+            backup_format = metadata.get("format")
+            if backup_format == "archive":
+                total_size = extract_archive(backup_path / metadata["archive"], metadata["codec"], restore_to)
+            elif backup_format != "copy" and (backup_path / MANIFEST_NAME).is_file():
+                total_size = self._restore_incremental(backup_path, restore_to)
+            else:
+                total_size = self._restore_copy(backup_path, restore_to)
 
             duration = time.time() - start_time
             self.logger.info(f"Restore completed: {total_size} bytes in {duration:.2f}s")
@@ -154,7 +378,8 @@ class BackupManager:
                 success=True,
                 backup_path=backup_path,
                 size_bytes=total_size,
-                duration_seconds=duration
+                duration_seconds=duration,
+                throughput_mb_s=_throughput_mb_s(total_size, duration),
             )
 
         except Exception as e:
@@ -170,15 +395,88 @@ class BackupManager:
                 error_message=error_msg
             )
 
+    def restore_file(self, backup_path: Path, member: str, restore_to: Path) -> BackupResult:
+        """Restore one file, named as in the backup (``<source>/<relative path>``)."""
+        start_time = time.time()
+        try:
+            metadata = self._read_metadata(backup_path)
+            dest_file = restore_to / PurePosixPath(member).name
+            if metadata.get("format") == "copy":
+                raise ValueError(f"{backup_path.name} is a plain copy; copy {member} from it directly")
+            if metadata.get("format") == "archive":
+                archive_path = backup_path / metadata["archive"]
+                entries = read_index(archive_path, metadata["codec"], metadata.get("index_offset"))
+                entry = next((item for item in entries if item.path == member), None)
+                if entry is None:
+                    raise FileNotFoundError(f"{member} is not in {backup_path.name}")
+                restore_to.mkdir(parents=True, exist_ok=True)
+                dest_file.write_bytes(read_member(archive_path, metadata["codec"], entry))
+            elif (backup_path / MANIFEST_NAME).is_file():
+                found = Manifest.read(backup_path / MANIFEST_NAME).index().get(member)
+                if found is None:
+                    raise FileNotFoundError(f"{member} is not in {backup_path.name}")
+                restore_to.mkdir(parents=True, exist_ok=True)
+                ObjectStore(self.config.backup_root / STORE_DIRNAME).copy_out(found.sha256, dest_file)
+                entry = found
+            else:
+                raise ValueError(f"{backup_path.name} is a plain copy; copy {member} from it directly")
+            os.chmod(dest_file, entry.mode)
+            os.utime(dest_file, ns=(entry.mtime_ns, entry.mtime_ns))
+
+            duration = time.time() - start_time
+            self.logger.info(f"Restored {member} to {dest_file} in {duration:.3f}s")
+            return BackupResult(
+                success=True,
+                backup_path=backup_path,
+                size_bytes=entry.size,
+                duration_seconds=duration,
+            )
+        except Exception as e:
+            duration = time.time() - start_time
+            error_msg = f"Restore failed: {e}"
+            self.logger.error(error_msg)
+            return BackupResult(
+                success=False,
+                backup_path=backup_path,
+                size_bytes=0,
+                duration_seconds=duration,
+                error_message=error_msg
+            )
+
+    def _restore_copy(self, backup_path: Path, restore_to: Path) -> int:
+        pairs = []
+        for item in backup_path.iterdir():
+            if item.name in (METADATA_NAME, MANIFEST_NAME):
+                continue
+
+            dest_path = restore_to / item.name
+            if item.is_file():
+                pairs.append((str(item), dest_path))
+            elif item.is_dir():
+                pairs.extend(
+                    (path, dest_path / relative) for path, relative, _ in walk_files(str(item), ExclusionMatcher(()))
+                )
+        return self._copy_files(pairs)
+
+    def _copy_files(self, pairs: list[tuple[str, Path]]) -> int:
+        """Copy (source, destination) pairs on the thread pool, keeping metadata like ``copy2``."""
+        for directory in sorted({destination.parent for _, destination in pairs}):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def copy(pair: tuple[str, Path]) -> int:
+            source, destination = pair
+            size = fast_copy(source, destination)
+            shutil.copystat(source, destination)
+            return size
+
+        return sum(run_parallel(copy, pairs, workers=self.config.workers))
+
     def cleanup_old_backups(self) -> int:
         """Remove backups older than retention period."""
         cutoff_date = datetime.now() - timedelta(days=self.config.retention_days)
         removed_count = 0
 
-        for backup_dir in self.config.backup_root.iterdir():
-            if not backup_dir.is_dir():
-                continue
-
+        for backup_dir in self._backup_dirs():
             try:
                 # Try to parse timestamp from directory name
                 # Format: YYYYMMDD_HHMMSS or name_YYYYMMDD_HHMMSS
@@ -194,56 +492,208 @@ class BackupManager:
             except (ValueError, OSError) as e:
                 self.logger.warning(f"Could not process backup directory {backup_dir}: {e}")
 
+        if removed_count:
+            self.collect_garbage()
         return removed_count
 
-    def list_backups(self) -> list[dict[str, Any]]:
-        """List all available backups."""
-        backups = []
-
-        for backup_dir in self.config.backup_root.iterdir():
-            if not backup_dir.is_dir():
+    def collect_garbage(self) -> int:
+        """Remove stored blobs that no remaining snapshot manifest references."""
+        store = ObjectStore(self.config.backup_root / STORE_DIRNAME)
+        if not store.root.is_dir():
+            return 0
+        live: set[str] = set()
+        for backup_dir in self._backup_dirs():
+            manifest_file = backup_dir / MANIFEST_NAME
+            if not manifest_file.is_file() or self._read_metadata(backup_dir).get("format") == "copy":
                 continue
+            try:
+                live |= Manifest.read(manifest_file).digests()
+            except (OSError, ValueError, KeyError) as e:
+                # An unreadable manifest might still reference anything; keep every blob.
+                self.logger.warning(f"Skipping garbage collection, unreadable manifest {manifest_file}: {e}")
+                return 0
+        removed, freed = store.collect_garbage(live)
+        if removed:
+            self.logger.info(f"Removed {removed} unreferenced blobs ({freed} bytes)")
+        return removed
+
+    def verify_backup(self, backup_path: Path, bandwidth_mb_s: float | None = None) -> VerifyResult:
+        """Re-hash one backup against its recorded checksums and record the outcome in its metadata."""
+        limiter = BandwidthLimiter(bandwidth_mb_s * 1024 * 1024) if bandwidth_mb_s else None
+        return self._verify(backup_path, limiter)
+
+    def scrub(self, bandwidth_mb_s: float | None = None) -> list[VerifyResult]:
+        """Verify every backup, oldest first, sharing one bandwidth budget.
+
+        Snapshots share the object store, so each blob is hashed once per scrub
+        and its outcome attributed to every snapshot that references it.
+        """
+        limiter = BandwidthLimiter(bandwidth_mb_s * 1024 * 1024) if bandwidth_mb_s else None
+        blobs: dict[Path, tuple[str, int]] = {}
+        return [self._verify(backup_dir, limiter, blobs) for backup_dir in sorted(self._backup_dirs())]
+
+    def _verify(
+        self,
+        backup_path: Path,
+        limiter: BandwidthLimiter | None,
+        blobs: dict[Path, tuple[str, int]] | None = None,
+    ) -> VerifyResult:
+        start_time = time.time()
+        metadata = self._read_metadata(backup_path)
+        try:
+            if metadata.get("format") == "archive":
+                result = self._verify_archive(backup_path, metadata, limiter)
+            elif (backup_path / MANIFEST_NAME).is_file():
+                is_copy = metadata.get("format") == "copy"
+                result = self._verify_manifest(backup_path, is_copy, limiter, None if is_copy else blobs)
+            else:
+                result = VerifyResult(backup_path, "unverifiable", error_message="no manifest with checksums")
+        except Exception as e:
+            result = VerifyResult(backup_path, "damaged", error_message=str(e))
+        result.duration_seconds = time.time() - start_time
+
+        if metadata:
+            metadata["verification"] = result.summary()
+            metadata_file = backup_path / METADATA_NAME
+            tmp = metadata_file.with_name(metadata_file.name + ".tmp")
+            with tmp.open("w") as f:
+                json.dump(metadata, f, indent=2)
+            os.replace(tmp, metadata_file)
+
+        log = self.logger.info if result.ok else self.logger.warning
+        log(
+            f"Verified {backup_path.name}: {result.status}, {result.files_checked} files, "
+            f"{len(result.missing)} missing, {len(result.corrupt)} corrupt in {result.duration_seconds:.2f}s"
+        )
+        return result
+
+    def _verify_manifest(
+        self,
+        backup_path: Path,
+        is_copy: bool,
+        limiter: BandwidthLimiter | None,
+        blobs: dict[Path, tuple[str, int]] | None = None,
+    ) -> VerifyResult:
+        """Re-hash the files a manifest lists; ``blobs`` memoises store blobs across snapshots."""
+        manifest = Manifest.read(backup_path / MANIFEST_NAME)
+        store = ObjectStore(self.config.backup_root / STORE_DIRNAME)
+        located = [
+            (entry, backup_path.joinpath(*PurePosixPath(entry.path).parts) if is_copy else store.path_for(entry.sha256))
+            for entry in manifest.files
+        ]
+        # Files with identical content share a blob, so each distinct one is read once.
+        locations: dict[Path, FileEntry] = {}
+        for entry, location in located:
+            locations.setdefault(location, entry)
+        known = blobs if blobs is not None else {}
+        pending = [(location, entry) for location, entry in locations.items() if location not in known]
+
+        def check(item: tuple[Path, FileEntry]) -> tuple[str, int]:
+            location, entry = item
+            try:
+                if location.stat().st_size != entry.size:
+                    return "corrupt", 0
+                size, digest = hash_file(location, limiter)
+            except FileNotFoundError:
+                return "missing", 0
+            return ("ok" if digest == entry.sha256 else "corrupt"), size
+
+        results = run_parallel(check, pending, workers=self.config.workers)
+        checked = {location: outcome for (location, _), outcome in zip(pending, results)}
+        if blobs is not None:
+            blobs.update(checked)
+        outcomes = {**{location: known[location] for location in locations if location in known}, **checked}
+        result = VerifyResult(backup_path, "ok", files_checked=len(manifest.files))
+        result.bytes_checked = sum(size for _, size in checked.values())
+        for entry, location in located:
+            state = outcomes[location][0]
+            if state != "ok":
+                getattr(result, state).append(entry.path)
+        if result.missing or result.corrupt:
+            result.status = "damaged"
+        return result
+
+    def _verify_archive(
+        self, backup_path: Path, metadata: dict[str, Any], limiter: BandwidthLimiter | None
+    ) -> VerifyResult:
+        archive_path = backup_path / metadata["archive"]
+        codec = metadata["codec"]
+        if not archive_path.is_file():
+            return VerifyResult(backup_path, "damaged", missing=[metadata["archive"]], error_message="archive missing")
+        entries = read_index(archive_path, codec, metadata.get("index_offset"))
+        digests = hash_members(archive_path, codec, limiter.throttle if limiter else None)
+        result = VerifyResult(backup_path, "ok", files_checked=len(entries))
+        for entry in entries:
+            digest = digests.get(entry.path)
+            if digest is None:
+                result.missing.append(entry.path)
+            elif digest != entry.sha256:
+                result.corrupt.append(entry.path)
+            else:
+                result.bytes_checked += entry.size
+        if result.missing or result.corrupt:
+            result.status = "damaged"
+        return result
 
-            metadata_file = backup_dir / "backup_metadata.json"
-            metadata = {}
+    def list_backups(self) -> list[dict[str, Any]]:
+        """List all available backups from their metadata, without walking them."""
+        backups = []
 
-            if metadata_file.exists():
-                try:
-                    with metadata_file.open() as f:
-                        metadata = json.load(f)
-                except (OSError, json.JSONDecodeError):
-                    pass
+        for backup_dir in self._backup_dirs():
+            metadata = self._read_metadata(backup_dir)
+            if "size_bytes" in metadata:
+                size_bytes = int(metadata["size_bytes"])
+            else:
+                # Backups from before the metadata recorded a size.
+                size_bytes = self._get_directory_size(backup_dir)
 
             backups.append({
                 "path": backup_dir,
                 "name": backup_dir.name,
-                "size_bytes": self._get_directory_size(backup_dir),
+                "size_bytes": size_bytes,
+                "status": metadata.get("verification", {}).get("status", "unverified"),
                 "metadata": metadata,
             })
 
         return sorted(backups, key=lambda x: x["name"], reverse=True)
 
-    def _copy_with_exclusions(self, src: Path, dst: Path) -> None:
-        """Copy directory tree with exclusion patterns."""
-        import fnmatch
-
-        if dst.exists():
-            shutil.rmtree(dst)
-        dst.mkdir(parents=True)
-
-        for item in src.rglob('*'):
-            if item.is_file():
-                # Check exclusion patterns
-                relative_path = item.relative_to(src)
-                should_exclude = any(
-                    fnmatch.fnmatch(str(relative_path), pattern)
-                    for pattern in self.config.exclude_patterns
-                )
+    def _backup_dirs(self) -> Iterator[Path]:
+        for backup_dir in self.config.backup_root.iterdir():
+            if backup_dir.is_dir() and backup_dir.name != STORE_DIRNAME:
+                yield backup_dir
 
-                if not should_exclude:
-                    dest_file = dst / relative_path
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(item, dest_file)
+    def _read_metadata(self, backup_dir: Path) -> dict[str, Any]:
+        metadata_file = backup_dir / METADATA_NAME
+        if metadata_file.exists():
+            try:
+                with metadata_file.open() as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {}
+
+    @property
+    def matcher(self) -> ExclusionMatcher:
+        """Exclusion patterns compiled once; rebuilt only if the config's list changes."""
+        patterns = tuple(self.config.exclude_patterns)
+        if self._matcher is None or self._matcher[0] != patterns:
+            self._matcher = (patterns, ExclusionMatcher(patterns))
+        return self._matcher[1]
+
+    def _existing_sources(self) -> Iterator[Path]:
+        for source_path in self.config.source_paths:
+            if source_path.exists():
+                yield source_path
+            else:
+                self.logger.warning(f"Source path does not exist: {source_path}")
+
+    def _iter_source_files(self, src: Path) -> Iterator[tuple[str, str, os.stat_result]]:
+        """(path, ``<src name>/<relative path>``, stat) for files under ``src`` surviving the exclusions."""
+        if src.is_file():
+            yield str(src), src.name, src.stat()
+            return
+        for path, relative, info in walk_files(str(src), self.matcher):
+            yield path, f"{src.name}/{relative}", info
 
     def _get_directory_size(self, path: Path) -> int:
         """Get total size of directory in bytes."""
@@ -254,6 +704,10 @@ class BackupManager:
         return total_size
 
 
+def _throughput_mb_s(size_bytes: int, duration: float) -> float:
+    return size_bytes / (1024 * 1024) / duration if duration > 0 else 0.0
+
+
 def create_default_config(project_root: Path) -> BackupConfig:
     """Create default backup configuration for RJW-IDD project."""
     return BackupConfig(
@@ -287,16 +741,31 @@ def main() -> int:
     parser.add_argument("--cleanup", action="store_true", help="Cleanup old backups")
     parser.add_argument("--list", action="store_true", help="List available backups")
     parser.add_argument("--name", help="Backup name prefix")
+    parser.add_argument("--mode", choices=BACKUP_MODES, default="incremental",
+                       help="incremental (content-addressed, default), archive (compressed tar) "
+                            "or copy (full directory copy)")
+    parser.add_argument("--compression", choices=("auto", "zstd", "gzip", "xz", "none"), default="auto",
+                       help="Archive codec for --mode archive (auto: zstd if installed, else gzip)")
+    parser.add_argument("--restore-file", metavar="MEMBER",
+                       help="With --restore/--restore-to, restore only this file (e.g. specs/README.md)")
+    parser.add_argument("--gc", action="store_true", help="Remove stored blobs no snapshot references")
+    parser.add_argument("--verify", type=Path, metavar="BACKUP", help="Re-hash one backup against its checksums")
+    parser.add_argument("--scrub", action="store_true", help="Verify every backup and record the results")
+    parser.add_argument("--bandwidth", type=float, metavar="MB_S",
+                       help="Read limit in MB/s for --verify/--scrub (default: unlimited)")
 
     args = parser.parse_args()
 
-    setup_logging()
+    # Per-file log lines must not stall copy and hash threads on the log file.
+    setup_logging(async_mode=True)
 
     if args.config and args.config.exists():
         # Load config from file (future enhancement)
         config = create_default_config(args.project_root)
     else:
         config = create_default_config(args.project_root)
+    config.mode = args.mode
+    config.compression = True if args.compression == "auto" else args.compression
 
     manager = BackupManager(config)
 
@@ -304,6 +773,8 @@ def main() -> int:
         result = manager.create_backup(args.name)
         if result.success:
             print(f"✅ Backup created: {result.backup_path}")
+            if result.compression_ratio is not None:
+                print(f"   Compression ratio {result.compression_ratio:.2f}x, {result.throughput_mb_s:.1f} MB/s")
             return 0
         else:
             print(f"❌ Backup failed: {result.error_message}")
@@ -314,7 +785,10 @@ def main() -> int:
             print("❌ --restore-to is required for restore operation")
             return 1
 
-        result = manager.restore_backup(args.restore, args.restore_to)
+        if args.restore_file:
+            result = manager.restore_file(args.restore, args.restore_file, args.restore_to)
+        else:
+            result = manager.restore_backup(args.restore, args.restore_to)
         if result.success:
             print(f"✅ Restore completed from {args.restore}")
             return 0
@@ -327,6 +801,28 @@ def main() -> int:
         print(f"✅ Cleaned up {removed} old backups")
         return 0
 
+    elif args.gc:
+        removed = manager.collect_garbage()
+        print(f"✅ Removed {removed} unreferenced blobs")
+        return 0
+
+    elif args.verify or args.scrub:
+        if args.verify:
+            results = [manager.verify_backup(args.verify, args.bandwidth)]
+        else:
+            results = manager.scrub(args.bandwidth)
+        for verified in results:
+            icon = "✅" if verified.ok else "❌"
+            print(f"{icon} {verified.backup_path.name}: {verified.status} "
+                  f"({verified.files_checked} files, {verified.bytes_checked / (1024 * 1024):.1f} MB checked)")
+            for path in verified.missing:
+                print(f"   missing: {path}")
+            for path in verified.corrupt:
+                print(f"   corrupt: {path}")
+            if verified.error_message:
+                print(f"   {verified.error_message}")
+        return 0 if all(verified.status != "damaged" for verified in results) else 1
+
     elif args.list:
         backups = manager.list_backups()
         if not backups:
@@ -337,7 +833,7 @@ def main() -> int:
         for backup in backups:
             size_mb = backup["size_bytes"] / (1024 * 1024)
             timestamp = backup["metadata"].get("timestamp", "unknown")
-            print(f"  {backup['name']} ({size_mb:.1f} MB) - {timestamp}")
+            print(f"  {backup['name']} ({size_mb:.1f} MB) - {timestamp} [{backup['status']}]")
         return 0
 
     else:
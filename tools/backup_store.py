@@ -0,0 +1,197 @@
+"""Content-addressed blob store and snapshot manifests for incremental backups.
+
+Every backed-up file is stored once under ``objects/<aa>/<rest-of-sha256>``
+in the backup root, however many snapshots reference it. A snapshot is a
+directory holding a ``manifest.json`` that lists each file's path, size,
+mtime, inode, mode and SHA-256 digest. Restoring a snapshot means copying the
+referenced blobs back out; deleting one only drops its manifest, and
+``ObjectStore.collect_garbage`` later removes blobs no manifest references.
+
+The (size, mtime_ns, inode) triple recorded in the manifest lets the next
+snapshot recognise unchanged files from a ``stat`` call alone and reuse
+their digest without reading them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from tools.backup_io import fast_copy
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+STORE_DIRNAME = "objects"
+HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """One file in a snapshot; ``path`` is POSIX and relative to the snapshot root."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+    mode: int
+    sha256: str
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        """True when ``stat_result`` describes the same unmodified file."""
+        return (
+            self.size == stat_result.st_size
+            and self.mtime_ns == stat_result.st_mtime_ns
+            and self.inode == stat_result.st_ino
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FileEntry:
+        return cls(
+            path=str(data["path"]),
+            size=int(data["size"]),
+            mtime_ns=int(data["mtime_ns"]),
+            inode=int(data.get("inode", 0)),
+            mode=int(data.get("mode", 0o644)),
+            sha256=str(data["sha256"]),
+        )
+
+
+@dataclass
+class Manifest:
+    """Snapshot contents plus the bookkeeping needed to report on it without a walk."""
+
+    created: str
+    sources: list[str]
+    files: list[FileEntry] = field(default_factory=list)
+    version: int = MANIFEST_VERSION
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry.size for entry in self.files)
+
+    def index(self) -> dict[str, FileEntry]:
+        return {entry.path: entry for entry in self.files}
+
+    def digests(self) -> set[str]:
+        return {entry.sha256 for entry in self.files}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "created": self.created,
+            "sources": self.sources,
+            "file_count": len(self.files),
+            "size_bytes": self.size_bytes,
+            "files": [asdict(entry) for entry in self.files],
+        }
+
+    def write(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def read(cls, path: Path) -> Manifest:
+        with path.open(encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"unsupported manifest version {data.get('version')!r} in {path}")
+        return cls(
+            created=str(data.get("created", "")),
+            sources=list(data.get("sources", [])),
+            files=[FileEntry.from_dict(item) for item in data.get("files", [])],
+        )
+
+
+class ObjectStore:
+    """SHA-256 addressed blobs shared by every snapshot under one backup root."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        return self.path_for(digest).is_file()
+
+    def add_file(self, source: Path) -> tuple[str, int, int]:
+        """Hash ``source`` while copying it into the store.
+
+        Returns ``(digest, size, stored_bytes)``; ``stored_bytes`` is 0 when an
+        identical blob already existed and the copy was discarded.
+        """
+        staging = self.root / "tmp"
+        staging.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with source.open("rb") as reader, tempfile.NamedTemporaryFile(dir=staging, delete=False) as writer:
+            try:
+                while chunk := reader.read(HASH_CHUNK):
+                    digest.update(chunk)
+                    writer.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                writer.close()
+                os.unlink(writer.name)
+                raise
+        hexdigest = digest.hexdigest()
+        target = self.path_for(hexdigest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # link() fails if the blob exists, so concurrent writers of the same
+            # content agree on exactly one of them having stored it.
+            os.link(writer.name, target)
+        except FileExistsError:
+            os.unlink(writer.name)
+            return hexdigest, size, 0
+        except OSError:
+            # No hard links on this filesystem (exFAT/vfat, some SMB/NFS mounts).
+            # Writers of one digest write identical bytes, so a rename is safe.
+            if target.is_file():
+                os.unlink(writer.name)
+                return hexdigest, size, 0
+            try:
+                os.replace(writer.name, target)
+            except OSError:
+                os.unlink(writer.name)
+                raise
+            return hexdigest, size, size
+        os.unlink(writer.name)
+        return hexdigest, size, size
+
+    def copy_out(self, digest: str, destination: Path) -> int:
+        return fast_copy(self.path_for(digest), destination)
+
+    def iter_digests(self) -> Iterator[str]:
+        if not self.root.is_dir():
+            return
+        for bucket in self.root.iterdir():
+            if len(bucket.name) != 2 or not bucket.is_dir():
+                continue
+            for blob in bucket.iterdir():
+                yield bucket.name + blob.name
+
+    def collect_garbage(self, live: Iterable[str]) -> tuple[int, int]:
+        """Delete blobs outside ``live``; returns (blobs removed, bytes freed)."""
+        keep = set(live)
+        removed = freed = 0
+        for digest in list(self.iter_digests()):
+            if digest in keep:
+                continue
+            blob = self.path_for(digest)
+            try:
+                size = blob.stat().st_size
+                blob.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += size
+        return removed, freed
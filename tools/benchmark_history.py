@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""Append-only benchmark history with trend reports.
+
+``performance_benchmark.py --record`` appends one JSON line per run to
+``logs/perf/benchmark_history.ndjson``. Each line carries the git SHA, a host
+fingerprint, the Python version and the median/IQR of every benchmark, so
+series are only ever compared on like-for-like machines and interpreters.
+
+``report`` prints a trend table per benchmark, flags change points (a split
+of the series where the runs before and after differ significantly by
+Mann-Whitney U and by more than ``--min-shift``) and can write a static HTML
+page with one SVG chart per benchmark.
+
+Usage:
+  python tools/benchmark_history.py report
+  python tools/benchmark_history.py report --html logs/perf/benchmark_report.html --all-hosts
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+if str(Path(__file__).resolve().parents[1]) not in sys.path:
+    sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+
+from tools.performance_benchmark import mann_whitney_greater  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_HISTORY = ROOT / "logs" / "perf" / "benchmark_history.ndjson"
+SCHEMA_VERSION = 1
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_SHIFT = 0.05
+MIN_SEGMENT = 3
+DEFAULT_WINDOW = 200
+
+
+# ----------------------------------------------------------------------
+# Recording
+# ----------------------------------------------------------------------
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def host_fingerprint() -> dict[str, Any]:
+    """Identify the machine well enough that timings are comparable."""
+    details = {
+        "hostname": platform.node(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpus": os.cpu_count() or 0,
+    }
+    digest = hashlib.sha256(json.dumps(details, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"id": digest[:12], **details}
+
+
+def git_revision(root: Path) -> tuple[str | None, bool]:
+    """(HEAD SHA, worktree dirty) for ``root``; (None, False) outside git."""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return sha or None, bool(status.strip())
+
+
+def make_entry(results: dict[str, Any], root: Path) -> dict[str, Any]:
+    """History line for one ``PerformanceBenchmark`` results payload."""
+    sha, dirty = git_revision(root)
+    metadata = results.get("metadata", {})
+    benchmarks = {}
+    for name, record in results.get("benchmarks", {}).items():
+        stats = record.get("stats")
+        if record.get("status") not in ("ok", "warning") or not stats:
+            continue
+        benchmarks[name] = {
+            "median": stats["median"],
+            "q1": stats["q1"],
+            "q3": stats["q3"],
+            "n": stats["n"],
+        }
+    return {
+        "schema": SCHEMA_VERSION,
+        "recorded_at": metadata.get("timestamp") or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_sha": sha,
+        "git_dirty": dirty,
+        "host": host_fingerprint(),
+        "python": metadata.get("python_version") or platform.python_version(),
+        "suites": metadata.get("suites", []),
+        "benchmarks": benchmarks,
+    }
+
+
+class HistoryStore:
+    """Append-only NDJSON file of benchmark runs."""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY):
+        self.path = Path(path)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, sort_keys=True, separators=(",", ":")) + "\n"
+        # One write on an O_APPEND descriptor keeps concurrent appenders from interleaving
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+    def entries(self) -> Iterator[dict[str, Any]]:
+        """Stored runs in append order; unreadable lines are skipped."""
+        try:
+            handle = self.path.open(encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get("schema") == SCHEMA_VERSION:
+                    yield entry
+
+
+# ----------------------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------------------
+@dataclass
+class ChangePoint:
+    index: int
+    before: float
+    after: float
+    p_value: float
+
+    @property
+    def change(self) -> float:
+        return self.after / self.before - 1.0 if self.before > 0 else 0.0
+
+
+@dataclass
+class Series:
+    """Median timings of one benchmark on one host and interpreter."""
+
+    benchmark: str
+    host: str
+    python: str
+    shas: list[str | None] = field(default_factory=list)
+    recorded_at: list[str] = field(default_factory=list)
+    values: list[float] = field(default_factory=list)
+    change_points: list[ChangePoint] = field(default_factory=list)
+
+
+def build_series(
+    entries: Iterable[dict[str, Any]],
+    *,
+    host: str | None = None,
+    benchmarks: Iterable[str] | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> list[Series]:
+    """Group entries into per (benchmark, host, python) series, oldest first."""
+    wanted = set(benchmarks) if benchmarks else None
+    grouped: dict[tuple[str, str, str], Series] = {}
+    for entry in entries:
+        host_id = entry.get("host", {}).get("id", "unknown")
+        if host is not None and host_id != host:
+            continue
+        for name, stats in entry.get("benchmarks", {}).items():
+            if wanted is not None and name not in wanted:
+                continue
+            key = (name, host_id, entry.get("python", "?"))
+            series = grouped.setdefault(key, Series(*key))
+            series.shas.append(entry.get("git_sha"))
+            series.recorded_at.append(entry.get("recorded_at", ""))
+            series.values.append(stats["median"])
+    for series in grouped.values():
+        if window and len(series.values) > window:
+            series.shas = series.shas[-window:]
+            series.recorded_at = series.recorded_at[-window:]
+            series.values = series.values[-window:]
+    return sorted(grouped.values(), key=lambda item: (item.benchmark, item.host, item.python))
+
+
+def detect_change_points(
+    values: Sequence[float],
+    *,
+    alpha: float = DEFAULT_ALPHA,
+    min_shift: float = DEFAULT_MIN_SHIFT,
+    min_size: int = MIN_SEGMENT,
+) -> list[ChangePoint]:
+    """Binary segmentation on the median shift between adjacent segments.
+
+    Among splits whose relative median change exceeds ``min_shift``, the one
+    with the smallest two-sided Mann-Whitney p-value is kept if it is below
+    ``alpha``; both halves are then searched again. ``index`` is the first
+    run after the change.
+    """
+    found: list[ChangePoint] = []
+
+    def search(start: int, end: int) -> None:
+        best: ChangePoint | None = None
+        for split in range(start + min_size, end - min_size + 1):
+            before, after = values[start:split], values[split:end]
+            point = ChangePoint(split, statistics.median(before), statistics.median(after), 1.0)
+            if abs(point.change) <= min_shift:
+                continue
+            _, p_up = mann_whitney_greater(after, before)
+            _, p_down = mann_whitney_greater(before, after)
+            point.p_value = min(1.0, 2 * min(p_up, p_down))
+            if point.p_value >= alpha:
+                continue
+            # Medians barely move when a split lands a run or two off the step,
+            # so rank by the strength of separation and only then by size
+            if best is None or (point.p_value, -abs(point.change)) < (best.p_value, -abs(best.change)):
+                best = point
+        if best is None:
+            return
+        found.append(best)
+        search(start, best.index)
+        search(best.index, end)
+
+    search(0, len(values))
+    return sorted(found, key=lambda point: point.index)
+
+
+def analyse(series: list[Series], **options: Any) -> list[Series]:
+    for item in series:
+        item.change_points = detect_change_points(item.values, **options)
+    return series
+
+
+# ----------------------------------------------------------------------
+# Rendering
+# ----------------------------------------------------------------------
+def _short(sha: str | None) -> str:
+    return sha[:8] if sha else "-"
+
+
+def format_table(series: list[Series]) -> str:
+    if not series:
+        return "No benchmark history recorded yet."
+    lines = [
+        f"{'benchmark':34s} {'runs':>4s} {'first':>10s} {'latest':>10s} {'best':>10s} "
+        f"{'vs first':>9s} {'vs prev':>8s}  change points",
+    ]
+    hosts = {(item.host, item.python) for item in series}
+    for item in series:
+        first, latest, best = item.values[0], item.values[-1], min(item.values)
+        previous = item.values[-2] if len(item.values) > 1 else latest
+        name = item.benchmark if len(hosts) == 1 else f"{item.benchmark} [{item.host}/{item.python}]"
+        points = ", ".join(
+            f"{_short(item.shas[point.index])} {point.change:+.1%}" for point in item.change_points
+        )
+        lines.append(
+            f"{name:34s} {len(item.values):4d} {first:10.4f} {latest:10.4f} {best:10.4f} "
+            f"{latest / first - 1 if first else 0:+9.1%} {latest / previous - 1 if previous else 0:+8.1%}  "
+            f"{points or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def _svg_chart(item: Series, width: int = 640, height: int = 160, pad: int = 28) -> str:
+    values = item.values
+    low, high = min(values), max(values)
+    span = (high - low) or (high or 1.0)
+    step = (width - 2 * pad) / max(len(values) - 1, 1)
+
+    def x(index: int) -> float:
+        return pad + index * step
+
+    def y(value: float) -> float:
+        return height - pad - (value - low) / span * (height - 2 * pad)
+
+    points = " ".join(f"{x(i):.1f},{y(v):.1f}" for i, v in enumerate(values))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">',
+        f'<text x="{pad}" y="16" class="axis">{high:.4f}s</text>',
+        f'<text x="{pad}" y="{height - 6}" class="axis">{low:.4f}s</text>',
+    ]
+    for point in item.change_points:
+        cx = x(point.index) - step / 2
+        parts.append(
+            f'<line x1="{cx:.1f}" y1="{pad}" x2="{cx:.1f}" y2="{height - pad}" class="cp">'
+            f"<title>{html.escape(_short(item.shas[point.index]))} {point.change:+.1%} "
+            f"(p={point.p_value:.4f})</title></line>"
+        )
+    parts.append(f'<polyline points="{points}" class="trend"/>')
+    for index, value in enumerate(values):
+        label = f"{_short(item.shas[index])} {item.recorded_at[index]} {value:.4f}s"
+        parts.append(
+            f'<circle cx="{x(index):.1f}" cy="{y(value):.1f}" r="2.5"><title>{html.escape(label)}</title></circle>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_html(series: list[Series], title: str = "RJW-IDD benchmark history") -> str:
+    """Self-contained HTML page (inline CSS and SVG, no scripts)."""
+    sections = []
+    for item in series:
+        latest = item.values[-1]
+        change = latest / item.values[0] - 1 if item.values[0] else 0.0
+        sections.append(
+            "<section>"
+            f"<h2>{html.escape(item.benchmark)}</h2>"
+            f"<p>{len(item.values)} run(s) on host {html.escape(item.host)}, Python {html.escape(item.python)}; "
+            f"latest {latest:.4f}s ({change:+.1%} vs first), "
+            f"{len(item.change_points)} change point(s)</p>"
+            f"{_svg_chart(item)}"
+            "</section>"
+        )
+    table = html.escape(format_table(series))
+    generated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title><style>"
+        "body{font-family:sans-serif;margin:2em;color:#222}"
+        "pre{background:#f6f6f6;padding:1em;overflow-x:auto}"
+        "polyline.trend{fill:none;stroke:#1f77b4;stroke-width:1.5}"
+        "circle{fill:#1f77b4}line.cp{stroke:#d62728;stroke-dasharray:4 3}"
+        "text.axis{font-size:11px;fill:#666}"
+        "</style></head><body>"
+        f"<h1>{html.escape(title)}</h1><p>Generated {generated}</p>"
+        f"<pre>{table}</pre>{''.join(sections)}</body></html>\n"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="RJW-IDD benchmark history", epilog=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Print trend tables and optionally write an HTML dashboard")
+    report.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="History file (NDJSON)")
+    report.add_argument("--benchmark", nargs="+", help="Only report these benchmarks")
+    report.add_argument("--all-hosts", action="store_true", help="Include runs from other hosts")
+    report.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Most recent runs per series")
+    report.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Change-point significance level")
+    report.add_argument(
+        "--min-shift", type=float, default=DEFAULT_MIN_SHIFT, help="Smallest relative median shift reported"
+    )
+    report.add_argument("--html", type=Path, help="Write a static HTML report here")
+    report.add_argument("--json", action="store_true", help="Print the analysed series as JSON")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.history)
+    host = None if args.all_hosts else host_fingerprint()["id"]
+    series = build_series(store.entries(), host=host, benchmarks=args.benchmark, window=args.window)
+    analyse(series, alpha=args.alpha, min_shift=args.min_shift)
+
+    if args.json:
+        payload = [
+            {
+                "benchmark": item.benchmark,
+                "host": item.host,
+                "python": item.python,
+                "values": item.values,
+                "shas": item.shas,
+                "change_points": [
+                    {"sha": item.shas[point.index], "change": point.change, "p_value": point.p_value}
+                    for point in item.change_points
+                ],
+            }
+            for item in series
+        ]
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_table(series))
+
+    if args.html is not None:
+        args.html.parent.mkdir(parents=True, exist_ok=True)
+        args.html.write_text(render_html(series), encoding="utf-8")
+        print(f"HTML report written to {args.html}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Shared YAML loading for RJW-IDD configuration files.
+
+Prefers the libyaml-backed ``CSafeLoader``/``CSafeDumper`` when PyYAML was
+built with them and falls back to the pure-Python classes otherwise.
+
+Parsed configs (``features.yml`` and friends) are cached per process keyed by
+``(path, mtime_ns, size)``. Set ``RJW_CONFIG_CACHE_DIR`` (or pass
+``cache_dir``) to also keep a JSON copy on disk so short-lived CLI processes
+skip YAML parsing entirely. Only documents JSON represents faithfully are
+written there (string keys, no dates); each file keeps one disk entry, and
+older ones are removed when it is re-cached.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+USING_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+CACHE_DIR_ENV = "RJW_CONFIG_CACHE_DIR"
+
+# resolved path -> ((mtime_ns, size), parsed config)
+_CACHE: dict[str, tuple[tuple[int, int], Any]] = {}
+
+
+def load_yaml(source: str | bytes | IO[Any]) -> Any:
+    """Parse YAML text or a stream with the fastest available safe loader."""
+    return yaml.load(source, Loader=SafeLoader)  # nosec B506 - safe loaders only
+
+
+def dump_yaml(data: Any, stream: IO[Any] | None = None, **kwargs: Any) -> str | None:
+    """Serialise data with the fastest available safe dumper.
+
+    Defaults to block style with insertion-ordered keys, matching how the
+    starter kit writes ``features.yml``.
+    """
+    kwargs.setdefault("default_flow_style", False)
+    kwargs.setdefault("sort_keys", False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def _default_cache_dir() -> Path | None:
+    value = os.environ.get(CACHE_DIR_ENV)
+    return Path(value) if value else None
+
+
+def _disk_cache_prefix(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _disk_cache_file(cache_dir: Path, key: str, signature: tuple[int, int]) -> Path:
+    return cache_dir / f"{_disk_cache_prefix(key)}-{signature[0]}-{signature[1]}.json"
+
+
+def _json_faithful(data: Any) -> bool:
+    """True when a JSON round trip returns ``data`` unchanged (YAML allows int, bool and null keys)."""
+    if isinstance(data, dict):
+        return all(isinstance(key, str) and _json_faithful(value) for key, value in data.items())
+    if isinstance(data, list):
+        return all(_json_faithful(item) for item in data)
+    return data is None or isinstance(data, (str, int, float))
+
+
+def _read_disk_cache(cache_file: Path) -> tuple[bool, Any]:
+    try:
+        with cache_file.open(encoding="utf-8") as handle:
+            return True, json.load(handle)
+    except (OSError, ValueError):
+        return False, None
+
+
+def _write_disk_cache(cache_file: Path, data: Any) -> None:
+    if not _json_faithful(data):
+        # Dates, non-string keys and the like only live in the process cache
+        return
+    payload = json.dumps(data)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(payload, encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+        return
+    # Entries for earlier versions of the same file can never be hit again
+    prefix = cache_file.name.split("-", 1)[0]
+    for stale in cache_file.parent.glob(f"{prefix}-*.json"):
+        if stale != cache_file:
+            stale.unlink(missing_ok=True)
+
+
+def load_config(path: Path, cache_dir: Path | None = None) -> Any:
+    """Load a YAML config file, reusing a cached parse while the file is unchanged.
+
+    Returns a deep copy so callers can mutate the result without poisoning
+    the cache. Raises ``FileNotFoundError`` if the file does not exist.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(resolved)
+
+    cached = _CACHE.get(key)
+    if cached and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    cache_dir = cache_dir if cache_dir is not None else _default_cache_dir()
+    cache_file = _disk_cache_file(cache_dir, key, signature) if cache_dir else None
+
+    found = False
+    data: Any = None
+    if cache_file is not None:
+        found, data = _read_disk_cache(cache_file)
+    if not found:
+        with resolved.open("rb") as handle:
+            data = load_yaml(handle)
+        if cache_file is not None:
+            _write_disk_cache(cache_file, data)
+
+    _CACHE[key] = (signature, data)
+    return copy.deepcopy(data)
+
+
+def clear_cache() -> None:
+    """Drop every process-local cached config (disk entries are replaced as files change)."""
+    _CACHE.clear()
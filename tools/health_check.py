@@ -3,20 +3,29 @@
 
 Runs a lightweight diagnostic sweep across environment configuration,
 Python dependencies, external services, and simple performance probes.
+
+Service probes run concurrently while the in-process checks execute,
+dependency versions come from a single pass over installed distribution
+metadata, and the project walk prunes virtualenvs, caches, and archived
+method history. Each check's wall time is reported alongside its results.
 """
 
 from __future__ import annotations
 
 import argparse
-import importlib
+import importlib.metadata
 import importlib.util
 import json
 import os
+import re
+import shutil
 import subprocess
 import sys
 import time
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 
 
@@ -53,12 +62,133 @@ SERVICE_CHECKS: tuple[ServiceCheck, ...] = (
     ServiceCheck("npm", ["--version"], required=False),
 )
 
+SERVICE_TIMEOUT = 5.0
+
+# Directories never worth descending into when counting project sources.
+IGNORED_DIR_NAMES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        "node_modules",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        "build",
+        "dist",
+    }
+)
+IGNORED_DIR_SUFFIXES = (".egg-info",)
+# Paths relative to the project root, for trees that are only noise in one place.
+IGNORED_RELATIVE_PATHS = frozenset({"artifacts/method-history"})
+
+# Fresh-interpreter probe used by --deep; prints the import time in seconds.
+IMPORT_PROBE = (
+    "import time; start = time.perf_counter(); import pytest, ruff; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _canonical_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@cache
+def installed_distributions() -> dict[str, str]:
+    """Canonical distribution name -> version, read once per process."""
+    versions: dict[str, str] = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            versions.setdefault(_canonical_name(name), dist.version)
+    return versions
+
+
+def iter_python_files(root: Path) -> Iterable[str]:
+    """Yield paths of ``*.py`` files under ``root``, pruning ignored directories.
+
+    Uses ``os.scandir`` directly and never follows directory symlinks, so
+    large vendored trees cost nothing and link cycles cannot recurse.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        path, relative = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        child = f"{relative}/{name}" if relative else name
+                        if (
+                            name in IGNORED_DIR_NAMES
+                            or name.endswith(IGNORED_DIR_SUFFIXES)
+                            or child in IGNORED_RELATIVE_PATHS
+                        ):
+                            continue
+                        stack.append((entry.path, child))
+                    elif name.endswith(".py"):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _node_package_version(executable: str) -> str | None:
+    """Read the version of a Node CLI (npm, npx) from its package.json.
+
+    Starting node just to print ``npm --version`` costs ~200ms, several times
+    every other probe combined; the launcher is a symlink into the package,
+    so the manifest one level up holds the same answer.
+    """
+    script = Path(executable).resolve()
+    if script.suffix not in {".js", ".cjs"}:
+        return None
+    try:
+        manifest = json.loads((script.parent.parent / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    version = manifest.get("version") if isinstance(manifest, dict) else None
+    return version if isinstance(version, str) else None
+
+
+def probe_service(check: ServiceCheck) -> tuple[bool, str]:
+    """Return (available, version or error text) for one external command."""
+    executable = shutil.which(check.name)
+    if executable is None:
+        return False, "not available"
+    version = _node_package_version(executable)
+    if version:
+        return True, version
+    try:
+        result = subprocess.run(
+            [executable, *check.args],
+            capture_output=True,
+            text=True,
+            timeout=SERVICE_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False, "not available"
+    if result.returncode != 0:
+        return False, result.stderr.strip() or "error"
+    words = result.stdout.strip().split()
+    return True, words[-1] if words else "available"
+
 
 class HealthChecker:
     """Comprehensive health checker for RJW-IDD projects."""
 
-    def __init__(self, project_root: str | None = None):
+    def __init__(self, project_root: str | None = None, *, deep: bool = False, verbose: bool = True):
         self.project_root = Path(project_root or os.getcwd())
+        self.deep = deep
+        self._emit: Callable[..., None] = print if verbose else _silent
         self.results: dict[str, dict[str, dict[str, object]]] = {
             "environment": {},
             "dependencies": {},
@@ -66,31 +196,48 @@ class HealthChecker:
             "services": {},
             "performance": {},
         }
+        self.timings: dict[str, float] = {}
         self.overall_status = "unknown"
         self._overall_icon = "❔"
 
     def run_all_checks(self) -> dict:
         """Run every check, print a summary, and return the structured results."""
-        print("🔍 Running RJW-IDD Health Check...")
-        print("=" * 50)
-
-        self.check_environment()
-        self.check_dependencies()
-        self.check_configuration()
-        self.check_services()
-        self.check_performance()
+        self._emit("🔍 Running RJW-IDD Health Check...")
+        self._emit("=" * 50)
+
+        start = time.perf_counter()
+        # Service probes are subprocesses, so start them before the in-process
+        # checks and only wait on them when their section is printed.
+        with ThreadPoolExecutor(max_workers=len(SERVICE_CHECKS) + 1) as pool:
+            probes = {check.name: pool.submit(probe_service, check) for check in SERVICE_CHECKS}
+            import_probe = pool.submit(self._measure_import_latency) if self.deep else None
+            self._timed("environment", self.check_environment)
+            self._timed("dependencies", self.check_dependencies)
+            self._timed("configuration", self.check_configuration)
+            self._timed("services", self.check_services, probes)
+            self._timed("performance", self.check_performance, import_probe)
+        self.timings["total"] = time.perf_counter() - start
 
         self.determine_overall_status()
         self.print_summary()
 
-        payload: dict[str, object] = {**self.results, "overall_status": self.overall_status}
+        payload: dict[str, object] = {
+            **self.results,
+            "overall_status": self.overall_status,
+            "timings_ms": {name: round(seconds * 1000, 2) for name, seconds in self.timings.items()},
+        }
         return payload
 
+    def _timed(self, name: str, check: Callable[..., None], *args: object) -> None:
+        start = time.perf_counter()
+        check(*args)
+        self.timings[name] = time.perf_counter() - start
+
     # ------------------------------------------------------------------
     # Individual checks
     # ------------------------------------------------------------------
     def check_environment(self) -> None:
-        print("\n📋 Environment Check:")
+        self._emit("\n📋 Environment Check:")
 
         python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         min_version = "3.9.0"
@@ -100,7 +247,7 @@ class HealthChecker:
             "minimum": min_version,
             "status": "ok" if is_python_ok else "error",
         }
-        print(f"  Python {python_version}: {'✅' if is_python_ok else '❌'}")
+        self._emit(f"  Python {python_version}: {'✅' if is_python_ok else '❌'}")
 
         in_venv = sys.prefix != sys.base_prefix
         self.results["environment"]["virtual_env"] = {
@@ -108,7 +255,7 @@ class HealthChecker:
             "path": sys.prefix,
             "status": "ok" if in_venv else "warning",
         }
-        print(f"  Virtual Environment: {'✅' if in_venv else '⚠️'}")
+        self._emit(f"  Virtual Environment: {'✅' if in_venv else '⚠️'}")
 
         is_project_root = (self.project_root / "pyproject.toml").exists()
         self.results["environment"]["project_root"] = {
@@ -116,16 +263,18 @@ class HealthChecker:
             "is_valid": is_project_root,
             "status": "ok" if is_project_root else "error",
         }
-        print(f"  Project Root: {'✅' if is_project_root else '❌'}")
+        self._emit(f"  Project Root: {'✅' if is_project_root else '❌'}")
 
     def check_dependencies(self) -> None:
-        print("\n📦 Dependencies Check:")
+        self._emit("\n📦 Dependencies Check:")
 
+        versions = installed_distributions()
         for check in PACKAGE_CHECKS:
-            module_name = check.module_name
-            spec = importlib.util.find_spec(module_name)
-            if spec:
-                version = self._safe_version_lookup(module_name)
+            version = versions.get(_canonical_name(check.name))
+            if version is None and importlib.util.find_spec(check.module_name) is not None:
+                # Importable without distribution metadata (vendored or on PYTHONPATH).
+                version = "installed"
+            if version is not None:
                 status = "ok"
                 icon = "✅"
             else:
@@ -138,10 +287,10 @@ class HealthChecker:
                 "status": status,
             }
             label = "required" if check.required else "recommended"
-            print(f"  {check.name:12s} ({label}): {icon}")
+            self._emit(f"  {check.name:12s} ({label}): {icon}")
 
     def check_configuration(self) -> None:
-        print("\n⚙️ Configuration Check:")
+        self._emit("\n⚙️ Configuration Check:")
 
         config_files = [
             "pyproject.toml",
@@ -157,7 +306,7 @@ class HealthChecker:
                 "exists": exists,
                 "status": status,
             }
-            print(f"  {config_file}: {'✅' if exists else '⚠️'}")
+            self._emit(f"  {config_file}: {'✅' if exists else '⚠️'}")
 
         for ide in (".vscode", ".cursor", ".windsurf"):
             exists = (self.project_root / ide).exists()
@@ -165,83 +314,63 @@ class HealthChecker:
                 "exists": exists,
                 "status": "ok" if exists else "info",
             }
-            print(f"  {ide} config: {'✅' if exists else 'ℹ️'}")
+            self._emit(f"  {ide} config: {'✅' if exists else 'ℹ️'}")
+
+    def check_services(self, probes: dict[str, Future[tuple[bool, str]]] | None = None) -> None:
+        self._emit("\n🌐 Services Check:")
 
-    def check_services(self) -> None:
-        print("\n🌐 Services Check:")
+        if probes is None:
+            with ThreadPoolExecutor(max_workers=len(SERVICE_CHECKS)) as pool:
+                probes = {check.name: pool.submit(probe_service, check) for check in SERVICE_CHECKS}
+                self.check_services(probes)
+            return
 
         for check in SERVICE_CHECKS:
-            try:
-                result = subprocess.run(
-                    [check.name, *check.args],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    check=False,
-                )
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                version = "not available"
+            available, version = probes[check.name].result()
+            if available:
+                status = "ok"
+                icon = "✅"
+            else:
                 status = "error" if check.required else "warning"
                 icon = "❌" if check.required else "⚠️"
-            else:
-                if result.returncode == 0:
-                    words = result.stdout.strip().split()
-                    version = words[-1] if words else "available"
-                    status = "ok"
-                    icon = "✅"
-                else:
-                    version = result.stderr.strip() or "error"
-                    status = "error" if check.required else "warning"
-                    icon = "❌" if check.required else "⚠️"
 
             self.results["services"][check.name] = {
                 "version": version,
                 "status": status,
             }
             label = "required" if check.required else "optional"
-            print(f"  {check.name:10s} ({label}): {icon}")
+            self._emit(f"  {check.name:10s} ({label}): {icon}")
 
-    def check_performance(self) -> None:
-        print("\n⚡ Performance Check:")
+    def check_performance(self, import_probe: Future[float | None] | None = None) -> None:
+        self._emit("\n⚡ Performance Check:")
 
-        start_time = time.perf_counter()
-        try:
-            importlib.import_module("pytest")
-            importlib.import_module("ruff")
-        except ImportError:
-            import_time = float("inf")
-            status = "warning"
-            icon = "⚠️"
+        if import_probe is None and self.deep:
+            import_probe = _done(self._measure_import_latency())
+        if import_probe is None:
+            self._emit("  Import latency (pytest+ruff): ℹ️ skipped (use --deep)")
         else:
-            import_time = time.perf_counter() - start_time
-            status = "ok" if import_time < 2.0 else "warning"
-            icon = "✅" if status == "ok" else "⚠️"
-
-        self.results["performance"]["import_time"] = {
-            "time": import_time,
-            "status": status,
-        }
-        if import_time == float("inf"):
-            print("  Import latency (pytest+ruff): ⚠️ unavailable")
-        else:
-            print(f"  Import latency (pytest+ruff): {icon} {import_time:.2f}s")
+            import_time = import_probe.result()
+            if import_time is None:
+                status = "warning"
+                self._emit("  Import latency (pytest+ruff): ⚠️ unavailable")
+            else:
+                status = "ok" if import_time < 2.0 else "warning"
+                icon = "✅" if status == "ok" else "⚠️"
+                self._emit(f"  Import latency (pytest+ruff): {icon} {import_time:.2f}s")
+            self.results["performance"]["import_time"] = {
+                "time": import_time,
+                "status": status,
+            }
 
-        try:
-            py_files = list(self.project_root.rglob("*.py"))
-        except Exception:  # pragma: no cover - filesystem errors rare
-            file_count = 0
-            status = "warning"
-            icon = "⚠️"
-        else:
-            file_count = len(py_files)
-            status = "ok" if file_count > 0 else "warning"
-            icon = "✅" if status == "ok" else "⚠️"
+        file_count = sum(1 for _ in iter_python_files(self.project_root))
+        status = "ok" if file_count > 0 else "warning"
+        icon = "✅" if status == "ok" else "⚠️"
 
         self.results["performance"]["file_count"] = {
             "count": file_count,
             "status": status,
         }
-        print(f"  Python files discovered: {icon} {file_count}")
+        self._emit(f"  Python files discovered: {icon} {file_count}")
 
     # ------------------------------------------------------------------
     # Aggregation helpers
@@ -264,9 +393,9 @@ class HealthChecker:
             self._overall_icon = "✅"
 
     def print_summary(self) -> None:
-        print("\n" + "=" * 50)
-        print("🏥 HEALTH CHECK SUMMARY")
-        print("=" * 50)
+        self._emit("\n" + "=" * 50)
+        self._emit("🏥 HEALTH CHECK SUMMARY")
+        self._emit("=" * 50)
 
         status_messages = {
             "ok": "All systems operational",
@@ -274,7 +403,7 @@ class HealthChecker:
             "error": "Critical issues require attention",
         }
         message = status_messages.get(self.overall_status, "Unknown status")
-        print(f"Overall Status: {self._overall_icon} {message}")
+        self._emit(f"Overall Status: {self._overall_icon} {message}")
 
         error_count = 0
         warning_count = 0
@@ -287,29 +416,46 @@ class HealthChecker:
                     warning_count += 1
 
         if error_count:
-            print(f"Critical Issues: {error_count}")
+            self._emit(f"Critical Issues: {error_count}")
         if warning_count:
-            print(f"Warnings: {warning_count}")
+            self._emit(f"Warnings: {warning_count}")
 
-        print("\n💡 Next Steps:")
+        self._emit("\n💡 Next Steps:")
         if self.overall_status == "error":
-            print("  - Address critical issues before proceeding")
-            print("  - Check the troubleshooting guide for remediation steps")
+            self._emit("  - Address critical issues before proceeding")
+            self._emit("  - Check the troubleshooting guide for remediation steps")
         elif self.overall_status == "warning":
-            print("  - Review warnings and resolve when convenient")
-            print("  - Consider installing recommended tooling")
+            self._emit("  - Review warnings and resolve when convenient")
+            self._emit("  - Consider installing recommended tooling")
         else:
-            print("  - All checks passed! Ready to develop")
+            self._emit("  - All checks passed! Ready to develop")
+
+        if self.timings:
+            self._emit("\n⏱️ Check Timings:")
+            for name, seconds in self.timings.items():
+                self._emit(f"  {name:14s} {seconds * 1000:7.1f}ms")
 
     # ------------------------------------------------------------------
     # Utilities
     # ------------------------------------------------------------------
-    def _safe_version_lookup(self, module_name: str) -> str:
+    def _measure_import_latency(self) -> float | None:
+        """Seconds to import pytest and ruff in a fresh interpreter, or None.
+
+        A fresh interpreter keeps the figure honest (nothing is pre-imported)
+        and keeps both packages out of this process.
+        """
         try:
-            module = importlib.import_module(module_name)
-        except Exception:  # pragma: no cover - defensive fallback
-            return "installed"
-        return getattr(module, "__version__", "installed")
+            result = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE],
+                capture_output=True,
+                text=True,
+                timeout=30,
+                check=False,
+                cwd=self.project_root,
+            )
+            return float(result.stdout.strip()) if result.returncode == 0 else None
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            return None
 
     def _compare_versions(self, version1: str, version2: str) -> int:
         def _parts(value: str) -> list[int]:
@@ -329,14 +475,53 @@ class HealthChecker:
         return 0
 
 
+def _silent(*args: object, **kwargs: object) -> None:
+    return None
+
+
+def _done(value: object) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="RJW-IDD Health Check")
     parser.add_argument("--project-root", help="Project root directory")
     parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Also time pytest+ruff imports in a fresh interpreter (adds a few hundred ms)",
+    )
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument("--watch", action="store_true", help="Re-run checks on an interval and serve metrics")
+    watch.add_argument("--interval", type=float, default=30.0, help="Seconds between rounds (default: 30)")
+    watch.add_argument(
+        "--listen",
+        default="127.0.0.1:9109",
+        help="HOST:PORT for the /metrics, /health and /history endpoints (default: 127.0.0.1:9109)",
+    )
+    watch.add_argument("--unix-socket", help="Serve the endpoints on this Unix socket instead of TCP")
+    watch.add_argument("--history-size", type=int, default=50, help="Rounds kept for history and flap detection")
 
     args = parser.parse_args()
 
-    checker = HealthChecker(args.project_root)
+    if args.watch:
+        if str(Path(__file__).resolve().parents[1]) not in sys.path:
+            sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+        from tools import health_watch
+
+        watcher = health_watch.HealthWatcher(
+            args.project_root or os.getcwd(), deep=args.deep, history=args.history_size
+        )
+        server = health_watch.make_server(watcher, listen=args.listen, unix_socket=args.unix_socket)
+        where = args.unix_socket or f"http://{args.listen}"
+        print(f"🔁 Watching health every {args.interval:g}s; serving /metrics, /health, /history on {where}")
+        health_watch.watch(watcher, interval=args.interval, server=server)
+        return
+
+    checker = HealthChecker(args.project_root, deep=args.deep)
     results = checker.run_all_checks()
 
     if args.json:
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Continuous health checking for ``health_check.py --watch``.
+
+Re-runs the health checks on an interval and serves the latest results to
+monitoring over HTTP, either on a local TCP port or on a Unix socket:
+
+  /metrics   Prometheus text exposition (format 0.0.4)
+  /health    latest run as JSON, including checks currently flapping
+  /history   the bounded status history as JSON
+
+The dependency and service checks and the --deep import probe are the
+expensive checks. Their results are reused until one of their inputs
+changes: the interpreter prefix, pyproject.toml's mtime, the site-packages
+directories, or PATH. As a safety net, every ``full_refresh``-th run
+re-executes everything anyway.
+
+A check flaps when its status keeps changing. Detection weights recent
+transitions more heavily, in the same style as Nagios flap detection. A
+check starts flapping above ``FLAP_HIGH`` and stops below ``FLAP_LOW``.
+
+Usage:
+  python tools/health_check.py --watch --interval 30 --listen 127.0.0.1:9109
+  python tools/health_check.py --watch --unix-socket /run/rjw/health.sock
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socketserver
+import stat
+import sys
+import sysconfig
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+if str(Path(__file__).resolve().parents[1]) not in sys.path:
+    sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+
+from tools.health_check import HealthChecker, _done, installed_distributions  # noqa: E402
+
+DEFAULT_INTERVAL = 30.0
+DEFAULT_LISTEN = "127.0.0.1:9109"
+DEFAULT_HISTORY = 50
+DEFAULT_FULL_REFRESH = 10
+FLAP_HIGH = 0.5
+FLAP_LOW = 0.25
+MIN_FLAP_SAMPLES = 5
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus gauges need numbers; info counts as healthy.
+STATUS_CODES = {"ok": 0, "info": 0, "warning": 1, "error": 2}
+UNKNOWN_STATUS_CODE = 3
+
+# Expensive check -> the inputs whose change invalidates its cached result.
+EXPENSIVE_INPUTS: dict[str, tuple[str, ...]] = {
+    "dependencies": ("venv_prefix", "pyproject_mtime", "site_packages"),
+    "services": ("path",),
+    "import_time": ("venv_prefix", "pyproject_mtime", "site_packages"),
+}
+
+
+def input_fingerprints(project_root: Path) -> dict[str, Any]:
+    """Cheap stat-level snapshot of everything the expensive checks depend on."""
+    try:
+        pyproject_mtime: int | None = (project_root / "pyproject.toml").stat().st_mtime_ns
+    except OSError:
+        pyproject_mtime = None
+    site_packages = []
+    paths = sysconfig.get_paths()
+    for directory in sorted({paths["purelib"], paths["platlib"]}):
+        try:
+            site_packages.append((directory, os.stat(directory).st_mtime_ns))
+        except OSError:
+            site_packages.append((directory, None))
+    return {
+        "venv_prefix": sys.prefix,
+        "pyproject_mtime": pyproject_mtime,
+        "site_packages": tuple(site_packages),
+        "path": os.environ.get("PATH", ""),
+    }
+
+
+class FlapDetector:
+    """Weighted percent-state-change over a bounded window of statuses."""
+
+    def __init__(self, window: int = DEFAULT_HISTORY, *, high: float = FLAP_HIGH, low: float = FLAP_LOW):
+        self.statuses: deque[str] = deque(maxlen=max(window, 2))
+        self.high = high
+        self.low = low
+        self.flapping = False
+
+    def record(self, status: str) -> bool:
+        self.statuses.append(status)
+        if len(self.statuses) >= MIN_FLAP_SAMPLES:
+            change = self.state_change()
+            if self.flapping:
+                self.flapping = change >= self.low
+            else:
+                self.flapping = change > self.high
+        return self.flapping
+
+    def state_change(self) -> float:
+        """Share of transitions in the window, newest weighted 1.2 and oldest 0.8."""
+        statuses = list(self.statuses)
+        steps = len(statuses) - 1
+        if steps < 1:
+            return 0.0
+        total = changed = 0.0
+        for index in range(steps):
+            weight = 0.8 + 0.4 * index / max(steps - 1, 1)
+            total += weight
+            if statuses[index] != statuses[index + 1]:
+                changed += weight
+        return changed / total
+
+
+class HealthWatcher:
+    """Runs the health checks repeatedly and keeps the latest result and history."""
+
+    def __init__(
+        self,
+        project_root: str | Path,
+        *,
+        deep: bool = False,
+        history: int = DEFAULT_HISTORY,
+        full_refresh: int = DEFAULT_FULL_REFRESH,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.project_root = Path(project_root)
+        self.deep = deep
+        self.full_refresh = full_refresh
+        self.clock = clock
+        self.history: deque[dict[str, Any]] = deque(maxlen=history)
+        self.detectors: dict[str, FlapDetector] = {}
+        self.latest: dict[str, Any] | None = None
+        self.runs = 0
+        self._cache: dict[str, tuple[tuple[Any, ...], Any]] = {}
+        self._lock = threading.Lock()
+
+    def run_once(self) -> dict[str, Any]:
+        """Run one round of checks, update history and flap state, return the snapshot."""
+        inputs = input_fingerprints(self.project_root)
+        force = self.full_refresh > 0 and self.runs % self.full_refresh == 0
+        reused: list[str] = []
+        checker = HealthChecker(str(self.project_root), deep=self.deep, verbose=False)
+
+        def cached(name: str, compute: Callable[[], Any]) -> Any:
+            key = tuple(inputs[field] for field in EXPENSIVE_INPUTS[name])
+            hit = self._cache.get(name)
+            if hit is not None and not force and hit[0] == key:
+                reused.append(name)
+                return hit[1]
+            value = compute()
+            self._cache[name] = (key, value)
+            return value
+
+        def dependencies() -> dict[str, Any]:
+            installed_distributions.cache_clear()
+            checker.check_dependencies()
+            return dict(checker.results["dependencies"])
+
+        def services() -> dict[str, Any]:
+            checker.check_services()
+            return dict(checker.results["services"])
+
+        def performance() -> None:
+            if self.deep:
+                checker.check_performance(_done(cached("import_time", checker._measure_import_latency)))
+            else:
+                checker.check_performance()
+
+        start = time.perf_counter()
+        checker._timed("environment", checker.check_environment)
+        checker._timed("dependencies", lambda: checker.results.update(dependencies=cached("dependencies", dependencies)))
+        checker._timed("configuration", checker.check_configuration)
+        checker._timed("services", lambda: checker.results.update(services=cached("services", services)))
+        checker._timed("performance", performance)
+        checker.timings["total"] = time.perf_counter() - start
+        checker.determine_overall_status()
+
+        statuses = {
+            f"{category}.{name}": str(item.get("status", "unknown"))
+            for category, items in checker.results.items()
+            for name, item in items.items()
+        }
+        statuses["overall"] = checker.overall_status
+        flapping = sorted(
+            key
+            for key, status in statuses.items()
+            if self.detectors.setdefault(key, FlapDetector(self.history.maxlen or DEFAULT_HISTORY)).record(status)
+        )
+
+        timestamp = self.clock()
+        snapshot = {
+            "timestamp": timestamp,
+            "run": self.runs + 1,
+            "overall_status": checker.overall_status,
+            "results": checker.results,
+            "timings_ms": {name: round(seconds * 1000, 2) for name, seconds in checker.timings.items()},
+            "reused": reused,
+            "flapping": flapping,
+        }
+        with self._lock:
+            self.runs += 1
+            self.latest = snapshot
+            self.history.append(
+                {"timestamp": timestamp, "overall_status": checker.overall_status, "statuses": statuses}
+            )
+        return snapshot
+
+    def snapshot(self) -> tuple[dict[str, Any] | None, list[dict[str, Any]], int]:
+        with self._lock:
+            return self.latest, list(self.history), self.runs
+
+
+# ----------------------------------------------------------------------
+# Exposition
+# ----------------------------------------------------------------------
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: dict[str, Any] | None, runs: int) -> str:
+    """Prometheus text exposition of the latest snapshot."""
+    lines = [
+        "# HELP rjw_health_up Whether at least one health check round has completed.",
+        "# TYPE rjw_health_up gauge",
+        f"rjw_health_up {1 if snapshot else 0}",
+        "# HELP rjw_health_runs_total Health check rounds completed since start.",
+        "# TYPE rjw_health_runs_total counter",
+        f"rjw_health_runs_total {runs}",
+    ]
+    if not snapshot:
+        return "\n".join(lines) + "\n"
+
+    def code(status: object) -> int:
+        return STATUS_CODES.get(str(status), UNKNOWN_STATUS_CODE)
+
+    flapping = set(snapshot["flapping"])
+    lines += [
+        "# HELP rjw_health_overall_status Overall status (0=ok, 1=warning, 2=error, 3=unknown).",
+        "# TYPE rjw_health_overall_status gauge",
+        f"rjw_health_overall_status {code(snapshot['overall_status'])}",
+        "# HELP rjw_health_last_run_timestamp_seconds Unix time of the latest round.",
+        "# TYPE rjw_health_last_run_timestamp_seconds gauge",
+        f"rjw_health_last_run_timestamp_seconds {snapshot['timestamp']:.3f}",
+        "# HELP rjw_health_check_status Per-check status (0=ok, 1=warning, 2=error, 3=unknown).",
+        "# TYPE rjw_health_check_status gauge",
+    ]
+    checks = [
+        (category, name, item)
+        for category, items in snapshot["results"].items()
+        for name, item in items.items()
+    ]
+    for category, name, item in checks:
+        lines.append(
+            f'rjw_health_check_status{{category="{_label(category)}",check="{_label(name)}"}} '
+            f"{code(item.get('status'))}"
+        )
+    lines += [
+        "# HELP rjw_health_check_flapping Whether the check's status is flapping.",
+        "# TYPE rjw_health_check_flapping gauge",
+    ]
+    for category, name, _ in checks:
+        value = 1 if f"{category}.{name}" in flapping else 0
+        lines.append(f'rjw_health_check_flapping{{category="{_label(category)}",check="{_label(name)}"}} {value}')
+    lines += [
+        "# HELP rjw_health_check_duration_seconds Wall time of each check category in the latest round.",
+        "# TYPE rjw_health_check_duration_seconds gauge",
+    ]
+    for name, millis in snapshot["timings_ms"].items():
+        lines.append(f'rjw_health_check_duration_seconds{{category="{_label(name)}"}} {millis / 1000:.6f}')
+    lines += [
+        "# HELP rjw_health_check_reused Whether the category reused a cached result because its inputs were unchanged.",
+        "# TYPE rjw_health_check_reused gauge",
+    ]
+    for name in EXPENSIVE_INPUTS:
+        lines.append(f'rjw_health_check_reused{{category="{name}"}} {1 if name in snapshot["reused"] else 0}')
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    watcher: HealthWatcher
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        latest, history, runs = self.watcher.snapshot()
+        path = self.path.split("?", 1)[0].rstrip("/") or "/health"
+        if path == "/metrics":
+            self._send(200, PROMETHEUS_CONTENT_TYPE, render_prometheus(latest, runs))
+        elif path == "/health":
+            if latest is None:
+                self._send_json(503, {"overall_status": "unknown", "detail": "first round still running"})
+            else:
+                self._send_json(200, latest)
+        elif path == "/history":
+            self._send_json(200, {"runs": runs, "history": history})
+        else:
+            self._send_json(404, {"error": f"unknown path {path}"})
+
+    def _send_json(self, code: int, payload: object) -> None:
+        self._send(code, "application/json", json.dumps(payload, default=str))
+
+    def _send(self, code: int, content_type: str, body: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from http.server
+        return None
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    watcher: HealthWatcher, *, listen: str = DEFAULT_LISTEN, unix_socket: str | Path | None = None
+) -> socketserver.BaseServer:
+    """HTTP server for ``watcher`` on ``host:port`` or, if given, a Unix socket path."""
+    handler = type("HealthHandler", (_Handler,), {"watcher": watcher})
+    if unix_socket is not None:
+        path = Path(unix_socket)
+        if path.exists() and stat.S_ISSOCK(path.lstat().st_mode):
+            path.unlink()  # stale socket from a previous run
+        return _ThreadingUnixHTTPServer(str(path), handler)
+    host, _, port = listen.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), handler)
+    server.daemon_threads = True
+    return server
+
+
+def format_round(snapshot: dict[str, Any]) -> str:
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(snapshot["timestamp"]))
+    line = f"[{stamp}] run {snapshot['run']}: {snapshot['overall_status']} in {snapshot['timings_ms']['total']:.1f}ms"
+    if snapshot["reused"]:
+        line += f" (reused: {', '.join(snapshot['reused'])})"
+    if snapshot["flapping"]:
+        line += f" flapping: {', '.join(snapshot['flapping'])}"
+    return line
+
+
+def watch(
+    watcher: HealthWatcher,
+    *,
+    interval: float = DEFAULT_INTERVAL,
+    server: socketserver.BaseServer | None = None,
+    stop: threading.Event | None = None,
+    iterations: int | None = None,
+    out: Callable[[str], None] = print,
+) -> None:
+    """Run rounds every ``interval`` seconds until ``stop`` is set, Ctrl-C or SIGTERM."""
+    stop = stop or threading.Event()
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    if server is not None:
+        threading.Thread(target=server.serve_forever, name="health-watch-http", daemon=True).start()
+    try:
+        completed = 0
+        while not stop.is_set():
+            started = time.monotonic()
+            out(format_round(watcher.run_once()))
+            completed += 1
+            if iterations is not None and completed >= iterations:
+                break
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            if isinstance(server, socketserver.UnixStreamServer):
+                Path(server.server_address).unlink(missing_ok=True)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Profile entry-point start-up imports with ``python -X importtime``.
+
+Each entry point (``bin/rjw``, the ``tools/testing`` guards, the evidence
+harvester and the top-level ``scripts``) is loaded in a fresh interpreter
+with ``-X importtime``: its module body is executed under a name other than
+``__main__``, so imports happen but ``main()`` does not. The import tree is
+parsed into per-module self and cumulative costs (medians over the
+repetitions) and checked against ``tools/import_budgets.yml``:
+
+* the entry point's total import time must stay within ``total_ms``;
+* every module whose cumulative cost reaches ``heavy_import_ms`` must be
+  listed under ``heavy_imports``, so a newly added heavy dependency fails.
+  Only the outermost unlisted module of a heavy subtree is reported.
+
+``--update-budgets`` lists modules down to ``heavy_import_ms / headroom``, so
+modules hovering around the threshold do not flip in and out between runs.
+
+Usage:
+  python tools/import_profiler.py                    # profile and check budgets
+  python tools/import_profiler.py --top 10 bin/rjw   # show the costliest imports
+  python tools/import_profiler.py --update-budgets   # accept current costs
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+if str(Path(__file__).resolve().parents[1]) not in sys.path:
+    sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+
+from tools.config_loader import dump_yaml, load_config  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BUDGETS = ROOT / "tools" / "import_budgets.yml"
+ENTRY_POINT_PATTERNS = (
+    "bin/rjw",
+    "tools/testing/*_guard.py",
+    "tools/testing/guard_runner.py",
+    "tools/rjw_idd_evidence_harvester.py",
+    "scripts/*.py",
+)
+DEFAULT_HEAVY_IMPORT_MS = 20.0
+DEFAULT_HEADROOM = 1.5
+# Budgets never drop below this, so tiny entry points do not fail on jitter
+MIN_TOTAL_MS = 25.0
+MARKER = "rjw-importtime-probe"
+# argv: <entry point path>. The entry point's directory goes first on sys.path
+# exactly as when it is run as a script, and its body is exec'd in a module
+# registered in sys.modules (dataclasses look it up) without importing
+# anything first: runpy would pull in pkgutil, re and typing and hide their cost.
+PROBE = (
+    "import sys\n"
+    "path = sys.argv[1]\n"
+    "sys.path.insert(0, path.rsplit('/', 1)[0] if '/' in path else '.')\n"
+    "with open(path, 'rb') as handle:\n"
+    "    code = compile(handle.read(), path, 'exec')\n"
+    f"sys.stderr.write('{MARKER}\\n'); sys.stderr.flush()\n"
+    "module = type(sys)('__importtime__')\n"
+    "module.__file__ = path\n"
+    "sys.modules[module.__name__] = module\n"
+    "exec(code, module.__dict__)\n"
+)
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output, with its nested imports."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: list[ImportRecord] = field(default_factory=list)
+
+    def walk(self) -> Iterable[ImportRecord]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """Build the import tree from ``-X importtime`` stderr.
+
+    Only lines after the probe marker count when the marker is present, so
+    interpreter start-up imports are excluded. CPython prints a module after
+    its children, indenting two spaces per nesting level.
+    """
+    lines = text.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1 :]
+    pending: dict[int, list[ImportRecord]] = defaultdict(list)
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header row
+        raw = parts[2][1:]
+        depth = (len(raw) - len(raw.lstrip(" "))) // 2
+        record = ImportRecord(raw.strip(), self_us, cumulative_us, depth)
+        record.children = pending.pop(depth + 1, [])
+        pending[depth].append(record)
+    return pending.get(0, [])
+
+
+@dataclass
+class ModuleCost:
+    module: str
+    self_us: float
+    cumulative_us: float
+    parent: str | None = None
+
+
+@dataclass
+class ImportProfile:
+    """Median import costs for one entry point over several cold starts."""
+
+    entry: str
+    totals_us: list[int] = field(default_factory=list)
+    modules: dict[str, ModuleCost] = field(default_factory=dict)
+    roots: list[ImportRecord] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def total_ms(self) -> float:
+        return statistics.median(self.totals_us) / 1000 if self.totals_us else 0.0
+
+    def heavy(self, threshold_ms: float) -> list[ModuleCost]:
+        """Modules whose cumulative import cost reaches ``threshold_ms``, costliest first."""
+        limit = threshold_ms * 1000
+        found = [cost for cost in self.modules.values() if cost.cumulative_us >= limit]
+        return sorted(found, key=lambda cost: cost.cumulative_us, reverse=True)
+
+    def top(self, count: int) -> list[ModuleCost]:
+        """Modules with the highest self cost."""
+        return sorted(self.modules.values(), key=lambda cost: cost.self_us, reverse=True)[:count]
+
+
+def discover_entry_points(root: Path, patterns: Sequence[str] = ENTRY_POINT_PATTERNS) -> list[str]:
+    found: list[str] = []
+    for pattern in patterns:
+        for path in sorted(root.glob(pattern)):
+            if path.is_file() and path.name != "__init__.py":
+                relative = path.relative_to(root).as_posix()
+                if relative not in found:
+                    found.append(relative)
+    return found
+
+
+def _run_probe(root: Path, entry: str, python: str) -> tuple[list[ImportRecord] | None, str]:
+    try:
+        completed = subprocess.run(
+            [python, "-X", "importtime", "-c", PROBE, entry],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except subprocess.TimeoutExpired:
+        return None, "timed out after 60s"
+    if completed.returncode != 0:
+        tail = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        return None, tail[-1] if tail else f"exit status {completed.returncode}"
+    return parse_importtime(completed.stderr), ""
+
+
+def profile_entry_point(
+    root: Path,
+    entry: str,
+    *,
+    warmup: int = 1,
+    repetitions: int = 3,
+    python: str = sys.executable,
+) -> ImportProfile:
+    """Cold-start ``entry`` ``warmup + repetitions`` times and keep median costs.
+
+    Warm-up runs populate ``__pycache__`` so bytecode compilation is not
+    charged to the first sample.
+    """
+    profile = ImportProfile(entry)
+    for _ in range(warmup):
+        _run_probe(root, entry, python)
+    samples: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    for _ in range(max(repetitions, 1)):
+        roots, error = _run_probe(root, entry, python)
+        if roots is None:
+            profile.error = error
+            return profile
+        profile.roots = roots
+        profile.totals_us.append(sum(record.cumulative_us for record in roots))
+        for root_record in roots:
+            for record in root_record.walk():
+                samples[record.module].append((record.self_us, record.cumulative_us))
+    parents = {
+        child.module: record.module for top in profile.roots for record in top.walk() for child in record.children
+    }
+    for module, costs in samples.items():
+        profile.modules[module] = ModuleCost(
+            module,
+            statistics.median(cost[0] for cost in costs),
+            statistics.median(cost[1] for cost in costs),
+            parents.get(module),
+        )
+    return profile
+
+
+def profile_entry_points(
+    root: Path, entries: Sequence[str], *, jobs: int = 1, **options: Any
+) -> list[ImportProfile]:
+    if jobs <= 1:
+        return [profile_entry_point(root, entry, **options) for entry in entries]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda entry: profile_entry_point(root, entry, **options), entries))
+
+
+# ----------------------------------------------------------------------
+# Budgets
+# ----------------------------------------------------------------------
+def load_budgets(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    data = load_config(path) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping")
+    return data
+
+
+def check_budgets(profiles: Iterable[ImportProfile], budgets: dict[str, Any]) -> list[str]:
+    """Budget violations as human-readable messages (empty when within budget)."""
+    threshold = float(budgets.get("heavy_import_ms", DEFAULT_HEAVY_IMPORT_MS))
+    entries = budgets.get("entry_points") or {}
+    violations: list[str] = []
+    for profile in profiles:
+        if profile.error:
+            violations.append(f"{profile.entry}: could not profile imports: {profile.error}")
+            continue
+        budget = entries.get(profile.entry) or {}
+        limit = budget.get("total_ms")
+        if limit is not None and profile.total_ms > float(limit):
+            violations.append(
+                f"{profile.entry}: start-up imports take {profile.total_ms:.1f}ms, budget is {float(limit):.1f}ms"
+            )
+        allowed = set(budget.get("heavy_imports") or ())
+        heavy = profile.heavy(threshold)
+        new_heavy = {cost.module for cost in heavy} - allowed
+        for cost in heavy:
+            if cost.module not in new_heavy or _has_ancestor_in(profile, cost, new_heavy):
+                continue
+            violations.append(
+                f"{profile.entry}: new heavy import '{cost.module}' "
+                f"({cost.cumulative_us / 1000:.1f}ms cumulative, threshold {threshold:.1f}ms)"
+            )
+    return violations
+
+
+def _has_ancestor_in(profile: ImportProfile, cost: ModuleCost, modules: set[str]) -> bool:
+    parent = cost.parent
+    while parent is not None:
+        if parent in modules:
+            return True
+        ancestor = profile.modules.get(parent)
+        parent = ancestor.parent if ancestor is not None else None
+    return False
+
+
+def budgets_from_profiles(
+    profiles: Iterable[ImportProfile], previous: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Budget file contents accepting the current costs plus headroom."""
+    previous = previous or {}
+    threshold = float(previous.get("heavy_import_ms", DEFAULT_HEAVY_IMPORT_MS))
+    headroom = float(previous.get("headroom", DEFAULT_HEADROOM))
+    entries = dict(previous.get("entry_points") or {})
+    for profile in profiles:
+        if profile.error:
+            continue
+        entries[profile.entry] = {
+            "total_ms": round(max(profile.total_ms * headroom, MIN_TOTAL_MS), 1),
+            "heavy_imports": sorted(cost.module for cost in profile.heavy(threshold / headroom)),
+        }
+    return {
+        "heavy_import_ms": threshold,
+        "headroom": headroom,
+        "entry_points": dict(sorted(entries.items())),
+    }
+
+
+def write_budgets(path: Path, budgets: dict[str, Any]) -> None:
+    header = (
+        "# Start-up import budgets checked by tools/import_profiler.py.\n"
+        "# Regenerate with: python tools/import_profiler.py --update-budgets\n"
+    )
+    path.write_text(header + (dump_yaml(budgets) or ""), encoding="utf-8")
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+def format_profile(profile: ImportProfile, top: int, threshold_ms: float) -> str:
+    if profile.error:
+        return f"{profile.entry}: ❌ {profile.error}"
+    lines = [f"{profile.entry}: {profile.total_ms:.1f}ms in {len(profile.modules)} new module(s)"]
+    heavy = profile.heavy(threshold_ms)
+    if heavy:
+        lines.append(
+            "  heavy: " + ", ".join(f"{cost.module} {cost.cumulative_us / 1000:.1f}ms" for cost in heavy)
+        )
+    if top:
+        for cost in profile.top(top):
+            lines.append(
+                f"  {cost.self_us / 1000:8.2f}ms self {cost.cumulative_us / 1000:8.2f}ms cumulative  {cost.module}"
+            )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entries", nargs="*", help="Entry points to profile (default: all discovered)")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root (default: this checkout)")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS, help="Budget file (YAML)")
+    parser.add_argument("--update-budgets", action="store_true", help="Rewrite budgets from this run")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed cold starts per entry point")
+    parser.add_argument("--repetitions", type=int, default=3, help="Timed cold starts per entry point")
+    parser.add_argument("--jobs", type=int, default=1, help="Profile entry points concurrently")
+    parser.add_argument("--top", type=int, default=0, help="Show the N imports with the highest self cost")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    entries = args.entries or discover_entry_points(root)
+    budgets = load_budgets(args.budgets)
+    profiles = profile_entry_points(
+        root, entries, jobs=args.jobs, warmup=args.warmup, repetitions=args.repetitions
+    )
+    threshold = float(budgets.get("heavy_import_ms", DEFAULT_HEAVY_IMPORT_MS))
+    for profile in profiles:
+        print(format_profile(profile, args.top, threshold))
+
+    if args.update_budgets:
+        write_budgets(args.budgets, budgets_from_profiles(profiles, budgets))
+        print(f"import profiler: budgets written to {args.budgets}")
+        return 0
+
+    violations = check_budgets(profiles, budgets)
+    for violation in violations:
+        print(f"import profiler: {violation}", file=sys.stderr)
+    print(f"import profiler: {len(profiles)} entry point(s), {len(violations)} budget violation(s)")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
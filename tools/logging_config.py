@@ -1,7 +1,26 @@
-"""Centralized logging configuration for RJW-IDD."""
+"""Centralized logging configuration for RJW-IDD.
 
+``setup_logging`` is idempotent: calling it again with the same settings is a
+dictionary lookup, and only a change of settings rebuilds the handlers.
+
+With ``async_mode=True`` the application's loggers only put records on a
+bounded queue; a ``QueueListener`` thread does the formatting-heavy console
+and file I/O. When the queue is full the ``overflow`` policy either drops the
+record (counted per level, see ``dropped_records``) or blocks the caller until
+the listener catches up. The listener is drained at interpreter exit, or
+explicitly with ``shutdown_logging``.
+"""
+
+import atexit
+import copy
+import datetime
+import json
 import logging
 import logging.config
+import logging.handlers
+import queue
+import threading
+from collections import Counter
 from pathlib import Path
 from typing import Any, Optional
 
@@ -47,11 +66,74 @@ LOGGING_CONFIG = {
     },
 }
 
+OVERFLOW_POLICIES = ("drop", "block")
+DEFAULT_QUEUE_SIZE = 10000
+
+# LogRecord attributes that are not ``extra=`` fields.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_lock = threading.Lock()
+_active_settings: Optional[tuple[Any, ...]] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["BoundedQueueHandler"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, source and any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in payload:
+                payload[key] = value
+        return json.dumps(payload, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """``QueueHandler`` over a bounded queue that drops or blocks when it is full."""
+
+    def __init__(self, log_queue: "queue.Queue[Any]", overflow: str = "drop"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped: Counter[str] = Counter()
+        self._drop_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped[record.levelname] += 1
+
 
 def setup_logging(
     level: str = "INFO",
     log_file: Optional[Path] = None,
     verbose: bool = False,
+    *,
+    async_mode: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    overflow: str = "drop",
+    json_format: bool = False,
+    max_bytes: int = 10485760,
+    backup_count: int = 5,
 ) -> None:
     """Configure logging for the application.
 
@@ -59,32 +141,122 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional log file path
         verbose: Enable verbose output
+        async_mode: Hand records to a background thread through a bounded queue
+        queue_size: Capacity of that queue
+        overflow: "drop" or "block" when the queue is full
+        json_format: Write the log file as JSON lines
+        max_bytes: Rotate the log file once it reaches this size
+        backup_count: Number of rotated files to keep
     """
-    # Create a deep copy of the config to avoid modifying the original
-    import copy
-    config: dict[str, Any] = copy.deepcopy(LOGGING_CONFIG)
+    global _active_settings
+
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"Unknown overflow policy {overflow!r}; expected one of {', '.join(OVERFLOW_POLICIES)}")
+    settings = (
+        level.upper(),
+        str(log_file) if log_file else None,
+        verbose,
+        async_mode,
+        queue_size,
+        overflow,
+        json_format,
+        max_bytes,
+        backup_count,
+    )
+    with _lock:
+        if settings == _active_settings:
+            return
+        _stop_listener()
 
-    # Set log level
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
-    config["root"]["level"] = numeric_level
+        config: dict[str, Any] = copy.deepcopy(LOGGING_CONFIG)
 
-    # Update file handler if log_file specified
-    if log_file:
-        config["handlers"]["file"]["filename"] = str(log_file)
+        # Set log level
+        numeric_level = getattr(logging, level.upper(), logging.INFO)
+        config["root"]["level"] = numeric_level
 
-    # Enable verbose mode
-    if verbose:
-        config["handlers"]["console"]["level"] = "DEBUG"
-        config["handlers"]["console"]["formatter"] = "detailed"
+        # Update file handler if log_file specified
+        file_handler = config["handlers"]["file"]
+        if log_file:
+            file_handler["filename"] = str(log_file)
+        file_handler["maxBytes"] = max_bytes
+        file_handler["backupCount"] = backup_count
+        if json_format:
+            config["formatters"]["json"] = {"()": JsonFormatter}
+            file_handler["formatter"] = "json"
+        Path(file_handler["filename"]).parent.mkdir(parents=True, exist_ok=True)
 
-    # Apply configuration
-    logging.config.dictConfig(config)
+        # Enable verbose mode
+        if verbose:
+            config["handlers"]["console"]["level"] = "DEBUG"
+            config["handlers"]["console"]["formatter"] = "detailed"
+
+        # Apply configuration
+        logging.config.dictConfig(config)
+        if async_mode:
+            _start_listener(queue_size, overflow)
+        _active_settings = settings
 
     # Log setup completion
     logger = logging.getLogger(__name__)
     logger.info(f"Logging configured with level {level}")
 
 
+def _start_listener(queue_size: int, overflow: str) -> None:
+    """Move the configured handlers behind a queue; callers hold ``_lock``."""
+    global _listener, _queue_handler
+
+    root = logging.getLogger()
+    app = logging.getLogger("rjw_idd")
+    # dictConfig shares one instance per named handler between the two loggers.
+    handlers = list(dict.fromkeys(root.handlers + app.handlers))
+    log_queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, overflow)
+    for logger in (root, app):
+        logger.handlers = [_queue_handler]
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Drain and stop the listener, then report drops through its handlers; callers hold ``_lock``."""
+    global _listener, _queue_handler, _active_settings
+
+    if _listener is None or _queue_handler is None:
+        return
+    _listener.stop()
+    dropped = sum(_queue_handler.dropped.values())
+    if dropped:
+        counts = ", ".join(f"{name}={count}" for name, count in sorted(_queue_handler.dropped.items()))
+        message = f"Dropped {dropped} log records on a full queue ({counts})"
+        record = logging.makeLogRecord(
+            {"name": __name__, "levelno": logging.WARNING, "levelname": "WARNING", "msg": message}
+        )
+        for handler in _listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    for logger in (logging.getLogger(), logging.getLogger("rjw_idd")):
+        if _queue_handler in logger.handlers:
+            logger.handlers = list(_listener.handlers)
+    _listener = None
+    _queue_handler = None
+    _active_settings = None
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener, if one is running."""
+    with _lock:
+        _stop_listener()
+
+
+def dropped_records() -> dict[str, int]:
+    """Records dropped by the async queue since ``setup_logging``, by level name."""
+    handler = _queue_handler
+    return dict(handler.dropped) if handler is not None else {}
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for the given name.
 
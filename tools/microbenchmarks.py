@@ -0,0 +1,305 @@
+"""In-process microbenchmarks for the hot validation functions.
+
+Each benchmark builds a synthetic input at several scales (record counts or
+document sizes) and times a single call against it, so results read as
+throughput (records/s or MB/s) and, across scales, as a scaling curve. The
+generators are seeded, so every run measures identical inputs.
+
+Used by ``performance_benchmark.py --suite micro``; the functions here return
+raw timings and leave summarising to the caller.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import importlib
+import math
+import random
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RECORD_SCALES: tuple[tuple[str, int], ...] = (("1k", 1_000), ("10k", 10_000), ("100k", 100_000))
+DOC_SCALES: tuple[tuple[str, int], ...] = (("1MB", 1 << 20), ("10MB", 10 << 20))
+MB = float(1 << 20)
+SEED = 1729
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+_WORDS = (
+    "guard evidence ledger requirement spec change review decision trace test coverage "
+    "novice technical summary baseline latency throughput sandbox policy release drift"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def generate_evidence_records(count: int, *, seed: int = SEED) -> list[dict[str, Any]]:
+    """Evidence index records; roughly one in ten has a validation problem."""
+    rng = random.Random(seed)
+    today = dt.date(2025, 1, 1)
+    records = []
+    for index in range(count):
+        record: dict[str, Any] = {
+            "evid_id": f"EVD-{index % 10_000:04d}",
+            "uri": f"https://example.org/thread/{index}",
+            "author_or_handle": f"user{rng.randrange(5000)}",
+            "platform": rng.choice(("hn", "reddit", "github", "so", "official")),
+            "date": (today - dt.timedelta(days=rng.randrange(400))).isoformat(),
+            "minimal_quote": _sentence(rng, rng.randrange(5, 40)),
+            "tags": rng.sample(_WORDS, 3),
+            "stance": rng.choice(("pain", "fix", "aha", "win", "risk", "contra")),
+            "quality_flags": [],
+        }
+        if rng.random() < 0.1:
+            record[rng.choice(("uri", "stance", "date", "minimal_quote"))] = ""
+        records.append(record)
+    return records
+
+
+def generate_guard_payload(count: int, *, seed: int = SEED) -> dict[str, Any]:
+    """Agent output with ``count`` actions mixing safe and flagged operations."""
+    rng = random.Random(seed)
+    actions = []
+    for index in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            action = {"type": "read_file", "path": f"src/module_{index}.py"}
+        elif kind < 0.85:
+            action = {
+                "type": "file_write",
+                "path": rng.choice((f"sandbox/out_{index}.txt", f"/etc/out_{index}.conf")),
+                "signed": rng.random() < 0.5,
+                "content": _sentence(rng, 12),
+            }
+        elif kind < 0.97:
+            action = {"type": "http_request", "url": f"https://api.example.org/{index}"}
+        else:
+            action = {"type": "run_command", "command": "python -c 'eval(\"1\")'"}
+        actions.append(action)
+    return {
+        "agent_id": "bench",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "version": "1",
+        "actions": actions,
+        "tools_used": ["read_file", "write_file", "search"],
+    }
+
+
+def write_requirement_ledger(path: Path, count: int, *, seed: int = SEED) -> Path:
+    """Requirement ledger CSV with ``count`` rows, a few of them malformed."""
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["req_id", "title", "evidence_refs", "spec_refs", "tests_refs", "next_review"])
+        for index in range(count):
+            ident = index % 10_000
+            evidence = ";".join(f"EVD-{rng.randrange(10_000):04d}" for _ in range(rng.randrange(1, 4)))
+            review = (dt.date(2025, 1, 1) + dt.timedelta(days=rng.randrange(365))).isoformat()
+            if rng.random() < 0.05:
+                review = "soon"
+            writer.writerow(
+                [f"REQ-{ident:04d}", _sentence(rng, 6), evidence, f"SPEC-{ident:04d}", f"TEST-{ident:04d}", review]
+            )
+    return path
+
+
+def generate_markdown(size: int, *, seed: int = SEED) -> str:
+    """Markdown of about ``size`` bytes with prose and python/yaml/bash fences."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    total = 0
+    section = 0
+    while total < size:
+        section += 1
+        block = [f"## Section {section}", "", _sentence(rng, 40), ""]
+        fence = rng.random()
+        if fence < 0.4:
+            block += ["```python", f"def handler_{section}(value):", "    return value * 2", "```", ""]
+        elif fence < 0.6:
+            block += ["```yaml", f"section: {section}", "enabled: true", "```", ""]
+        elif fence < 0.7:
+            block += ["```bash", f"echo section {section}", "```", ""]
+        text = "\n".join(block) + "\n"
+        parts.append(text)
+        total += len(text)
+    return "".join(parts)
+
+
+def generate_agent_response(size: int, *, seed: int = SEED) -> str:
+    """Agent reply of about ``size`` bytes with both required sections.
+
+    Every few paragraphs carries a placeholder backed by an AUTOGENERATED
+    assumption so the guard exercises its marker-window checks.
+    """
+    rng = random.Random(seed)
+    parts = ["# Novice Summary\n\n", _sentence(rng, 30), "\n\n# Technical Specification\n\n"]
+    total = sum(len(part) for part in parts)
+    paragraph = 0
+    while total < size:
+        paragraph += 1
+        if paragraph % 25 == 0:
+            text = (
+                f"AUTOGENERATED ASSUMPTION: limit is TBD for item {paragraph}.\n"
+                "Rationale: upstream has not published it.\nConfidence: Medium\n\n"
+            )
+        else:
+            text = _sentence(rng, 30) + "\n\n"
+        parts.append(text)
+        total += len(text)
+    return "".join(parts)
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+def _ensure_import_paths() -> None:
+    for path in (ROOT, ROOT / "tools" / "testing"):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+
+
+def _module(name: str) -> Any:
+    _ensure_import_paths()
+    return importlib.import_module(name)
+
+
+def _prepare_guard(size: int, workdir: Path) -> Callable[[], object]:
+    guard = _module("tools.rjw_cli.guard")
+    payload = generate_guard_payload(size)
+    return lambda: guard.validate(payload, "default")
+
+
+def _prepare_evidence(size: int, workdir: Path) -> Callable[[], object]:
+    validate_record = _module("scripts.validate_evidence").validate_record
+    records = generate_evidence_records(size)
+    now = dt.datetime(2025, 1, 1)
+
+    def run() -> int:
+        warnings: list[str] = []
+        return sum(len(validate_record(record, cutoff_days=365, now=now, warnings=warnings)) for record in records)
+
+    return run
+
+
+def _prepare_fences(size: int, workdir: Path) -> Callable[[], object]:
+    find_code_fences = _module("scripts.doc_sync").find_code_fences
+    content = generate_markdown(size)
+    path = workdir / "doc.md"
+    return lambda: find_code_fences(content, path)
+
+
+def _prepare_ledger(size: int, workdir: Path) -> Callable[[], object]:
+    validate_requirement_ledger = _module("scripts.validate_ids").validate_requirement_ledger
+    path = write_requirement_ledger(workdir / f"requirements_{size}.csv", size)
+
+    def run() -> int:
+        errors: list[str] = []
+        validate_requirement_ledger(path, errors)
+        return len(errors)
+
+    return run
+
+
+def _prepare_agent_response(size: int, workdir: Path) -> Callable[[], object]:
+    validate_file = _module("agent_response_guard").validate_file
+    path = workdir / f"reply_{size}.md"
+    path.write_text(generate_agent_response(size), encoding="utf-8")
+    return lambda: validate_file(path)
+
+
+@dataclass(frozen=True)
+class MicroBenchmark:
+    """One target function measured at several input scales.
+
+    ``prepare(size, workdir)`` builds the input outside the timed region and
+    returns a zero-argument callable that performs exactly one measured call.
+    """
+
+    name: str
+    target: str
+    unit: str
+    scales: tuple[tuple[str, int], ...]
+    prepare: Callable[[int, Path], Callable[[], object]]
+
+    def units(self, size: int) -> float:
+        """Amount of work at ``size`` in this benchmark's throughput unit."""
+        return size / MB if self.unit == "MB" else float(size)
+
+
+MICRO_BENCHMARKS: tuple[MicroBenchmark, ...] = (
+    MicroBenchmark("guard_validate", "tools.rjw_cli.guard.validate", "actions", RECORD_SCALES, _prepare_guard),
+    MicroBenchmark(
+        "validate_record", "scripts.validate_evidence.validate_record", "records", RECORD_SCALES, _prepare_evidence
+    ),
+    MicroBenchmark("find_code_fences", "scripts.doc_sync.find_code_fences", "MB", DOC_SCALES, _prepare_fences),
+    MicroBenchmark(
+        "requirement_ledger",
+        "scripts.validate_ids.validate_requirement_ledger",
+        "rows",
+        RECORD_SCALES,
+        _prepare_ledger,
+    ),
+    MicroBenchmark(
+        "agent_response", "tools/testing/agent_response_guard.validate_file", "MB", DOC_SCALES, _prepare_agent_response
+    ),
+)
+MICRO_NAMES = tuple(bench.name for bench in MICRO_BENCHMARKS)
+
+
+def select(
+    names: Iterable[str] | None = None, scales: Iterable[str] | None = None
+) -> list[tuple[MicroBenchmark, str, int]]:
+    """(benchmark, scale label, size) triples filtered by name and scale label."""
+    wanted_names = set(names or MICRO_NAMES)
+    unknown = wanted_names - set(MICRO_NAMES)
+    if unknown:
+        raise ValueError(f"unknown microbenchmark(s): {', '.join(sorted(unknown))}")
+    wanted_scales = set(scales) if scales else None
+    return [
+        (bench, label, size)
+        for bench in MICRO_BENCHMARKS
+        if bench.name in wanted_names
+        for label, size in bench.scales
+        if wanted_scales is None or label in wanted_scales
+    ]
+
+
+def measure(func: Callable[[], object], *, warmup: int, repetitions: int) -> list[float]:
+    """Wall-clock seconds for ``repetitions`` calls after ``warmup`` untimed ones."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def scaling_exponent(points: Sequence[tuple[float, float]]) -> float | None:
+    """Least-squares slope of log(time) against log(size).
+
+    1.0 means linear scaling; values well above 1 flag super-linear work.
+    Returns None with fewer than two usable points.
+    """
+    logs = [(math.log(size), math.log(seconds)) for size, seconds in points if size > 0 and seconds > 0]
+    if len(logs) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    spread = sum((x - mean_x) ** 2 for x, _ in logs)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / spread
+
@@ -1,5 +1,39 @@
 #!/usr/bin/env python3
-"""Performance benchmarking utilities for RJW-IDD tooling."""
+"""Performance benchmarking utilities for RJW-IDD tooling.
+
+Each CLI benchmark runs ``warmup`` untimed iterations followed by
+``repetitions`` timed ones. Samples outside Tukey's fences (1.5 x IQR beyond
+the quartiles) are rejected and the remainder is summarised as median and
+IQR. ``--save-baseline`` stores the samples; ``--baseline`` compares a new run
+against them with a one-sided Mann-Whitney U test (or a bootstrap confidence
+interval on the median) and exits 1 only when a benchmark is both
+significantly and materially slower.
+
+Usage:
+  python tools/performance_benchmark.py --repetitions 10 --save-baseline logs/perf/baseline.json
+  python tools/performance_benchmark.py --baseline logs/perf/baseline.json --pin-cpu 2
+  python tools/performance_benchmark.py --suite micro --scales 1k 10k 1MB
+
+``--suite micro`` times the hot validation functions in-process on seeded
+synthetic inputs (see ``tools/microbenchmarks.py``) and reports throughput
+per scale plus a log-log scaling exponent per function. Micro results carry
+samples too, so they take part in baseline comparisons.
+
+CLI benchmarks and module imports run serially by default, the lowest-noise
+setting. ``--parallel [JOBS]`` runs independent benchmarks concurrently, each
+in its own child processes; medians shift under contention, so compare
+parallel runs only with parallel baselines. Import times are measured in a
+fresh interpreter per sample (``--import-mode fresh``) so each one is a cold
+import rather than a cache hit from an earlier benchmark.
+
+``--suite imports`` profiles every entry point with ``-X importtime`` (see
+``tools/import_profiler.py``), records its total import cost as a benchmark
+and fails the run when an entry point exceeds its budget in
+``tools/import_budgets.yml`` or gains a new heavy import.
+
+``--record`` appends the run's medians to ``logs/perf/benchmark_history.ndjson``
+for trend reports (``tools/benchmark_history.py report``).
+"""
 
 from __future__ import annotations
 
@@ -7,16 +41,37 @@ import argparse
 import importlib
 import importlib.util
 import json
+import math
 import os
+import random
+import statistics
 import subprocess
 import sys
+import tempfile
 import time
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import cache
 from pathlib import Path
 from typing import Any
 
+if str(Path(__file__).resolve().parents[1]) not in sys.path:
+    sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+
+from tools import import_profiler, microbenchmarks  # noqa: E402
+
+DEFAULT_WARMUP = 1
+DEFAULT_REPETITIONS = 5
+DEFAULT_ALPHA = 0.05
+DEFAULT_THRESHOLD = 0.05
+OUTLIER_FENCE = 1.5
+BOOTSTRAP_RESAMPLES = 2000
+SUITES = ("cli", "micro", "imports")
+# Exact Mann-Whitney p-values are enumerated up to this many samples per side
+EXACT_MAX_SAMPLES = 30
+
 
 @dataclass
 class BenchmarkRecord:
@@ -26,16 +81,368 @@ class BenchmarkRecord:
     details: dict[str, Any] | None = None
 
 
+# ----------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------
+@dataclass
+class SampleStats:
+    """Robust summary of repeated timings after outlier rejection."""
+
+    samples: list[float]
+    rejected: list[float]
+    median: float
+    q1: float
+    q3: float
+    mean: float
+    stdev: float
+    minimum: float
+    maximum: float
+
+    @property
+    def iqr(self) -> float:
+        return self.q3 - self.q1
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["iqr"] = self.iqr
+        payload["n"] = len(self.samples)
+        return payload
+
+
+def _quartiles(values: Sequence[float]) -> tuple[float, float, float]:
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0], ordered[0], ordered[0]
+    q1, median, q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+    return q1, median, q3
+
+
+def reject_outliers(values: Sequence[float], fence: float = OUTLIER_FENCE) -> tuple[list[float], list[float]]:
+    """Split ``values`` into (kept, rejected) using Tukey's fences.
+
+    Fewer than four samples are returned unchanged: the quartiles are too
+    unstable to call anything an outlier.
+    """
+    if len(values) < 4:
+        return list(values), []
+    q1, _, q3 = _quartiles(values)
+    spread = q3 - q1
+    low, high = q1 - fence * spread, q3 + fence * spread
+    kept = [value for value in values if low <= value <= high]
+    rejected = [value for value in values if not low <= value <= high]
+    return kept, rejected
+
+
+def summarise_samples(values: Sequence[float], fence: float = OUTLIER_FENCE) -> SampleStats:
+    """Reject outliers from ``values`` and summarise the rest."""
+    if not values:
+        raise ValueError("cannot summarise an empty sample")
+    kept, rejected = reject_outliers(values, fence)
+    q1, median, q3 = _quartiles(kept)
+    return SampleStats(
+        samples=kept,
+        rejected=rejected,
+        median=median,
+        q1=q1,
+        q3=q3,
+        mean=statistics.fmean(kept),
+        stdev=statistics.stdev(kept) if len(kept) > 1 else 0.0,
+        minimum=min(kept),
+        maximum=max(kept),
+    )
+
+
+@cache
+def _u_counts(m: int, n: int) -> tuple[int, ...]:
+    """Number of orderings of m + n tie-free values giving each U statistic."""
+    if m == 0 or n == 0:
+        return (1,)
+    counts = [0] * (m * n + 1)
+    # The largest value either comes from the first sample, beating all n
+    # values of the second, or from the second sample, beating none.
+    for u, count in enumerate(_u_counts(m - 1, n)):
+        counts[u + n] += count
+    for u, count in enumerate(_u_counts(m, n - 1)):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> tuple[float, float]:
+    """One-sided Mann-Whitney U test that ``current`` tends to exceed ``baseline``.
+
+    Returns ``(U, p_value)``. The p-value is exact for small tie-free samples
+    and uses the tie-corrected normal approximation otherwise.
+    """
+    m, n = len(current), len(baseline)
+    if not m or not n:
+        raise ValueError("both samples need at least one value")
+    u = 0.0
+    for value in current:
+        for reference in baseline:
+            if value > reference:
+                u += 1.0
+            elif value == reference:
+                u += 0.5
+
+    pooled = [*current, *baseline]
+    ties = len(pooled) != len(set(pooled))
+    if not ties and max(m, n) <= EXACT_MAX_SAMPLES:
+        counts = _u_counts(m, n)
+        return u, sum(counts[int(u):]) / math.comb(m + n, m)
+
+    total = m + n
+    tie_term = sum(size**3 - size for size in (pooled.count(value) for value in set(pooled)))
+    variance = m * n / 12.0 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - m * n / 2.0 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_median_change(
+    current: Sequence[float],
+    baseline: Sequence[float],
+    *,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = 1 - DEFAULT_ALPHA,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Percentile bootstrap interval for ``median(current) / median(baseline) - 1``."""
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        cur = statistics.median(rng.choices(current, k=len(current)))
+        changes.append(cur / base - 1.0 if base > 0 else 0.0)
+    changes.sort()
+    tail = (1 - confidence) / 2
+    low = changes[int(tail * (resamples - 1))]
+    high = changes[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return low, high
+
+
+@dataclass
+class Comparison:
+    """Outcome of comparing one benchmark against its baseline."""
+
+    name: str
+    baseline_median: float
+    current_median: float
+    change: float
+    verdict: str
+    p_value: float | None = None
+    ci_low: float | None = None
+    ci_high: float | None = None
+
+    @property
+    def regressed(self) -> bool:
+        return self.verdict == "regression"
+
+
+def compare_samples(
+    name: str,
+    current: Sequence[float],
+    baseline: Sequence[float],
+    *,
+    method: str = "mann-whitney",
+    alpha: float = DEFAULT_ALPHA,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Comparison:
+    """Classify ``current`` against ``baseline`` as regression, improvement or unchanged.
+
+    A regression needs both statistical significance (``p < alpha`` or a
+    bootstrap interval entirely above zero) and a median slowdown larger
+    than ``threshold`` so that real but negligible shifts do not fail CI.
+    """
+    base_median = statistics.median(baseline)
+    cur_median = statistics.median(current)
+    change = cur_median / base_median - 1.0 if base_median > 0 else 0.0
+    comparison = Comparison(name, base_median, cur_median, change, "unchanged")
+
+    if method == "bootstrap":
+        low, high = bootstrap_median_change(current, baseline, confidence=1 - alpha)
+        comparison.ci_low, comparison.ci_high = low, high
+        slower, faster = low > 0, high < 0
+    elif method == "mann-whitney":
+        _, p_slower = mann_whitney_greater(current, baseline)
+        _, p_faster = mann_whitney_greater(baseline, current)
+        comparison.p_value = p_slower
+        slower, faster = p_slower < alpha, p_faster < alpha
+    else:
+        raise ValueError(f"unknown comparison method: {method}")
+
+    if slower and change > threshold:
+        comparison.verdict = "regression"
+    elif faster and change < -threshold:
+        comparison.verdict = "improvement"
+    return comparison
+
+
+def compare_to_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    **options: Any,
+) -> list[Comparison]:
+    """Compare every benchmark that has samples in both result payloads."""
+    comparisons = []
+    previous = baseline.get("benchmarks", {})
+    for name, record in results.get("benchmarks", {}).items():
+        current = record.get("samples")
+        reference = (previous.get(name) or {}).get("samples")
+        if not current or not reference:
+            continue
+        comparisons.append(compare_samples(name, current, reference, **options))
+    return comparisons
+
+
+# ----------------------------------------------------------------------
+# Environment
+# ----------------------------------------------------------------------
+def _read_sys(path: str) -> str | None:
+    try:
+        return Path(path).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def pin_cpu(cpu: int) -> bool:
+    """Restrict this process (and the benchmarks it spawns) to one CPU."""
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return False
+    return True
+
+
+def cpu_pinning_hints() -> list[str]:
+    """Suggestions for reducing timing noise on this host."""
+    hints: list[str] = []
+    if hasattr(os, "sched_getaffinity"):
+        cpus = os.sched_getaffinity(0)
+        if len(cpus) > 1:
+            hints.append(
+                f"process may migrate across {len(cpus)} CPUs; pass --pin-cpu N "
+                "(or run under `taskset -c N`) to keep caches warm"
+            )
+    else:
+        hints.append("CPU affinity is not available on this platform; close busy applications")
+    governor = _read_sys("/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor")
+    if governor and governor != "performance":
+        hints.append(f"CPU frequency governor is '{governor}'; 'performance' gives steadier timings")
+    if _read_sys("/sys/devices/system/cpu/intel_pstate/no_turbo") == "0":
+        hints.append("turbo boost is enabled; disabling it reduces run-to-run variance")
+    if _read_sys("/sys/devices/system/cpu/cpufreq/boost") == "1":
+        hints.append("CPU boost is enabled; disabling it reduces run-to-run variance")
+    return hints
+
+
+@dataclass(frozen=True)
+class CliBenchmark:
+    """One command-line start-up benchmark."""
+
+    key: str
+    title: str
+    command: tuple[str, ...]
+    missing_indicators: tuple[str, ...] = ()
+    acceptable_return_codes: frozenset[int] = frozenset({0})
+    warning_return_codes: frozenset[int] = frozenset()
+
+
+CLI_BENCHMARKS: tuple[CliBenchmark, ...] = (
+    CliBenchmark(
+        "evidence_harvester",
+        "🔍 Evidence Harvester",
+        (sys.executable, "tools/rjw_idd_evidence_harvester.py", "--help"),
+    ),
+    CliBenchmark("red_green_guard", "🛡️ Red-Green Guard", (sys.executable, "tools/testing/red_green_guard.py", "--help")),
+    CliBenchmark(
+        "living_docs_guard", "📚 Living Docs Guard", (sys.executable, "tools/testing/living_docs_guard.py", "--help")
+    ),
+    CliBenchmark(
+        "change_log_guard", "📝 Change Log Guard", (sys.executable, "tools/testing/change_log_guard.py", "--help")
+    ),
+    CliBenchmark(
+        "test_suite",
+        "🧪 Test Suite Discovery",
+        (sys.executable, "-m", "pytest", "--collect-only", "tests", "-q"),
+        missing_indicators=("No module named pytest",),
+    ),
+    CliBenchmark(
+        "linting",
+        "🔍 Ruff Lint",
+        (sys.executable, "-m", "ruff", "check", "tools/logging_config.py", "--quiet"),
+        missing_indicators=("No module named ruff",),
+        acceptable_return_codes=frozenset({0, 1}),  # ruff returns 1 when it finds issues
+    ),
+    CliBenchmark(
+        "formatting",
+        "🎨 Black Format Check",
+        (sys.executable, "-m", "black", "--check", "--quiet", "tools/logging_config.py"),
+        missing_indicators=("No module named black",),
+        warning_return_codes=frozenset({1}),
+    ),
+    CliBenchmark(
+        "type_checking",
+        "🔍 Mypy Type Check",
+        (sys.executable, "-m", "mypy", "tools/logging_config.py", "--ignore-missing-imports"),
+        missing_indicators=("No module named mypy",),
+    ),
+)
+
+IMPORT_MODULES = (
+    "tools.logging_config",
+    "tools.performance_monitor",
+    "tools.backup_manager",
+)
+IMPORT_MODES = ("fresh", "in-process")
+# Run as ``python -c IMPORT_PROBE <module>`` so interpreter start-up is excluded
+IMPORT_PROBE = (
+    "import importlib, sys, time\n"
+    "start = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def _done(result: Any) -> Future[Any]:
+    future: Future[Any] = Future()
+    future.set_result(result)
+    return future
+
+
 class PerformanceBenchmark:
     """Performance benchmarking suite for RJW-IDD."""
 
-    def __init__(self, project_root: str | None = None):
+    def __init__(
+        self,
+        project_root: str | None = None,
+        *,
+        warmup: int = DEFAULT_WARMUP,
+        repetitions: int = DEFAULT_REPETITIONS,
+        jobs: int = 1,
+        import_mode: str = "fresh",
+    ):
+        if repetitions < 1:
+            raise ValueError("repetitions must be at least 1")
+        if import_mode not in IMPORT_MODES:
+            raise ValueError(f"unknown import mode: {import_mode}")
         self.project_root = Path(project_root or os.getcwd())
+        self.warmup = max(warmup, 0)
+        self.repetitions = repetitions
+        self.jobs = max(jobs, 1)
+        self.import_mode = import_mode
         self.results: dict[str, Any] = {
             "metadata": {
                 "timestamp": None,
                 "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
                 "platform": sys.platform,
+                "warmup": self.warmup,
+                "repetitions": self.repetitions,
+                "execution": "parallel" if self.jobs > 1 else "serial",
+                "jobs": self.jobs,
+                "import_mode": self.import_mode,
             },
             "benchmarks": {},
         }
@@ -44,70 +451,149 @@ class PerformanceBenchmark:
     # Public API
     # ------------------------------------------------------------------
     def run_all_benchmarks(self) -> dict[str, Any]:
+        return self.run_suites(("cli",))
+
+    def run_micro_benchmarks(
+        self, names: Iterable[str] | None = None, scales: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        return self.run_suites(("micro",), micro_names=names, micro_scales=scales)
+
+    def run_suites(
+        self,
+        suites: Iterable[str],
+        *,
+        micro_names: Iterable[str] | None = None,
+        micro_scales: Iterable[str] | None = None,
+        import_budgets: Path | None = None,
+    ) -> dict[str, Any]:
+        """Run the named suites (``cli``, ``micro``, ``imports``) and print one combined summary."""
+        suites = tuple(suites)
+        unknown = set(suites) - set(SUITES)
+        if unknown:
+            raise ValueError(f"unknown benchmark suite(s): {', '.join(sorted(unknown))}")
         print("🏃 Running RJW-IDD Performance Benchmarks...")
         print("=" * 60)
+        self._start_run(suites)
+        if "cli" in suites:
+            self._run_cli_suite()
+        if "micro" in suites:
+            self._run_micro_suite(micro_names, micro_scales)
+        if "imports" in suites:
+            self._run_import_suite(import_budgets or import_profiler.DEFAULT_BUDGETS)
+        self._print_summary()
+        return self.results
 
+    def _start_run(self, suites: tuple[str, ...]) -> None:
+        self.results["metadata"]["suites"] = list(suites)
         self.results["metadata"]["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if hasattr(os, "sched_getaffinity"):
+            self.results["metadata"]["cpu_affinity"] = sorted(os.sched_getaffinity(0))
+        hints = cpu_pinning_hints()
+        self.results["metadata"]["hints"] = hints
+        for hint in hints:
+            print(f"ℹ️  {hint}")
+        print(f"Warm-up iterations: {self.warmup}; timed repetitions: {self.repetitions}")
 
-        self._benchmark_cli(
-            key="evidence_harvester",
-            title="🔍 Evidence Harvester",
-            command=[sys.executable, "tools/rjw_idd_evidence_harvester.py", "--help"],
-        )
-
-        self._benchmark_cli(
-            key="red_green_guard",
-            title="🛡️ Red-Green Guard",
-            command=[sys.executable, "tools/testing/red_green_guard.py", "--help"],
-        )
-
-        self._benchmark_cli(
-            key="living_docs_guard",
-            title="📚 Living Docs Guard",
-            command=[sys.executable, "tools/testing/living_docs_guard.py", "--help"],
-        )
+    def _run_cli_suite(self) -> None:
+        if self.jobs > 1:
+            print(f"\nRunning CLI and import benchmarks across {self.jobs} workers...")
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                cli = [pool.submit(self._measure_cli, spec) for spec in CLI_BENCHMARKS]
+                imports = self._submit_imports(pool)
+                for spec, future in zip(CLI_BENCHMARKS, cli):
+                    self._report_cli(spec, *future.result())
+                self._report_imports({module: future.result() for module, future in imports.items()})
+        else:
+            for spec in CLI_BENCHMARKS:
+                self._report_cli(spec, *self._measure_cli(spec))
+            self._benchmark_import_times()
+        self._benchmark_file_operations()
 
-        self._benchmark_cli(
-            key="change_log_guard",
-            title="📝 Change Log Guard",
-            command=[sys.executable, "tools/testing/change_log_guard.py", "--help"],
-        )
+    def _run_micro_suite(self, names: Iterable[str] | None, scales: Iterable[str] | None) -> None:
+        print("\n🔬 Microbenchmarks...")
+        selected = microbenchmarks.select(names, scales)
+        curves: dict[str, list[tuple[str, int, float]]] = {}
+        with tempfile.TemporaryDirectory(prefix="rjw-micro-") as tmp:
+            for bench, label, size in selected:
+                record = self._benchmark_micro(bench, label, size, Path(tmp))
+                self.results["benchmarks"][f"micro.{bench.name}.{label}"] = record
+                if record["status"] == "ok":
+                    curves.setdefault(bench.name, []).append((label, size, record["execution_time"]))
 
-        self._benchmark_cli(
-            key="test_suite",
-            title="🧪 Test Suite Discovery",
-            command=[sys.executable, "-m", "pytest", "--collect-only", "tests", "-q"],
-            missing_indicators=("No module named pytest",),
-        )
+        scaling = self.results.setdefault("scaling", {})
+        for name, points in curves.items():
+            exponent = microbenchmarks.scaling_exponent([(size, seconds) for _, size, seconds in points])
+            scaling[name] = {
+                "exponent": exponent,
+                "points": [{"scale": label, "size": size, "median": seconds} for label, size, seconds in points],
+            }
+            if exponent is not None:
+                shape = "linear" if exponent < 1.15 else "super-linear"
+                print(f"  📐 {name}: time grows as n^{exponent:.2f} ({shape})")
 
-        self._benchmark_cli(
-            key="linting",
-            title="🔍 Ruff Lint",
-            command=[sys.executable, "-m", "ruff", "check", "tools/logging_config.py", "--quiet"],
-            missing_indicators=("No module named ruff",),
-            acceptable_return_codes={0, 1},  # ruff returns 1 when it finds issues
+    def _run_import_suite(self, budgets_path: Path) -> None:
+        print("\n🧭 Entry-point import costs (-X importtime)...")
+        budgets = import_profiler.load_budgets(budgets_path)
+        threshold = float(budgets.get("heavy_import_ms", import_profiler.DEFAULT_HEAVY_IMPORT_MS))
+        profiles = import_profiler.profile_entry_points(
+            self.project_root,
+            import_profiler.discover_entry_points(self.project_root),
+            jobs=self.jobs,
+            warmup=self.warmup,
+            repetitions=self.repetitions,
         )
+        violations = import_profiler.check_budgets(profiles, budgets)
+        self.results["import_budget_violations"] = violations
+        for profile in profiles:
+            problems = [message for message in violations if message.startswith(f"{profile.entry}:")]
+            record: dict[str, Any] = {"status": "error" if problems else "ok", "violations": problems}
+            if profile.error:
+                record.update(execution_time=None, error=profile.error)
+                print(f"  ❌ {profile.entry}: {profile.error}")
+            else:
+                stats = summarise_samples([total / 1e6 for total in profile.totals_us])
+                record.update(
+                    execution_time=stats.median,
+                    samples=stats.samples,
+                    stats=stats.to_dict(),
+                    heavy_imports={
+                        cost.module: cost.cumulative_us / 1000 for cost in profile.heavy(threshold)
+                    },
+                    top_self={cost.module: cost.self_us / 1000 for cost in profile.top(5)},
+                )
+                icon = "❌" if problems else "✅"
+                print(f"  {icon} {profile.entry}: {stats.median * 1000:.1f}ms")
+            for message in problems:
+                print(f"     {message.split(': ', 1)[1]}")
+            self.results["benchmarks"][f"importtime.{profile.entry}"] = record
+        if not budgets:
+            print(f"  ℹ️  no budgets in {budgets_path}; run tools/import_profiler.py --update-budgets")
 
-        self._benchmark_cli(
-            key="formatting",
-            title="🎨 Black Format Check",
-            command=[sys.executable, "-m", "black", "--check", "--quiet", "tools/logging_config.py"],
-            missing_indicators=("No module named black",),
-            warning_return_codes={1},
-        )
+    def _benchmark_micro(
+        self, bench: microbenchmarks.MicroBenchmark, label: str, size: int, workdir: Path
+    ) -> dict[str, Any]:
+        record: dict[str, Any] = {"status": "ok", "target": bench.target, "scale": label, "size": size}
+        try:
+            func = bench.prepare(size, workdir)
+            samples = microbenchmarks.measure(func, warmup=self.warmup, repetitions=self.repetitions)
+        except Exception as exc:
+            print(f"  ❌ {bench.name} @ {label}: {exc}")
+            record.update(status="error", execution_time=None, error=str(exc))
+            return record
 
-        self._benchmark_cli(
-            key="type_checking",
-            title="🔍 Mypy Type Check",
-            command=[sys.executable, "-m", "mypy", "tools/logging_config.py", "--ignore-missing-imports"],
-            missing_indicators=("No module named mypy",),
+        stats = summarise_samples(samples)
+        units = bench.units(size)
+        record.update(
+            execution_time=stats.median,
+            samples=stats.samples,
+            stats=stats.to_dict(),
+            ops_per_sec=1.0 / stats.median if stats.median > 0 else None,
+            throughput=units / stats.median if stats.median > 0 else None,
+            throughput_unit=f"{bench.unit}/s",
         )
-
-        self._benchmark_import_times()
-        self._benchmark_file_operations()
-
-        self._print_summary()
-        return self.results
+        rate = f"{record['throughput']:,.1f} {bench.unit}/s" if record["throughput"] else "n/a"
+        print(f"  ✅ {bench.name:18s} {label:>5s}  median {stats.median * 1000:9.2f}ms  {rate}")
+        return record
 
     # ------------------------------------------------------------------
     # Benchmark helpers
@@ -122,23 +608,36 @@ class PerformanceBenchmark:
         acceptable_return_codes: set[int] | None = None,
         warning_return_codes: set[int] | None = None,
     ) -> None:
-        acceptable_return_codes = acceptable_return_codes or {0}
-        warning_return_codes = warning_return_codes or set()
+        spec = CliBenchmark(
+            key,
+            title,
+            tuple(command),
+            tuple(missing_indicators),
+            frozenset(acceptable_return_codes or {0}),
+            frozenset(warning_return_codes or ()),
+        )
+        self._report_cli(spec, *self._measure_cli(spec))
+
+    def _measure_cli(self, spec: CliBenchmark) -> tuple[dict[str, Any], str]:
+        """Time ``spec`` and return its result record plus a one-line verdict.
 
-        print(f"\n{title}...")
+        Safe to call from worker threads: it only spawns processes and
+        touches no shared state.
+        """
+        command = list(spec.command)
         outcome = self._time_subprocess(command)
         status: str
 
-        if outcome.get("error") == "missing-binary" or self._stderr_matches(outcome, missing_indicators):
+        if outcome.get("error") == "missing-binary" or self._stderr_matches(outcome, spec.missing_indicators):
             status = "skipped"
             icon = "⏭️"
         elif outcome.get("error") == "timeout":
             status = "error"
             icon = "❌"
-        elif outcome["return_code"] in acceptable_return_codes:
+        elif outcome["return_code"] in spec.acceptable_return_codes:
             status = "ok"
             icon = "✅"
-        elif outcome["return_code"] in warning_return_codes:
+        elif outcome["return_code"] in spec.warning_return_codes:
             status = "warning"
             icon = "⚠️"
         else:
@@ -146,41 +645,122 @@ class PerformanceBenchmark:
             icon = "❌"
 
         elapsed = outcome.get("time")
-        if elapsed is not None:
-            print(f"  {icon} Completed in {elapsed:.3f}s (rc={outcome['return_code']})")
-        else:
-            print(f"  {icon} {status.upper()} (rc={outcome['return_code']})")
-
-        self.results["benchmarks"][key] = {
+        record: dict[str, Any] = {
             "status": status,
             "execution_time": elapsed,
             "return_code": outcome.get("return_code"),
             "error": outcome.get("error"),
         }
+        if status in ("ok", "warning") and elapsed is not None:
+            stats = summarise_samples(self._repeat(command, outcome))
+            record["execution_time"] = stats.median
+            record["samples"] = stats.samples
+            record["stats"] = stats.to_dict()
+            rejected = f", {len(stats.rejected)} outlier(s) rejected" if stats.rejected else ""
+            line = (
+                f"  {icon} median {stats.median:.3f}s (IQR {stats.iqr:.3f}s, "
+                f"n={len(stats.samples)}{rejected}, rc={outcome['return_code']})"
+            )
+        elif elapsed is not None:
+            line = f"  {icon} Completed in {elapsed:.3f}s (rc={outcome['return_code']})"
+        else:
+            line = f"  {icon} {status.upper()} (rc={outcome['return_code']})"
+        return record, line
+
+    def _report_cli(self, spec: CliBenchmark, record: dict[str, Any], line: str) -> None:
+        print(f"\n{spec.title}...")
+        print(line)
+        self.results["benchmarks"][spec.key] = record
+
+    def _repeat(self, command: list[str], first: dict[str, Any]) -> list[float]:
+        """Collect timed samples for ``command``.
+
+        ``first`` is the run that established the benchmark's status; it
+        counts as the first warm-up iteration, or as the first sample when
+        warm-up is disabled. Repetition stops early if a later run errors.
+        """
+        samples: list[float] = [] if self.warmup else [first["time"]]
+        for _ in range(self.warmup - 1):
+            self._time_subprocess(command)
+        while len(samples) < self.repetitions:
+            outcome = self._time_subprocess(command)
+            if outcome.get("error") or outcome.get("time") is None:
+                break
+            samples.append(outcome["time"])
+        return samples or [first["time"]]
 
     def _benchmark_import_times(self) -> None:
-        print("\n📦 Module Import Times...")
-        modules = [
-            "tools.logging_config",
-            "tools.performance_monitor",
-            "tools.backup_manager",
-        ]
+        if self.import_mode == "in-process":
+            self._report_imports({module: self._import_in_process(module) for module in IMPORT_MODULES})
+        else:
+            self._report_imports({module: self._measure_import(module) for module in IMPORT_MODULES})
+
+    def _submit_imports(self, pool: ThreadPoolExecutor) -> dict[str, Future[list[float] | str]]:
+        if self.import_mode == "in-process":
+            # Imports in this interpreter share sys.modules; keep them on one thread, in order
+            results = {module: self._import_in_process(module) for module in IMPORT_MODULES}
+            return {module: _done(result) for module, result in results.items()}
+        return {module: pool.submit(self._measure_import, module) for module in IMPORT_MODULES}
+
+    def _import_in_process(self, module: str) -> list[float] | str:
+        start_time = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except Exception as exc:  # pragma: no cover - defensive fallback
+            return f"error: {exc}"
+        return [time.perf_counter() - start_time]
+
+    def _measure_import(self, module: str) -> list[float] | str:
+        """Import ``module`` in fresh interpreters so every sample is a cold import."""
+        for _ in range(self.warmup):
+            self._time_import(module)
+        samples = []
+        for _ in range(self.repetitions):
+            outcome = self._time_import(module)
+            if isinstance(outcome, str):
+                return outcome
+            samples.append(outcome)
+        return samples
+
+    def _time_import(self, module: str) -> float | str:
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE, module],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+        except subprocess.TimeoutExpired:
+            return "error: timeout"
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return f"error: {lines[-1] if lines else f'exit {completed.returncode}'}"
+        try:
+            return float(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            return f"error: unexpected probe output {completed.stdout!r}"
+
+    def _report_imports(self, outcomes: dict[str, list[float] | str]) -> None:
+        print(f"\n📦 Module Import Times ({self.import_mode})...")
         import_metrics: dict[str, float | str] = {}
-        for module in modules:
-            start_time = time.perf_counter()
-            try:
-                importlib.import_module(module)
-            except Exception as exc:  # pragma: no cover - defensive fallback
-                import_metrics[module] = f"error: {exc}"  # record the failure detail
-                print(f"  ❌ {module}: {exc}")
-            else:
-                duration = time.perf_counter() - start_time
-                import_metrics[module] = duration
-                print(f"  ✅ {module}: {duration:.3f}s")
+        details: dict[str, Any] = {}
+        for module, outcome in outcomes.items():
+            if isinstance(outcome, str):
+                import_metrics[module] = outcome  # record the failure detail
+                print(f"  ❌ {module}: {outcome}")
+                continue
+            stats = summarise_samples(outcome)
+            import_metrics[module] = stats.median
+            details[module] = stats.to_dict()
+            spread = f" (IQR {stats.iqr:.3f}s, n={len(stats.samples)})" if len(outcome) > 1 else ""
+            print(f"  ✅ {module}: {stats.median:.3f}s{spread}")
 
         self.results["benchmarks"]["import_times"] = {
             "status": "ok",
+            "mode": self.import_mode,
             "modules": import_metrics,
+            "module_stats": details,
         }
 
     def _benchmark_file_operations(self) -> None:
@@ -311,19 +891,175 @@ class PerformanceBenchmark:
             }
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="RJW-IDD Performance Benchmarks")
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    lines = ["", "=" * 60, "📈 BASELINE COMPARISON", "=" * 60]
+    if not comparisons:
+        lines.append("No benchmarks with samples in both runs.")
+        return "\n".join(lines)
+    icons = {"regression": "❌", "improvement": "🚀", "unchanged": "✅"}
+    for item in comparisons:
+        if item.p_value is not None:
+            evidence = f"p={item.p_value:.4f}"
+        else:
+            evidence = f"CI [{item.ci_low:+.1%}, {item.ci_high:+.1%}]"
+        lines.append(
+            f"{icons[item.verdict]} {item.name:20s} {item.baseline_median:.3f}s -> "
+            f"{item.current_median:.3f}s ({item.change:+.1%}, {evidence}) {item.verdict}"
+        )
+    regressions = sum(1 for item in comparisons if item.regressed)
+    lines.append(f"Significant regressions: {regressions}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="RJW-IDD Performance Benchmarks",
+        epilog=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
     parser.add_argument("--project-root", help="Project root directory")
     parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument(
+        "--warmup", type=int, default=DEFAULT_WARMUP, help="Untimed iterations per benchmark (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=DEFAULT_REPETITIONS,
+        help="Timed iterations per benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--suite",
+        choices=(*SUITES, "all"),
+        default="cli",
+        help="Benchmarks to run: CLI start-up, in-process microbenchmarks, entry-point imports, "
+        "or all of them (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--micro",
+        nargs="+",
+        choices=microbenchmarks.MICRO_NAMES,
+        help="Restrict --suite micro to these functions",
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        metavar="LABEL",
+        help="Restrict --suite micro to these input scales (1k, 10k, 100k, 1MB, 10MB)",
+    )
+    parser.add_argument(
+        "--import-budgets",
+        type=Path,
+        help="Budget file for --suite imports (default: tools/import_budgets.yml)",
+    )
+    execution = parser.add_mutually_exclusive_group()
+    execution.add_argument(
+        "--parallel",
+        type=int,
+        nargs="?",
+        const=os.cpu_count() or 2,
+        metavar="JOBS",
+        help="Run independent CLI and import benchmarks concurrently (default JOBS: CPU count)",
+    )
+    execution.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run benchmarks one at a time for the lowest noise (default)",
+    )
+    parser.add_argument(
+        "--import-mode",
+        choices=IMPORT_MODES,
+        default="fresh",
+        help="Time each import in a fresh interpreter or in this process (default: %(default)s)",
+    )
+    parser.add_argument("--pin-cpu", type=int, metavar="N", help="Pin the benchmark run to CPU N")
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Append this run to the benchmark history (see tools/benchmark_history.py report)",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        help="History file used by --record (default: logs/perf/benchmark_history.ndjson)",
+    )
+    parser.add_argument("--baseline", type=Path, help="Compare against results saved with --save-baseline")
+    parser.add_argument("--save-baseline", type=Path, help="Write this run's results as a baseline JSON")
+    parser.add_argument(
+        "--method",
+        choices=("mann-whitney", "bootstrap"),
+        default="mann-whitney",
+        help="Significance test used for baseline comparison (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum relative median slowdown counted as a regression (default: %(default)s)",
+    )
+
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"performance benchmark: cannot read baseline {args.baseline}: {exc}", file=sys.stderr)
+            return 2
+
+    if args.pin_cpu is not None and not pin_cpu(args.pin_cpu):
+        print(f"performance benchmark: could not pin to CPU {args.pin_cpu}", file=sys.stderr)
+
+    jobs = 1 if args.serial or not args.parallel else args.parallel
+    if jobs > 1 and args.pin_cpu is not None:
+        print("performance benchmark: --pin-cpu confines parallel workers to one CPU", file=sys.stderr)
+    benchmark = PerformanceBenchmark(
+        args.project_root,
+        warmup=args.warmup,
+        repetitions=args.repetitions,
+        jobs=jobs,
+        import_mode=args.import_mode,
+    )
+    suites = SUITES if args.suite == "all" else (args.suite,)
+    results = benchmark.run_suites(
+        suites, micro_names=args.micro, micro_scales=args.scales, import_budgets=args.import_budgets
+    )
+
+    exit_code = 1 if results.get("import_budget_violations") else 0
+    if baseline is not None:
+        comparisons = compare_to_baseline(
+            results, baseline, method=args.method, alpha=args.alpha, threshold=args.threshold
+        )
+        results["comparison"] = {
+            "baseline": str(args.baseline),
+            "method": args.method,
+            "alpha": args.alpha,
+            "threshold": args.threshold,
+            "results": [asdict(item) for item in comparisons],
+        }
+        print(format_comparisons(comparisons))
+        if any(item.regressed for item in comparisons):
+            exit_code = 1
+
+    if args.record:
+        from tools.benchmark_history import DEFAULT_HISTORY, HistoryStore, make_entry
 
-    args = parser.parse_args()
+        store = HistoryStore(args.history or DEFAULT_HISTORY)
+        store.append(make_entry(results, benchmark.project_root))
+        print(f"Recorded run in {store.path}")
 
-    benchmark = PerformanceBenchmark(args.project_root)
-    results = benchmark.run_all_benchmarks()
+    if args.save_baseline is not None:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
 
     if args.json:
         print(json.dumps(results, indent=2))
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
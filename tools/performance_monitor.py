@@ -1,13 +1,48 @@
 #!/usr/bin/env python3
-"""Performance monitoring and profiling tools for RJW-IDD."""
+"""Performance monitoring and profiling tools for RJW-IDD.
+
+Besides flat measurements, the monitor carries a span :class:`Tracer`.
+Spans nest per thread (parent/child), are written into a ring buffer of
+``__slots__`` records that grows on demand up to its capacity, cost a single
+attribute check when tracing is disabled, and export to Chrome trace-event
+JSON (``chrome://tracing``, Perfetto, speedscope). Set ``RJW_TRACE=1`` to enable tracing on the global
+monitor.
+
+Durations are also aggregated per operation in :class:`LatencyHistogram`, a
+log-bucketed (HDR-style) histogram with bounded relative error, so
+percentiles come from constant memory however long the process runs.
+Histograms can be snapshotted and reset per window and serialised to merge
+the distributions reported by pooled worker processes.
+
+``measure`` can optionally account for resources, each behind its own flag
+so the overhead is only paid when asked for: ``track_memory`` (tracemalloc
+peak and net allocation), ``track_allocations`` (top allocation sites, via
+tracemalloc snapshots), ``track_cpu`` (user/system CPU from getrusage) and
+``track_rss`` (resident set size delta).
+
+``profile_function(mode="sample")`` swaps deterministic cProfile for a
+:class:`SamplingProfiler`: a background thread samples the profiled
+thread's stack every ``interval`` seconds, so overhead stays low enough for
+production-sized harvests. Stacks are written as folded text (flamegraph.pl,
+inferno) and speedscope JSON, and the sampler's own CPU cost is reported.
+"""
 
 from __future__ import annotations
 
 import cProfile
 import functools
+import itertools
+import json
 import logging
+import math
+import os
 import pstats
+import sys
+import threading
 import time
+import tracemalloc
+from collections import Counter, deque
+from collections.abc import Iterable, Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -15,10 +50,27 @@ from typing import Any, Callable, TypeVar
 
 from tools.logging_config import get_logger
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
 logger = get_logger(__name__)
 
 F = TypeVar('F', bound=Callable[..., Any])
 
+DEFAULT_TRACE_CAPACITY = 65536
+DEFAULT_MAX_METRICS = 10000
+TRACE_ENV = "RJW_TRACE"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+PROFILE_MODES = ("deterministic", "sample")
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Durations at or below this (seconds) land in the zero bucket
+MIN_TRACKABLE = 1e-9
+REPORTED_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+TOP_ALLOCATION_SITES = 10
+_IGNORED_ALLOCATION_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>")
+
 
 @dataclass
 class PerformanceMetrics:
@@ -31,50 +83,747 @@ class PerformanceMetrics:
     memory_usage: int | None = None
     cpu_usage: float | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    memory_net: int | None = None
+    cpu_user: float | None = None
+    cpu_system: float | None = None
+    rss_delta: int | None = None
+    allocation_sites: list[dict[str, Any]] | None = None
 
     def __post_init__(self) -> None:
         self.duration = self.end_time - self.start_time
 
+    def resources(self) -> dict[str, Any]:
+        """The resource fields that were captured for this measurement."""
+        values = {
+            "memory_peak": self.memory_usage,
+            "memory_net": self.memory_net,
+            "cpu_time": self.cpu_usage,
+            "cpu_user": self.cpu_user,
+            "cpu_system": self.cpu_system,
+            "rss_delta": self.rss_delta,
+        }
+        return {key: value for key, value in values.items() if value is not None}
+
+
+def _cpu_times() -> tuple[float, float]:
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime, usage.ru_stime
+    return time.process_time(), 0.0  # pragma: no cover - no user/system split
+
+
+def current_rss() -> int | None:
+    """Resident set size in bytes, or ``None`` where it cannot be read cheaply.
+
+    Reads ``/proc/self/statm`` on Linux. Elsewhere falls back to the
+    ``ru_maxrss`` high-water mark, so deltas there are peak growth.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _ResourceProbe:
+    """Captures the resource counters requested for one ``measure`` block."""
+
+    # Open memory-tracked probes per thread, innermost last. tracemalloc's
+    # peak is process-wide and every probe resets it on start, so the peak
+    # reached so far is first handed to the innermost open probe of each
+    # thread; on exit a probe hands its own peak to the probe enclosing it.
+    _memory_stacks: dict[int, list[_ResourceProbe]] = {}
+    # tracemalloc is started by the first open probe and stopped with the
+    # last one, unless something else was already tracing.
+    _memory_users = 0
+    _owns_tracing = False
+    _memory_lock = threading.Lock()
+
+    def __init__(self, memory: bool, allocations: bool, cpu: bool, rss: bool):
+        self.memory = memory or allocations
+        self.allocations = allocations
+        self.cpu = cpu
+        self.rss = rss
+        self.child_peak = 0
+        self.memory_start = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.cpu_start = (0.0, 0.0)
+        self.rss_start: int | None = None
+
+    def start(self) -> None:
+        if self.memory:
+            cls = _ResourceProbe
+            with cls._memory_lock:
+                if cls._memory_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    cls._owns_tracing = True
+                cls._memory_users += 1
+                if self.allocations:
+                    self.snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                for stack in cls._memory_stacks.values():
+                    stack[-1].child_peak = max(stack[-1].child_peak, peak)
+                self.memory_start = current
+                tracemalloc.reset_peak()
+                cls._memory_stacks.setdefault(threading.get_ident(), []).append(self)
+        if self.rss:
+            self.rss_start = current_rss()
+        if self.cpu:
+            self.cpu_start = _cpu_times()
+
+    def stop(self, metrics: PerformanceMetrics) -> None:
+        if self.cpu:
+            user, system = _cpu_times()
+            metrics.cpu_user = user - self.cpu_start[0]
+            metrics.cpu_system = system - self.cpu_start[1]
+            metrics.cpu_usage = metrics.cpu_user + metrics.cpu_system
+        if self.rss:
+            end = current_rss()
+            if end is not None and self.rss_start is not None:
+                metrics.rss_delta = end - self.rss_start
+        if self.memory:
+            cls = _ResourceProbe
+            with cls._memory_lock:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self.child_peak)
+                metrics.memory_usage = max(0, peak - self.memory_start)
+                metrics.memory_net = current - self.memory_start
+                if self.snapshot is not None:
+                    differences = tracemalloc.take_snapshot().compare_to(self.snapshot, "lineno")
+                    metrics.allocation_sites = _top_sites(differences)
+                ident = threading.get_ident()
+                stack = cls._memory_stacks.get(ident, [])
+                if self in stack:
+                    stack.remove(self)
+                if stack:
+                    stack[-1].child_peak = max(stack[-1].child_peak, peak)
+                else:
+                    cls._memory_stacks.pop(ident, None)
+                cls._memory_users -= 1
+                if cls._memory_users == 0 and cls._owns_tracing:
+                    tracemalloc.stop()
+                    cls._owns_tracing = False
+
+
+def _top_sites(
+    differences: list[tracemalloc.StatisticDiff], limit: int = TOP_ALLOCATION_SITES
+) -> list[dict[str, Any]]:
+    sites: list[dict[str, Any]] = []
+    for diff in differences:
+        frame = diff.traceback[0]
+        if frame.filename in _IGNORED_ALLOCATION_FILES or diff.size_diff <= 0:
+            continue
+        site = f"{frame.filename}:{frame.lineno}"
+        sites.append({"site": site, "size": diff.size_diff, "count": diff.count_diff})
+        if len(sites) >= limit:
+            break
+    return sites
+
+
+class LatencyHistogram:
+    """Mergeable log-bucketed histogram of durations in seconds.
+
+    Bucket ``i`` covers ``(gamma**(i-1), gamma**i]`` with
+    ``gamma = (1 + a) / (1 - a)``, so every reported quantile is within
+    relative error ``a`` of a recorded value. Buckets are sparse; covering
+    1ns to 1h at 1% accuracy needs fewer than 1,500 of them.
+    """
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "buckets", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, count: int = 1) -> None:
+        if value <= MIN_TRACKABLE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _bucket_value(self, index: int) -> float:
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma**index / (gamma + 1)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimated value at quantile ``q`` (0..1); ``None`` when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: LatencyHistogram) -> LatencyHistogram:
+        """Fold ``other`` into this histogram (both must share an accuracy)."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("cannot merge histograms with different relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> LatencyHistogram:
+        return LatencyHistogram(self.relative_accuracy).merge(self)
+
+    def summary(self) -> dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        stats: dict[str, Any] = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+        for label, q in REPORTED_QUANTILES:
+            stats[label] = self.quantile(q)
+        return stats
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe form for shipping a histogram to another process."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "buckets": {str(index): count for index, count in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> LatencyHistogram:
+        histogram = cls(float(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY)))
+        histogram.buckets = {int(index): int(count) for index, count in (data.get("buckets") or {}).items()}
+        histogram.zero_count = int(data.get("zero_count", 0))
+        histogram.count = int(data.get("count", 0))
+        histogram.total = float(data.get("total", 0.0))
+        if histogram.count:
+            histogram.min = float(data["min"])
+            histogram.max = float(data["max"])
+        return histogram
+
+
+def merge_histogram_payloads(
+    payloads: Iterable[Mapping[str, LatencyHistogram | Mapping[str, Any]]],
+) -> dict[str, LatencyHistogram]:
+    """Combine per-operation histograms (objects or ``to_dict`` payloads) from many processes."""
+    merged: dict[str, LatencyHistogram] = {}
+    for payload in payloads:
+        for operation, data in payload.items():
+            histogram = data if isinstance(data, LatencyHistogram) else LatencyHistogram.from_dict(data)
+            if operation in merged:
+                merged[operation].merge(histogram)
+            else:
+                merged[operation] = histogram.copy()
+    return merged
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling one thread's stack from a background thread.
+
+    Samples are aggregated as folded stacks (``outer;inner;leaf`` -> count),
+    rooted at the frame that called :meth:`start` when ``root_frame`` is
+    given. ``overhead`` is the sampler thread's CPU time divided by the wall
+    time of the profiled region.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, max_depth: int = 256):
+        if interval <= 0:
+            raise ValueError("sample interval must be positive")
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter[tuple[tuple[str, str, int], ...]] = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self.sampler_cpu = 0.0
+        self._thread_id = 0
+        self._root: Any = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self, thread_id: int | None = None, root_frame: Any = None) -> None:
+        self._thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._root = root_frame
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="rjw-sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self._started
+        self._root = None
+
+    def __enter__(self) -> SamplingProfiler:
+        self.start(root_frame=sys._getframe(1))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        cpu_start = time.thread_time()
+        while not self._stop.wait(self.interval):
+            self._sample()
+        self.sampler_cpu = time.thread_time() - cpu_start
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        stack: list[tuple[str, str, int]] = []
+        while frame is not None and len(stack) < self.max_depth:
+            if frame is self._root:
+                break
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+            frame = frame.f_back
+        del frame
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    @property
+    def overhead(self) -> float:
+        return self.sampler_cpu / self.duration if self.duration else 0.0
+
+    @staticmethod
+    def _frame_name(frame: tuple[str, str, int]) -> str:
+        filename, name, line = frame
+        return f"{name} ({filename}:{line})".replace(";", ":")
+
+    def folded(self) -> str:
+        """Folded stacks, one ``frame;frame;frame count`` line per unique stack."""
+        lines = [
+            f"{';'.join(self._frame_name(frame) for frame in stack)} {count}"
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "profile") -> dict[str, Any]:
+        """Speedscope "sampled" profile; weights are seconds per unique stack."""
+        frames: list[dict[str, Any]] = []
+        index: dict[tuple[str, str, int], int] = {}
+        samples: list[list[int]] = []
+        weights: list[float] = []
+        per_sample = self.duration / self.samples if self.samples else self.interval
+        for stack, count in self.stacks.items():
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[1], "file": frame[0], "line": frame[2]})
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(count * per_sample)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "rjw-idd performance_monitor",
+        }
+
+    def top_functions(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Functions ranked by inclusive samples, with self samples alongside."""
+        inclusive: Counter[tuple[str, str, int]] = Counter()
+        exclusive: Counter[tuple[str, str, int]] = Counter()
+        for stack, count in self.stacks.items():
+            for frame in set(stack):
+                inclusive[frame] += count
+            exclusive[stack[-1]] += count
+        return [
+            {
+                "function": self._frame_name(frame),
+                "inclusive": count,
+                "self": exclusive.get(frame, 0),
+                "inclusive_pct": 100.0 * count / self.samples if self.samples else 0.0,
+            }
+            for frame, count in inclusive.most_common(limit)
+        ]
+
+    def write(self, output_file: Path, name: str = "profile") -> tuple[Path, Path]:
+        """Write ``<output>.folded`` and ``<output>.speedscope.json``."""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        folded_path = output_file.with_name(f"{output_file.name}.folded")
+        speedscope_path = output_file.with_name(f"{output_file.name}.speedscope.json")
+        folded_path.write_text(self.folded(), encoding="utf-8")
+        with speedscope_path.open("w", encoding="utf-8") as handle:
+            json.dump(self.to_speedscope(name), handle)
+        return folded_path, speedscope_path
+
+    def format_summary(self, limit: int = 20) -> str:
+        lines = [
+            f"{self.samples} samples over {self.duration:.3f}s "
+            f"(interval {self.interval * 1000:.1f}ms, sampler overhead {self.overhead * 100:.2f}%)",
+            f"{'incl%':>7} {'incl':>7} {'self':>7}  function",
+        ]
+        for entry in self.top_functions(limit):
+            lines.append(
+                f"{entry['inclusive_pct']:6.1f}% {entry['inclusive']:7d} {entry['self']:7d}  {entry['function']}"
+            )
+        return "\n".join(lines)
+
+
+class SpanRecord:
+    """A finished span, stored in the tracer's ring buffer and reused on wrap."""
+
+    __slots__ = ("name", "span_id", "parent_id", "thread_id", "start_ns", "end_ns", "args")
+
+    def __init__(self) -> None:
+        self.name = ""
+        self.span_id = 0
+        self.parent_id = 0
+        self.thread_id = 0
+        self.start_ns = 0
+        self.end_ns = 0
+        self.args: dict[str, Any] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread_id": self.thread_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "args": dict(self.args or {}),
+        }
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """An open span; its record is only written to the ring buffer on exit."""
+
+    __slots__ = ("tracer", "name", "args", "span_id", "parent_id", "start_ns")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.span_id = 0
+        self.parent_id = 0
+        self.start_ns = 0
+
+    def set(self, **args: Any) -> None:
+        """Attach extra arguments (e.g. result sizes) before the span closes."""
+        self.args.update(args)
+
+    def __enter__(self) -> _Span:
+        stack = self.tracer._stack()
+        self.parent_id = stack[-1] if stack else 0
+        self.span_id = next(self.tracer._ids)
+        stack.append(self.span_id)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        end_ns = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        if stack and stack[-1] == self.span_id:
+            stack.pop()
+        self.tracer._record(self, end_ns)
+
+
+class Tracer:
+    """Hierarchical span tracer backed by a fixed-size ring buffer.
+
+    The buffer grows on demand, so a disabled or idle tracer costs nothing.
+    When it wraps the oldest spans are overwritten and counted in
+    ``dropped``; memory use never grows past ``capacity`` records.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_CAPACITY, enabled: bool = True):
+        if capacity <= 0:
+            raise ValueError("trace capacity must be positive")
+        self.capacity = capacity
+        self.enabled = enabled
+        self._buffer: list[SpanRecord] = []
+        self._slots = itertools.count()
+        self._ids = itertools.count(1)
+        self._written = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, **args: Any) -> _Span | _NoopSpan:
+        """Open a span: ``with tracer.span("guard", name=...)``."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return _Span(self, name, args)
+
+    def _stack(self) -> list[int]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: _Span, end_ns: int) -> None:
+        with self._lock:
+            slot = next(self._slots) % self.capacity
+            if slot == len(self._buffer):
+                self._buffer.append(SpanRecord())
+            record = self._buffer[slot]
+            record.name = span.name
+            record.span_id = span.span_id
+            record.parent_id = span.parent_id
+            record.thread_id = threading.get_ident()
+            record.start_ns = span.start_ns
+            record.end_ns = end_ns
+            record.args = span.args or None
+            self._written += 1
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self._written - self.capacity)
+
+    def spans(self) -> list[SpanRecord]:
+        """Recorded spans, oldest first."""
+        with self._lock:
+            count = min(self._written, self.capacity)
+            start = self._written - count
+            return [self._buffer[index % self.capacity] for index in range(start, self._written)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._written = 0
+            self._slots = itertools.count()
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Chrome trace-event JSON ("X" complete events, microsecond timestamps)."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for record in sorted(self.spans(), key=lambda item: item.start_ns):
+            args = dict(record.args or {})
+            args["span_id"] = record.span_id
+            if record.parent_id:
+                args["parent_id"] = record.parent_id
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": "rjw_idd",
+                    "ph": "X",
+                    "ts": (record.start_ns - self._origin_ns) / 1000,
+                    "dur": (record.end_ns - record.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": record.thread_id,
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_spans": self.dropped, "capacity": self.capacity},
+        }
+
+    def export_chrome_trace(self, output_path: Path) -> Path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as handle:
+            json.dump(self.to_chrome_trace(), handle, default=str)
+        return output_path
+
 
 class PerformanceMonitor:
     """Monitor and profile code performance."""
 
-    def __init__(self, log_level: str = "INFO"):
+    def __init__(
+        self,
+        log_level: str = "INFO",
+        max_metrics: int | None = DEFAULT_MAX_METRICS,
+        trace: bool = False,
+        trace_capacity: int = DEFAULT_TRACE_CAPACITY,
+        track_memory: bool = False,
+        track_allocations: bool = False,
+        track_cpu: bool = False,
+        track_rss: bool = False,
+    ):
         self.logger = logging.getLogger(f"{__name__}.monitor")
         self.logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-        self.metrics: list[PerformanceMetrics] = []
+        # Most recent measurements only; long-lived processes must not grow without bound
+        self.metrics: deque[PerformanceMetrics] = deque(maxlen=max_metrics)
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.tracer = Tracer(trace_capacity, enabled=trace)
+        # Monitor-wide defaults for the per-call track_* flags of measure()
+        self.track_memory = track_memory
+        self.track_allocations = track_allocations
+        self.track_cpu = track_cpu
+        self.track_rss = track_rss
+        self._lock = threading.Lock()
 
     @contextmanager
-    def measure(self, operation: str, **metadata: Any):
-        """Context manager to measure operation performance."""
-        start_time = time.perf_counter()
+    def measure(
+        self,
+        operation: str,
+        *,
+        track_memory: bool | None = None,
+        track_allocations: bool | None = None,
+        track_cpu: bool | None = None,
+        track_rss: bool | None = None,
+        **metadata: Any,
+    ):
+        """Context manager to measure operation performance.
 
-        try:
-            yield
-        finally:
-            end_time = time.perf_counter()
+        The ``track_*`` flags override the monitor defaults for this block.
+        """
+        probe: _ResourceProbe | None = None
+        memory = self.track_memory if track_memory is None else track_memory
+        allocations = self.track_allocations if track_allocations is None else track_allocations
+        cpu = self.track_cpu if track_cpu is None else track_cpu
+        rss = self.track_rss if track_rss is None else track_rss
+        if memory or allocations or cpu or rss:
+            probe = _ResourceProbe(memory, allocations, cpu, rss)
 
-            metrics = PerformanceMetrics(
-                operation=operation,
-                start_time=start_time,
-                end_time=end_time,
-                metadata=metadata
-            )
+        with self.tracer.span(operation, **metadata) as span:
+            if probe is not None:
+                probe.start()
+            start_time = time.perf_counter()
+            try:
+                yield
+            finally:
+                end_time = time.perf_counter()
 
-            self.metrics.append(metrics)
-            self.logger.info(
-                f"Performance: {operation} took {metrics.duration:.4f}s"
-            )
+                metrics = PerformanceMetrics(
+                    operation=operation,
+                    start_time=start_time,
+                    end_time=end_time,
+                    metadata=metadata
+                )
+                if probe is not None:
+                    probe.stop(metrics)
+                    span.set(**metrics.resources())
+
+                self.metrics.append(metrics)
+                self._record_histogram(operation, metrics.duration)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Performance: %s took %.4fs", operation, metrics.duration)
+
+    def _record_histogram(self, operation: str, duration: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.record(duration)
+
+    def snapshot(self, reset: bool = False) -> dict[str, LatencyHistogram]:
+        """Copy the per-operation histograms; ``reset=True`` starts a new window."""
+        with self._lock:
+            if reset:
+                current, self.histograms = self.histograms, {}
+                return current
+            return {operation: histogram.copy() for operation, histogram in self.histograms.items()}
+
+    def export_histograms(self, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Serialisable histograms, e.g. for returning from a pool worker."""
+        return {operation: histogram.to_dict() for operation, histogram in self.snapshot(reset).items()}
+
+    def merge_histograms(self, payload: Mapping[str, LatencyHistogram | Mapping[str, Any]]) -> None:
+        """Fold histograms from another monitor or process into this one."""
+        merged = merge_histogram_payloads([payload])
+        with self._lock:
+            for operation, histogram in merged.items():
+                if operation in self.histograms:
+                    self.histograms[operation].merge(histogram)
+                else:
+                    self.histograms[operation] = histogram
+
+    def reset(self) -> None:
+        """Drop measurements, histograms and recorded spans."""
+        with self._lock:
+            self.metrics.clear()
+            self.histograms = {}
+        self.tracer.clear()
+
+    def span(self, name: str, **args: Any) -> Any:
+        """Open a trace span without recording a flat measurement."""
+        return self.tracer.span(name, **args)
+
+    def export_trace(self, output_path: Path) -> Path:
+        """Write recorded spans as Chrome trace-event JSON."""
+        path = self.tracer.export_chrome_trace(output_path)
+        self.logger.info("Trace saved to %s", path)
+        return path
 
     def profile_function(
         self,
         output_file: Path | None = None,
-        sort_by: str = 'cumulative'
+        sort_by: str = 'cumulative',
+        mode: str = 'deterministic',
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
     ) -> Callable[[F], F]:
-        """Decorator to profile function performance."""
+        """Decorator to profile function performance.
+
+        ``mode='sample'`` uses :class:`SamplingProfiler` at ``interval``
+        seconds; ``output_file`` then receives ``.folded`` and
+        ``.speedscope.json`` siblings instead of cProfile stats.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+
         def decorator(func: F) -> F:
             @functools.wraps(func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if mode == 'sample':
+                    return self._sample_call(func, args, kwargs, output_file, interval)
+
                 profiler = cProfile.Profile()
                 profiler.enable()
 
@@ -95,38 +844,116 @@ class PerformanceMonitor:
             return wrapper  # type: ignore
         return decorator
 
-    def get_summary_stats(self) -> dict[str, Any]:
-        """Get summary statistics of all measurements."""
-        if not self.metrics:
+    def _sample_call(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        output_file: Path | None,
+        interval: float,
+    ) -> Any:
+        sampler = SamplingProfiler(interval)
+        # Root stacks at this frame so callers of the decorated function are not sampled
+        sampler.start(root_frame=sys._getframe())
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            name = getattr(func, "__qualname__", "profile")
+            if output_file:
+                folded_path, speedscope_path = sampler.write(output_file, name)
+                self.logger.info(
+                    "Sampling profile saved to %s and %s (%d samples, overhead %.2f%%)",
+                    folded_path,
+                    speedscope_path,
+                    sampler.samples,
+                    sampler.overhead * 100,
+                )
+            else:
+                print(sampler.format_summary())
+
+    def get_summary_stats(self, include_measurements: bool = False) -> dict[str, Any]:
+        """Get summary statistics of all measurements.
+
+        Totals and per-operation percentiles come from the histograms, so they
+        cover every measurement even after old ones leave ``self.metrics``.
+        ``include_measurements`` adds the retained raw measurements.
+        """
+        histograms = self.snapshot()
+        if not histograms:
             return {}
 
-        durations = [m.duration for m in self.metrics]
-        operations = list({m.operation for m in self.metrics})
+        overall = LatencyHistogram()
+        for histogram in histograms.values():
+            overall.merge(histogram)
 
-        return {
-            "total_measurements": len(self.metrics),
-            "unique_operations": len(operations),
-            "total_time": sum(durations),
-            "average_time": sum(durations) / len(durations),
-            "min_time": min(durations),
-            "max_time": max(durations),
-            "operations": operations,
-            "measurements": [
+        stats: dict[str, Any] = {
+            "total_measurements": overall.count,
+            "unique_operations": len(histograms),
+            "total_time": overall.total,
+            "average_time": overall.total / overall.count,
+            "min_time": overall.min,
+            "max_time": overall.max,
+            "operations": sorted(histograms),
+            "per_operation": {
+                operation: histogram.summary() for operation, histogram in sorted(histograms.items())
+            },
+        }
+        resources = self._resource_summary()
+        for operation, values in resources.items():
+            if operation in stats["per_operation"]:
+                stats["per_operation"][operation]["resources"] = values
+        if include_measurements:
+            stats["measurements"] = [
                 {
                     "operation": m.operation,
                     "duration": m.duration,
-                    "metadata": m.metadata
+                    "metadata": m.metadata,
+                    **m.resources(),
                 }
                 for m in self.metrics
             ]
-        }
+        return stats
+
+    def _resource_summary(self) -> dict[str, dict[str, Any]]:
+        """Peak/total resource use per operation over the retained measurements."""
+        summary: dict[str, dict[str, Any]] = {}
+        for metric in list(self.metrics):
+            captured = metric.resources()
+            if not captured:
+                continue
+            entry = summary.setdefault(metric.operation, {"samples": 0})
+            entry["samples"] += 1
+            for key, value in captured.items():
+                if key.startswith("cpu_"):
+                    entry[f"{key}_total"] = entry.get(f"{key}_total", 0.0) + value
+                else:
+                    entry[f"{key}_max"] = max(entry.get(f"{key}_max", value), value)
+        return summary
+
+    def top_allocation_sites(self, limit: int = TOP_ALLOCATION_SITES) -> list[dict[str, Any]]:
+        """Allocation sites with the largest net growth across retained measurements."""
+        totals: dict[str, dict[str, Any]] = {}
+        for metric in list(self.metrics):
+            for site in metric.allocation_sites or ():
+                entry = totals.setdefault(
+                    site["site"], {"site": site["site"], "size": 0, "count": 0, "operations": set()}
+                )
+                entry["size"] += site["size"]
+                entry["count"] += site["count"]
+                entry["operations"].add(metric.operation)
+        ranked = sorted(totals.values(), key=lambda entry: entry["size"], reverse=True)[:limit]
+        return [{**entry, "operations": sorted(entry["operations"])} for entry in ranked]
 
     def save_report(self, output_path: Path) -> None:
         """Save performance report to file."""
-        import json
-
         stats = self.get_summary_stats()
         stats["timestamp"] = time.time()
+        # Raw histograms let reports from several processes be merged later
+        stats["histograms"] = self.export_histograms()
+        sites = self.top_allocation_sites()
+        if sites:
+            stats["top_allocation_sites"] = sites
 
         with output_path.open('w') as f:
             json.dump(stats, f, indent=2, default=str)
@@ -135,24 +962,59 @@ class PerformanceMonitor:
 
 
 # Global monitor instance
-monitor = PerformanceMonitor()
+monitor = PerformanceMonitor(trace=os.environ.get(TRACE_ENV, "") not in ("", "0"))
 
 
-def measure_performance(operation: str, **metadata: Any) -> Callable[[F], F]:
-    """Decorator to measure function performance."""
+def trace_span(name: str, **args: Any) -> Any:
+    """Open a span on the global monitor's tracer (no-op unless tracing is on)."""
+    return monitor.tracer.span(name, **args)
+
+
+def measure_performance(
+    operation: str,
+    *,
+    track_memory: bool | None = None,
+    track_allocations: bool | None = None,
+    track_cpu: bool | None = None,
+    track_rss: bool | None = None,
+    **metadata: Any,
+) -> Callable[[F], F]:
+    """Decorator to measure function performance (``track_*`` as for ``measure``)."""
+    flags = {
+        "track_memory": track_memory,
+        "track_allocations": track_allocations,
+        "track_cpu": track_cpu,
+        "track_rss": track_rss,
+    }
+
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with monitor.measure(operation, **metadata):
+            with monitor.measure(operation, **flags, **metadata):
                 return func(*args, **kwargs)
         return wrapper  # type: ignore
     return decorator
 
 
 @contextmanager
-def benchmark(operation: str, **metadata: Any):
-    """Context manager for benchmarking code blocks."""
-    with monitor.measure(operation, **metadata):
+def benchmark(
+    operation: str,
+    *,
+    track_memory: bool | None = None,
+    track_allocations: bool | None = None,
+    track_cpu: bool | None = None,
+    track_rss: bool | None = None,
+    **metadata: Any,
+):
+    """Context manager for benchmarking code blocks (``track_*`` as for ``measure``)."""
+    with monitor.measure(
+        operation,
+        track_memory=track_memory,
+        track_allocations=track_allocations,
+        track_cpu=track_cpu,
+        track_rss=track_rss,
+        **metadata,
+    ):
         yield
 
 
@@ -167,11 +1029,11 @@ def run_performance_test(
         func()
 
     # Actual test
-    monitor.metrics.clear()
+    monitor.reset()
     start_time = time.perf_counter()
 
     for i in range(iterations):
-        with monitor.measure(f"iteration_{i}"):
+        with monitor.measure("iteration", index=i):
             func()
 
     end_time = time.perf_counter()
@@ -17,7 +17,7 @@ import time
 from pathlib import Path
 from typing import Any, Optional
 
-import yaml
+from tools.config_loader import load_config
 
 # Validation rules
 FORBIDDEN_CAPABILITIES = [
@@ -59,7 +59,7 @@ def _detect_ruleset(requested: Optional[str]) -> str:
         return 'default'
 
     try:
-        config = yaml.safe_load(features_file.read_text()) or {}
+        config = load_config(features_file) or {}
     except Exception:
         return 'default'
 
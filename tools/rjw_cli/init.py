@@ -11,7 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
+from tools.config_loader import dump_yaml
 
 PRESETS = {
     # Backwards-compatible alias
@@ -272,7 +272,7 @@ def write_configs(project_dir: Path, project_name: str, features: list[str], mod
     }
 
     with open(features_yml, 'w') as f:
-        yaml.dump(features_config, f, default_flow_style=False, sort_keys=False)
+        dump_yaml(features_config, f)
 
     print(f"✔ Created {features_yml}")
 
@@ -18,7 +18,13 @@ import urllib.parse
 import urllib.request
 from collections.abc import Iterable
 from dataclasses import asdict, dataclass
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+if TYPE_CHECKING:
+    from tools.performance_monitor import Tracer
 
 USER_AGENT = "RJW-IDD-EvidenceHarvester/1.0 (+https://example.invalid/rjw-idd)"
 DEFAULT_RECENCY_DAYS = 28
@@ -27,6 +33,24 @@ PLATFORM_CHOICES = {"hn", "reddit", "github", "so"}
 STANCE_CHOICES = {"pain", "fix", "aha", "win", "risk", "contra"}
 
 
+class _NoopSpan:
+    """Span stand-in while ``--trace`` is off, so tools.performance_monitor is only imported on demand."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **fields: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
 def http_get(url: str, headers: dict[str, str] | None = None, retries: int = 2, backoff: float = 1.5) -> Any:
     request = urllib.request.Request(url, headers=headers or {"User-Agent": USER_AGENT})
     attempt = 0
@@ -309,8 +333,18 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--start-id", type=int, default=1, help="Starting numeric suffix for EVD IDs.")
     parser.add_argument("--recency-days", type=int, default=DEFAULT_RECENCY_DAYS)
     parser.add_argument("--max-records", type=int, default=500, help="Upper bound to prevent runaway collection.")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace-event JSON of the harvest to this path.")
     args = parser.parse_args(argv)
 
+    tracer: Tracer | None = None
+    if args.trace:
+        from tools.performance_monitor import Tracer
+
+        tracer = Tracer()
+
+    def span(name: str, **fields: Any) -> Any:
+        return tracer.span(name, **fields) if tracer is not None else _NOOP_SPAN
+
     tasks = load_tasks(args.config)
     now_utc = dt.datetime.now(dt.timezone.utc)
     cutoff = (now_utc - dt.timedelta(days=args.recency_days)).replace(tzinfo=None)
@@ -320,14 +354,17 @@ def main(argv: list[str] | None = None) -> int:
 
     for task in tasks:
         fetcher = FETCHERS[task.source]
-        for record in fetcher(task, cutoff):
-            if counter > 9999:
-                raise ValueError("EVD counter exceeded 4 digits")
-            if len(records) >= args.max_records:
-                break
-            record.evid_id = f"EVD-{counter:04d}"
-            records.append(record)
-            counter += 1
+        with span(f"fetch:{task.source}", query=task.query) as task_span:
+            before = len(records)
+            for record in fetcher(task, cutoff):
+                if counter > 9999:
+                    raise ValueError("EVD counter exceeded 4 digits")
+                if len(records) >= args.max_records:
+                    break
+                record.evid_id = f"EVD-{counter:04d}"
+                records.append(record)
+                counter += 1
+            task_span.set(records=len(records) - before)
         if len(records) >= args.max_records:
             break
 
@@ -345,9 +382,13 @@ def main(argv: list[str] | None = None) -> int:
         "records": [rec.to_dict() for rec in sorted_records],
     }
 
-    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
-    with open(args.output, "w", encoding="utf-8") as fh:
-        json.dump(output_payload, fh, indent=2, ensure_ascii=False)
+    with span("write", records=len(sorted_records)):
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(output_payload, fh, indent=2, ensure_ascii=False)
+
+    if tracer is not None:
+        tracer.export_chrome_trace(args.trace)
 
     print(f"Wrote {len(sorted_records)} evidence records to {args.output}")
     return 0
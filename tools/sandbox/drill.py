@@ -2,7 +2,9 @@
 
 Writes JSON artefacts under `logs/security/` capturing the simulated drill,
 including optional execution of `scripts/sandbox/reset.sh` when `--run-reset`
-(or API equivalent) is used.
+(or API equivalent) is used. Reset output is streamed to stderr and to a
+timestamped, size-capped `sandbox_drill_<timestamp>.reset.log`; the JSON
+artefact keeps byte counts and a head/tail excerpt of each stream.
 """
 
 from __future__ import annotations
@@ -10,10 +12,15 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import subprocess
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+if str(Path(__file__).resolve().parents[2]) not in sys.path:
+    sys.path.insert(1, str(Path(__file__).resolve().parents[2]))
+
+from tools.subprocess_runner import run_streaming  # noqa: E402
+
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 _DEFAULT_LOG_DIR = Path("logs/security")
 _DEFAULT_RESET_SCRIPT = _REPO_ROOT / "scripts" / "sandbox" / "reset.sh"
@@ -68,20 +75,28 @@ def execute(args: argparse.Namespace) -> dict[str, object]:
 
     if args.run_reset:
         env = _build_env(args)
-        result = subprocess.run(
+        reset_log = log_dir / f"sandbox_drill_{timestamp}.reset.log"
+        # stdout carries the JSON summary, so mirror the reset output to stderr
+        result = run_streaming(
             [str(args.reset_script)],
             cwd=repo_root,
             env=env,
-            capture_output=True,
-            text=True,
-            check=False,
+            log_path=reset_log,
+            header=(f"# {args.reset_script} @ {timestamp}",),
+            echo=sys.stderr,
         )
+        try:
+            reset_artefact = reset_log.relative_to(repo_root)
+        except ValueError:
+            reset_artefact = reset_log
         record["reset"] = {
             "executed": True,
             "script": str(args.reset_script),
             "returncode": result.returncode,
-            "stdout": result.stdout.splitlines(),
-            "stderr": result.stderr.splitlines(),
+            "stdout": result.stdout.excerpt(),
+            "stderr": result.stderr.excerpt(),
+            "log": str(reset_artefact),
+            **result.summary(),
         }
         record["status"] = "passed" if result.returncode == 0 else "failed"
 
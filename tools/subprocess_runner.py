@@ -0,0 +1,246 @@
+"""Run subprocesses with streamed, size-capped output capture.
+
+Shared by the CI entrypoint and the sandbox drill. Output is read line by
+line while the child runs: each line is echoed to the console, written to
+the log with a UTC timestamp and stream tag, and counted. The log keeps the
+first ``head_bytes`` and the last ``tail_bytes`` of output and replaces the
+middle with a single omission marker, so a runaway test run cannot fill the
+disk or memory. Callers that embed output in JSON get a bounded head/tail
+excerpt per stream instead of the full text.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, TextIO
+
+DEFAULT_HEAD_BYTES = 4 * 1024 * 1024
+DEFAULT_TAIL_BYTES = 4 * 1024 * 1024
+DEFAULT_KEEP_LINES = 200
+READ_LIMIT = 64 * 1024
+
+_CONSOLE_LOCK = threading.Lock()
+
+
+def _stamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+@dataclass
+class StreamStats:
+    """Byte/line counts for one stream plus a bounded head/tail excerpt."""
+
+    name: str
+    keep_lines: int = DEFAULT_KEEP_LINES
+    bytes: int = 0
+    lines: int = 0
+    head: list[str] = field(default_factory=list)
+    tail: deque[str] = field(default_factory=deque)
+
+    def add(self, raw: bytes, text: str) -> None:
+        self.bytes += len(raw)
+        self.lines += 1
+        if len(self.head) < self.keep_lines:
+            self.head.append(text)
+            return
+        self.tail.append(text)
+        if len(self.tail) > self.keep_lines:
+            self.tail.popleft()
+
+    def excerpt(self) -> list[str]:
+        """Kept lines, with a marker where lines were dropped."""
+        omitted = self.lines - len(self.head) - len(self.tail)
+        if omitted <= 0:
+            return [*self.head, *self.tail]
+        return [*self.head, f"... {omitted} line(s) omitted ...", *self.tail]
+
+
+class _CappedLog:
+    """Timestamped log file holding at most head_bytes + tail_bytes of output."""
+
+    def __init__(self, path: Path, head_bytes: int, tail_bytes: int, header: Iterable[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.written = 0
+        self.head_full = False
+        self.tail: deque[tuple[str, int]] = deque()
+        self.tail_size = 0
+        self.omitted_lines = 0
+        self.omitted_bytes = 0
+        self._lock = threading.Lock()
+        self._handle = path.open("w", encoding="utf-8")
+        for line in header:
+            self._handle.write(f"{line}\n")
+        self._handle.write("\n")
+
+    def write(self, stream: str, text: str) -> None:
+        entry = f"{_stamp()} {stream} | {text}\n"
+        size = len(entry.encode("utf-8"))
+        with self._lock:
+            if not self.head_full and self.written + size <= self.head_bytes:
+                self._handle.write(entry)
+                self.written += size
+                return
+            self.head_full = True
+            self.tail.append((entry, size))
+            self.tail_size += size
+            while self.tail_size > self.tail_bytes and self.tail:
+                _, dropped = self.tail.popleft()
+                self.tail_size -= dropped
+                self.omitted_lines += 1
+                self.omitted_bytes += dropped
+
+    def close(self) -> None:
+        with self._lock:
+            if self.omitted_lines:
+                self._handle.write(
+                    f"# ... {self.omitted_lines} line(s) / {self.omitted_bytes} byte(s) omitted ...\n"
+                )
+            for entry, _ in self.tail:
+                self._handle.write(entry)
+            self.tail.clear()
+            self._handle.close()
+
+
+@dataclass
+class RunResult:
+    returncode: int
+    duration: float
+    stdout: StreamStats
+    stderr: StreamStats
+    log_path: Path | None = None
+    omitted_lines: int = 0
+    omitted_bytes: int = 0
+    timed_out: bool = False
+
+    def summary(self) -> dict[str, object]:
+        """Byte/line counts suitable for CI summaries and drill artefacts."""
+        return {
+            "stdout_bytes": self.stdout.bytes,
+            "stderr_bytes": self.stderr.bytes,
+            "stdout_lines": self.stdout.lines,
+            "stderr_lines": self.stderr.lines,
+            "log_omitted_bytes": self.omitted_bytes,
+            "timed_out": self.timed_out,
+        }
+
+
+def _pump(
+    pipe: IO[bytes],
+    stats: StreamStats,
+    log: _CappedLog | None,
+    echo: TextIO | None,
+    echo_prefix: str,
+) -> None:
+    with pipe:
+        for raw in iter(lambda: pipe.readline(READ_LIMIT), b""):
+            text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            stats.add(raw, text)
+            if log is not None:
+                log.write(stats.name, text)
+            if echo is not None:
+                with _CONSOLE_LOCK:
+                    echo.write(f"{echo_prefix}{text}\n")
+                    echo.flush()
+
+
+def run_streaming(
+    command: list[str],
+    *,
+    cwd: Path | None = None,
+    env: Mapping[str, str] | None = None,
+    log_path: Path | None = None,
+    header: Iterable[str] = (),
+    echo: bool | TextIO = True,
+    echo_prefix: str = "",
+    head_bytes: int = DEFAULT_HEAD_BYTES,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+    keep_lines: int = DEFAULT_KEEP_LINES,
+    timeout: float | None = None,
+) -> RunResult:
+    """Run ``command``, teeing its output to ``log_path`` and the console.
+
+    ``echo=True`` mirrors stdout/stderr to ``sys.stdout``/``sys.stderr``; pass
+    a stream to send both there, or ``False`` to stay quiet. The child is
+    killed when ``timeout`` expires. Raises ``OSError`` if it cannot start.
+    """
+    if echo is True:
+        echo_out: TextIO | None = sys.stdout
+        echo_err: TextIO | None = sys.stderr
+    elif echo is False:
+        echo_out = echo_err = None
+    else:
+        echo_out = echo_err = echo
+
+    stdout = StreamStats("stdout", keep_lines)
+    stderr = StreamStats("stderr", keep_lines)
+    log = _CappedLog(log_path, head_bytes, tail_bytes, header) if log_path is not None else None
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        proc = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=dict(env) if env is not None else None,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        readers = [
+            threading.Thread(target=_pump, args=(proc.stdout, stdout, log, echo_out, echo_prefix), daemon=True),
+            threading.Thread(target=_pump, args=(proc.stderr, stderr, log, echo_err, echo_prefix), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            proc.kill()
+            returncode = proc.wait()
+        for reader in readers:
+            reader.join()
+    finally:
+        if log is not None:
+            log.close()
+
+    return RunResult(
+        returncode=returncode,
+        duration=time.perf_counter() - start,
+        stdout=stdout,
+        stderr=stderr,
+        log_path=log_path,
+        omitted_lines=log.omitted_lines if log is not None else 0,
+        omitted_bytes=log.omitted_bytes if log is not None else 0,
+        timed_out=timed_out,
+    )
+
+
+def rotate_logs(directory: Path, pattern: str, keep: int) -> list[Path]:
+    """Delete all but the newest ``keep`` files matching ``pattern``.
+
+    Log names embed a sortable UTC timestamp, so name order is age order.
+    Returns the removed paths.
+    """
+    if keep <= 0:
+        return []
+    matches = sorted(directory.glob(pattern))
+    removed: list[Path] = []
+    for path in matches[:-keep]:
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        removed.append(path)
+    return removed
@@ -23,9 +23,14 @@ from __future__ import annotations
 import argparse
 import re
 import sys
-from collections.abc import Iterable
 from pathlib import Path
 
+# changed_files sits next to this script; keep it importable under `python -m tools.testing...` too.
+if str(Path(__file__).resolve().parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import ChangedFilesIndex, normalise  # noqa: E402, F401 - re-exported
+
 NOVICE_RE = re.compile(r"(?im)^\s*(?:#+\s*)?(Novice Summary|Novice:)\b")
 TECH_RE = re.compile(r"(?im)^\s*(?:#+\s*)?(Technical Specification|Technical Spec|Technical:)\b")
 
@@ -61,18 +66,6 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def normalise(paths: Iterable[str]) -> list[str]:
-    normalised: list[str] = []
-    for raw in paths or []:
-        if raw is None:
-            continue
-        p = raw.strip()
-        if not p:
-            continue
-        normalised.append(p.replace("\\", "/"))
-    return normalised
-
-
 def read_text(path: Path) -> str:
     try:
         return path.read_text(encoding="utf-8")
@@ -148,18 +141,16 @@ def validate_file(path: Path) -> list[str]:
     return errors
 
 
-def main() -> int:
-    args = parse_args()
-    files = normalise(args.files or [])
-    if not files:
-        print("agent-response guard: no files provided; nothing to check.", file=sys.stderr)
-        return 0
+def run_checks(root: Path, index: ChangedFilesIndex) -> tuple[int, list[str]]:
+    """Return (exit code, stderr lines) for the changed-file index."""
+    if not index:
+        return 0, ["agent-response guard: no files provided; nothing to check."]
 
     errors: list[str] = []
-    for raw in files:
+    for raw in index:
         p = Path(raw)
         if not p.is_absolute():
-            p = args.root / p
+            p = root / p
         p = p.resolve()
         try:
             result = validate_file(p)
@@ -168,11 +159,15 @@ def main() -> int:
             continue
         errors.extend(result)
 
-    if errors:
-        for err in errors:
-            print(err, file=sys.stderr)
-        return 1
-    return 0
+    return (1 if errors else 0), errors
+
+
+def main() -> int:
+    args = parse_args()
+    code, messages = run_checks(args.root, ChangedFilesIndex(args.files or []))
+    for message in messages:
+        print(message, file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -5,9 +5,14 @@ from __future__ import annotations
 import argparse
 import re
 import sys
-from collections.abc import Iterable
 from pathlib import Path
 
+# changed_files sits next to this script; keep it importable under `python -m tools.testing...` too.
+if str(Path(__file__).resolve().parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import ChangedFilesIndex, normalise  # noqa: E402, F401 - re-exported
+
 IGNORED_PREFIXES = (
     "workspace/",
     "sandbox/",
@@ -34,18 +39,6 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def normalise(paths: Iterable[str]) -> list[str]:
-    normalised: list[str] = []
-    for raw in paths:
-        if raw is None:
-            continue
-        path = raw.strip()
-        if not path:
-            continue
-        normalised.append(path.replace("\\", "/"))
-    return normalised
-
-
 def should_ignore(path: str) -> bool:
     return any(path.startswith(prefix) for prefix in IGNORED_PREFIXES)
 
@@ -106,45 +99,38 @@ def validate_latest_row(rows: list[tuple[int, list[str]]]) -> list[str]:
     return errors
 
 
-def main() -> int:
-    args = parse_args()
-    changed = normalise(args.files or [])
-    if not changed:
-        return 0
+def run_checks(root: Path, index: ChangedFilesIndex) -> tuple[int, list[str]]:
+    """Return (exit code, stderr lines) for the changed-file index."""
+    if not index:
+        return 0, []
 
-    relevant = [path for path in changed if not should_ignore(path)]
+    relevant = index.excluding(IGNORED_PREFIXES)
     if not relevant:
-        return 0
+        return 0, []
 
-    change_log_path = args.root / REQUIRED_FILE
-    if REQUIRED_FILE not in changed:
-        print(
+    change_log_path = root / REQUIRED_FILE
+    if REQUIRED_FILE not in index:
+        messages = [
             "change-log guard: detected updates without a matching templates-and-examples/templates/change-logs/CHANGELOG-template.md entry",
-            file=sys.stderr,
-        )
-        print(
             "Include an updated row in templates-and-examples/templates/change-logs/CHANGELOG-template.md referencing impacted IDs.",
-            file=sys.stderr,
-        )
-        for path in relevant:
-            print(f"  - {path}", file=sys.stderr)
-        return 1
+        ]
+        messages.extend(f"  - {path}" for path in relevant)
+        return 1, messages
 
     if not change_log_path.exists():
-        print(
-            f"change-log guard: required file {REQUIRED_FILE} not found under {args.root}",
-            file=sys.stderr,
-        )
-        return 1
+        return 1, [f"change-log guard: required file {REQUIRED_FILE} not found under {root}"]
 
     rows = extract_change_rows(change_log_path.read_text(encoding="utf-8").splitlines())
     errors = validate_latest_row(rows)
-    if errors:
-        for message in errors:
-            print(message, file=sys.stderr)
-        return 1
+    return (1 if errors else 0), errors
 
-    return 0
+
+def main() -> int:
+    args = parse_args()
+    code, messages = run_checks(args.root, ChangedFilesIndex(args.files or []))
+    for message in messages:
+        print(message, file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,124 @@
+"""Shared index over the changed-file list consumed by the RJW-IDD guards.
+
+Paths are normalised once (stripped, forward slashes) and stored in a
+character trie so each guard's prefix tables (``docs/``, ``specs/``,
+``docs/decisions/DEC-`` ...) are answered by walking the prefix instead of
+re-scanning every path.
+"""
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+
+DIFF_FILTER = "ACMRTUXB"
+_TERMINAL = ""
+
+
+def normalise(paths: Iterable[str]) -> list[str]:
+    normalised: list[str] = []
+    for raw in paths or []:
+        if raw is None:
+            continue
+        path = raw.strip()
+        if not path:
+            continue
+        normalised.append(path.replace("\\", "/"))
+    return normalised
+
+
+def git_changed_files(root: Path, base_ref: str, head_ref: str) -> list[str]:
+    """Return the paths changed between two refs, as listed by the CI entrypoint."""
+    result = subprocess.run(
+        ["git", "-C", str(root), "diff", "--name-only", f"--diff-filter={DIFF_FILTER}", base_ref, head_ref],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()
+
+
+class ChangedFilesIndex:
+    """Normalised changed paths with trie-backed prefix queries.
+
+    Query results preserve the original diff order so guard messages list
+    paths exactly as git reported them.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._trie: dict[str, dict] = {}
+        self._prefix_cache: dict[str, list[str]] = {}
+        for path in normalise(paths):
+            if path in self._positions:
+                continue
+            self._positions[path] = len(self.paths)
+            self.paths.append(path)
+            node = self._trie
+            for char in path:
+                node = node.setdefault(char, {})
+            node[_TERMINAL] = path
+
+    @classmethod
+    def from_git(cls, root: Path, base_ref: str, head_ref: str) -> ChangedFilesIndex:
+        return cls(git_changed_files(root, base_ref, head_ref))
+
+    def __bool__(self) -> bool:
+        return bool(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._positions
+
+    def _node(self, prefix: str) -> dict | None:
+        node = self._trie
+        for char in prefix:
+            child = node.get(char)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def has_prefix(self, prefix: str) -> bool:
+        """True if any changed path starts with prefix."""
+        return self._node(prefix) is not None
+
+    def has_any_prefix(self, prefixes: Iterable[str]) -> bool:
+        return any(self.has_prefix(prefix) for prefix in prefixes)
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Changed paths starting with prefix, in diff order."""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+        found: list[str] = []
+        node = self._node(prefix)
+        if node is not None:
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                for key, child in current.items():
+                    if key == _TERMINAL:
+                        found.append(child)
+                    else:
+                        stack.append(child)
+        found.sort(key=self._positions.__getitem__)
+        self._prefix_cache[prefix] = found
+        return found
+
+    def with_any_prefix(self, prefixes: Iterable[str]) -> list[str]:
+        matched: set[str] = set()
+        for prefix in prefixes:
+            matched.update(self.with_prefix(prefix))
+        return sorted(matched, key=self._positions.__getitem__)
+
+    def excluding(self, prefixes: Iterable[str]) -> list[str]:
+        """Changed paths that start with none of the prefixes, in diff order."""
+        excluded = set(self.with_any_prefix(prefixes))
+        return [path for path in self.paths if path not in excluded]
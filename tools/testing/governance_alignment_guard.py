@@ -9,6 +9,12 @@ import sys
 from collections.abc import Iterable
 from pathlib import Path
 
+# changed_files sits next to this script; keep it importable under `python -m tools.testing...` too.
+if str(Path(__file__).resolve().parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import ChangedFilesIndex, normalise  # noqa: E402, F401 - re-exported
+
 IGNORED_PREFIXES = ("workspace/", "sandbox/", "tmp/")
 SPEC_PREFIX = "specs/"
 LEDGER_PREFIX = "artifacts/ledgers/"
@@ -38,18 +44,6 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def normalise(paths: Iterable[str]) -> list[str]:
-    normalised: list[str] = []
-    for raw in paths:
-        if raw is None:
-            continue
-        path = raw.strip()
-        if not path:
-            continue
-        normalised.append(path.replace("\\", "/"))
-    return normalised
-
-
 def filter_relevant(paths: Iterable[str]) -> list[str]:
     relevant: list[str] = []
     for path in paths:
@@ -112,16 +106,16 @@ def extract_decision_tokens(path: Path) -> tuple[set[str], bool]:
     return tokens, has_placeholder
 
 
-def main() -> int:
-    args = parse_args()
-    changed = filter_relevant(normalise(args.files or []))
-    if not changed:
-        return 0
+def run_checks(root: Path, index: ChangedFilesIndex) -> tuple[int, list[str]]:
+    """Return (exit code, stderr lines) for the changed-file index."""
+    # Governed prefixes never overlap IGNORED_PREFIXES, so the full index answers them directly
+    if not index.excluding(IGNORED_PREFIXES):
+        return 0, []
 
-    spec_changed = any(path.startswith(SPEC_PREFIX) for path in changed)
-    ledger_changed = any(path.startswith(LEDGER_PREFIX) for path in changed)
-    decision_changed = any(path.startswith(DECISION_PREFIX) for path in changed)
-    evidence_changed = any(path.startswith(EVIDENCE_PREFIX) for path in changed)
+    spec_changed = index.has_prefix(SPEC_PREFIX)
+    ledger_changed = index.has_prefix(LEDGER_PREFIX)
+    decision_changed = index.has_prefix(DECISION_PREFIX)
+    evidence_changed = index.has_prefix(EVIDENCE_PREFIX)
 
     errors: list[str] = []
 
@@ -135,9 +129,9 @@ def main() -> int:
             "governance guard: specification/evidence changes require a new docs/decisions/DEC-#### entry capturing the rationale."
         )
 
-    spec_updates = touched_spec_ids(changed)
+    spec_updates = touched_spec_ids(index.with_prefix(SPEC_PREFIX))
     if spec_updates:
-        ledger_path = args.root / LEDGER_PATH
+        ledger_path = root / LEDGER_PATH
         ledger_spec_ids, placeholders = extract_ledger_spec_ids(ledger_path)
         if placeholders:
             errors.append(
@@ -158,9 +152,9 @@ def main() -> int:
                 "governance guard: ledger spec_refs missing updated IDs: " + details
             )
 
-    decision_updates = touched_decision_ids(changed)
+    decision_updates = touched_decision_ids(index.with_prefix(DECISIONS_DIR.as_posix()))
     for rel_path, dec_id in decision_updates.items():
-        file_path = args.root / rel_path
+        file_path = root / rel_path
         if not file_path.exists():
             continue
         tokens, has_placeholder = extract_decision_tokens(file_path)
@@ -178,12 +172,15 @@ def main() -> int:
                 f"governance guard: {rel_path} references {', '.join(sorted(tokens))} but not its own id {dec_id}."
             )
 
-    if errors:
-        for message in errors:
-            print(message, file=sys.stderr)
-        return 1
+    return (1 if errors else 0), errors
+
 
-    return 0
+def main() -> int:
+    args = parse_args()
+    code, messages = run_checks(args.root, ChangedFilesIndex(args.files or []))
+    for message in messages:
+        print(message, file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover
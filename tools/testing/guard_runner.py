@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Run every tools/testing guard in one process against a shared changed-file index.
+
+The diff is computed (or the ``--files`` list normalised) once and indexed in
+a prefix trie; each guard then answers its prefix checks from that index
+instead of being spawned as its own Python process. Every guard runs even if
+an earlier one fails, its stderr messages are identical to the standalone
+script, and the exit status is 1 when any guard fails.
+
+Usage:
+  python tools/testing/guard_runner.py --root . --base-ref origin/main --head-ref HEAD
+  python tools/testing/guard_runner.py --root . --files path/a.py path/b.md --fail-on-placeholder
+  python tools/testing/guard_runner.py --root . --trace logs/perf/guards.trace.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(1, str(Path(__file__).resolve().parents[2]))
+
+import agent_response_guard  # noqa: E402
+import change_log_guard  # noqa: E402
+import governance_alignment_guard  # noqa: E402
+import living_docs_guard  # noqa: E402
+import red_green_guard  # noqa: E402
+from changed_files import ChangedFilesIndex  # noqa: E402
+
+if TYPE_CHECKING:
+    from tools.performance_monitor import Tracer
+
+
+class _NoopSpan:
+    """Span stand-in while ``--trace`` is off, so tools.performance_monitor is only imported on demand."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **fields: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@dataclass(frozen=True)
+class GuardSpec:
+    name: str
+    check: Callable[..., tuple[int, list[str]]]
+    options: tuple[str, ...] = ()
+
+
+@dataclass
+class GuardOutcome:
+    name: str
+    returncode: int
+    messages: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.returncode == 0
+
+
+# Same order as the guard steps in scripts/ci/entrypoint.py so combined output reads the same way
+GUARDS: tuple[GuardSpec, ...] = (
+    GuardSpec("red-green", red_green_guard.run_checks),
+    GuardSpec("change-log", change_log_guard.run_checks),
+    GuardSpec("living-docs", living_docs_guard.run_checks, ("fail_on_placeholder",)),
+    GuardSpec("agent-response", agent_response_guard.run_checks),
+    GuardSpec("governance", governance_alignment_guard.run_checks),
+)
+GUARD_NAMES = tuple(spec.name for spec in GUARDS)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path.cwd(),
+        help="Repository root passed to every guard.",
+    )
+    parser.add_argument(
+        "--files",
+        nargs="*",
+        help="Changed file paths relative to repository root; skips running git diff.",
+    )
+    parser.add_argument("--base-ref", default="origin/main", help="Baseline ref for git diff (default: origin/main).")
+    parser.add_argument("--head-ref", default="HEAD", help="Candidate ref for git diff (default: HEAD).")
+    parser.add_argument(
+        "--fail-on-placeholder",
+        action="store_true",
+        help="Forwarded to the living-docs guard.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=GUARD_NAMES,
+        help="Run a subset of guards (default: all).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the combined report as JSON on stdout.")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace-event JSON of the guard run to this path.")
+    return parser.parse_args(argv)
+
+
+def _span(tracer: Tracer | None, name: str) -> Any:
+    return tracer.span(name) if tracer is not None else _NOOP_SPAN
+
+
+def run_guards(
+    root: Path,
+    index: ChangedFilesIndex,
+    *,
+    fail_on_placeholder: bool = False,
+    only: list[str] | None = None,
+    tracer: Tracer | None = None,
+) -> list[GuardOutcome]:
+    """Run the selected guards against one index and collect their outcomes."""
+    options = {"fail_on_placeholder": fail_on_placeholder}
+    outcomes: list[GuardOutcome] = []
+    for spec in GUARDS:
+        if only and spec.name not in only:
+            continue
+        kwargs = {name: options[name] for name in spec.options}
+        with _span(tracer, f"guard:{spec.name}") as span:
+            start = time.perf_counter()
+            try:
+                returncode, messages = spec.check(root, index, **kwargs)
+            except Exception as exc:  # pragma: no cover - defensive
+                returncode, messages = 1, [f"{spec.name} guard: unexpected error: {exc}"]
+            span.set(returncode=returncode, messages=len(messages))
+        outcomes.append(GuardOutcome(spec.name, returncode, messages, time.perf_counter() - start))
+    return outcomes
+
+
+def format_report(outcomes: list[GuardOutcome], changed: int) -> str:
+    failed = [outcome.name for outcome in outcomes if not outcome.passed]
+    lines = [f"guard runner: {changed} changed file(s)"]
+    for outcome in outcomes:
+        status = "passed" if outcome.passed else "failed"
+        lines.append(f"  {outcome.name:15s} {status:7s} {outcome.duration * 1000:.1f}ms")
+    summary = f"guard runner: {len(outcomes) - len(failed)}/{len(outcomes)} guards passed"
+    if failed:
+        summary += f" (failed: {', '.join(failed)})"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    tracer: Tracer | None = None
+    if args.trace:
+        from tools.performance_monitor import Tracer
+
+        tracer = Tracer()
+    with _span(tracer, "changed-files") as span:
+        if args.files is not None:
+            index = ChangedFilesIndex(args.files)
+        else:
+            try:
+                index = ChangedFilesIndex.from_git(root, args.base_ref, args.head_ref)
+            except Exception as exc:
+                print(f"guard runner: could not diff {args.base_ref}..{args.head_ref}: {exc}", file=sys.stderr)
+                return 1
+        span.set(files=len(index))
+
+    if not index:
+        print("guard runner: no changes detected, skipping")
+        return 0
+
+    with _span(tracer, "guards"):
+        outcomes = run_guards(
+            root, index, fail_on_placeholder=args.fail_on_placeholder, only=args.only, tracer=tracer
+        )
+    if tracer is not None:
+        tracer.export_chrome_trace(args.trace)
+    for outcome in outcomes:
+        for message in outcome.messages:
+            print(message, file=sys.stderr)
+
+    if args.json:
+        payload = {
+            "changed_files": len(index),
+            "guards": [
+                {
+                    "name": outcome.name,
+                    "returncode": outcome.returncode,
+                    "duration": outcome.duration,
+                    "messages": outcome.messages,
+                }
+                for outcome in outcomes
+            ],
+        }
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_report(outcomes, len(index)))
+
+    return 0 if all(outcome.passed for outcome in outcomes) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
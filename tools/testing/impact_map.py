@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""Select the tests affected by a change from a cached dependency map.
+
+The map links every module under ``tools/`` and ``scripts/`` to the tests
+under ``tests/`` that reach it, either through imports (``tools.x``,
+``scripts.y`` or bare names imported after a ``sys.path`` insert) or by
+naming its file (``'entrypoint.py'`` passed to ``spec_from_file_location``
+or a subprocess). Data files (YAML, JSON, ...) are linked the same way, to
+the tests and modules that name them. Matching is deliberately generous: an
+extra test costs seconds, a missed one lets a regression through, so a
+changed file under ``tools/``, ``scripts/`` or ``tests/``, or a data file
+anywhere, that no test can be traced to selects the whole suite.
+
+When pytest-cov was run with ``--cov-context=test`` the resulting
+``.coverage`` data adds the files each test actually executed.
+
+Per-file scan results are cached in ``logs/ci/test_impact.json`` keyed by
+``(mtime_ns, size)`` so only edited files are re-parsed. The same file
+tracks full runs: the whole suite runs when no passing full run is
+recorded, every ``--full-every`` runs, once the last one is older than
+``--max-age`` hours, or when test infrastructure (conftest, pytest config,
+requirements) changes. A full run only counts once it has passed; the
+caller reports that with ``record_full_run`` (``--record-full-run``).
+
+Usage:
+  python tools/testing/impact_map.py --root . --files tools/config_loader.py
+  python tools/testing/impact_map.py --root . --base-ref origin/main --head-ref HEAD --json
+  python tools/testing/impact_map.py --root . --record-full-run
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import git_changed_files, normalise  # noqa: E402
+
+SOURCE_DIRS = ("tools", "scripts")
+TEST_DIR = "tests"
+MAP_FILENAME = "test_impact.json"
+MAP_VERSION = 2
+FULL_RUN_EVERY = 20
+FULL_RUN_MAX_AGE_HOURS = 24.0
+# Changes to these re-run everything; they shape how every test runs
+FULL_RUN_TRIGGERS = (
+    "conftest.py",
+    "tests/conftest.py",
+    "pyproject.toml",
+    "pytest.ini",
+    "setup.cfg",
+    "tox.ini",
+    "requirements",
+)
+DATA_SUFFIXES = (".json", ".yml", ".yaml", ".toml", ".csv", ".ini", ".cfg", ".txt")
+REFERENCED_SUFFIXES = (".py", ".sh", *DATA_SUFFIXES)
+# Changes here must be traceable to a test, or everything runs
+MAPPED_DIRS = (*SOURCE_DIRS, TEST_DIR)
+SKIP_DIRS = {"__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache"}
+
+
+def _iter_python_files(root: Path, top: str) -> Iterable[str]:
+    stack = [root / top]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                    stack.append(Path(entry.path))
+            elif entry.name.endswith(".py"):
+                yield Path(entry.path).relative_to(root).as_posix()
+
+
+def _package_of(relative: str) -> list[str]:
+    parts = relative[: -len(".py")].split("/")
+    return parts[:-1]
+
+
+def scan_source(text: str, relative: str) -> dict[str, list[str]]:
+    """Extract imported module names and referenced file names from source."""
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return {"imports": [], "refs": []}
+
+    imports: set[str] = set()
+    refs: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                package = _package_of(relative)
+                base_parts = package[: len(package) - node.level + 1] if node.level > 1 else package
+                base = ".".join(part for part in [*base_parts, node.module or ""] if part)
+            else:
+                base = node.module or ""
+            if base:
+                imports.add(base)
+            # ``from pkg import name`` may import a submodule
+            imports.update(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            value = node.value.strip()
+            if value.endswith(REFERENCED_SUFFIXES) and "\n" not in value and len(value) < 200:
+                refs.add(value.replace("\\", "/").rsplit("/", 1)[-1])
+    return {"imports": sorted(imports), "refs": sorted(refs)}
+
+
+@dataclass
+class Selection:
+    tests: list[str]
+    full: bool
+    reason: str
+    changed: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"tests": self.tests, "full": self.full, "reason": self.reason, "changed": len(self.changed)}
+
+
+class ImpactMap:
+    """Import/reference graph from tests to ``tools/`` and ``scripts/`` modules."""
+
+    def __init__(self, root: Path, cache_path: Path | None = None):
+        self.root = root
+        self.cache_path = cache_path
+        self.files: dict[str, dict[str, Any]] = {}
+        self.state: dict[str, Any] = {}
+        self.coverage: dict[str, list[str]] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != MAP_VERSION:
+            return
+        self.files = payload.get("files") or {}
+        self.state = payload.get("state") or {}
+        self.coverage = payload.get("coverage") or {}
+
+    def save(self) -> None:
+        if self.cache_path is None or not self.dirty:
+            return
+        payload = {"version": MAP_VERSION, "state": self.state, "coverage": self.coverage, "files": self.files}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(payload, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self.dirty = False
+
+    def refresh(self) -> int:
+        """Re-scan files whose (mtime_ns, size) changed; returns how many were parsed."""
+        seen: set[str] = set()
+        parsed = 0
+        for top in (*SOURCE_DIRS, TEST_DIR):
+            for relative in _iter_python_files(self.root, top):
+                seen.add(relative)
+                try:
+                    stat = (self.root / relative).stat()
+                except OSError:
+                    continue
+                signature = [stat.st_mtime_ns, stat.st_size]
+                entry = self.files.get(relative)
+                if entry is not None and entry.get("sig") == signature:
+                    continue
+                try:
+                    text = (self.root / relative).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    text = ""
+                self.files[relative] = {"sig": signature, **scan_source(text, relative)}
+                parsed += 1
+        for relative in set(self.files) - seen:
+            del self.files[relative]
+            parsed += 1
+        if parsed:
+            self.dirty = True
+        return parsed
+
+    def _module_index(self) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+        by_name: dict[str, set[str]] = {}
+        by_basename: dict[str, set[str]] = {}
+        for relative in self.files:
+            if relative.startswith(f"{TEST_DIR}/"):
+                continue
+            parts = relative[: -len(".py")].split("/")
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            # Every dotted suffix, so bare imports after a sys.path insert resolve too
+            for start in range(len(parts)):
+                by_name.setdefault(".".join(parts[start:]), set()).add(relative)
+            by_basename.setdefault(relative.rsplit("/", 1)[-1], set()).add(relative)
+        return by_name, by_basename
+
+    def edges(self) -> dict[str, set[str]]:
+        """Direct dependencies of every scanned file on repository modules."""
+        by_name, by_basename = self._module_index()
+        graph: dict[str, set[str]] = {}
+        for relative, entry in self.files.items():
+            deps: set[str] = set()
+            for name in entry.get("imports", []):
+                deps.update(by_name.get(name, ()))
+            for ref in entry.get("refs", []):
+                deps.update(by_basename.get(ref, ()))
+            deps.discard(relative)
+            graph[relative] = deps
+        return graph
+
+    def tests(self) -> list[str]:
+        return sorted(
+            relative
+            for relative in self.files
+            if relative.startswith(f"{TEST_DIR}/") and relative.rsplit("/", 1)[-1].startswith("test_")
+        )
+
+    def reachable(self) -> dict[str, set[str]]:
+        """Every repository module each test reaches, transitively."""
+        graph = self.edges()
+        result: dict[str, set[str]] = {}
+        for test in self.tests():
+            seen: set[str] = set()
+            stack = list(graph.get(test, ()))
+            while stack:
+                current = stack.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                stack.extend(graph.get(current, ()))
+            seen.update(self.coverage.get(test, ()))
+            result[test] = seen
+        return result
+
+    def merge_coverage(self, data_file: Path) -> bool:
+        """Add test -> executed-file edges from a ``.coverage`` file with test contexts."""
+        try:
+            from coverage import CoverageData
+        except ImportError:
+            return False
+        if not data_file.exists():
+            return False
+        data = CoverageData(basename=str(data_file))
+        data.read()
+        mapping: dict[str, set[str]] = {}
+        for measured in data.measured_files():
+            try:
+                relative = Path(measured).resolve().relative_to(self.root.resolve()).as_posix()
+            except ValueError:
+                continue
+            if not relative.startswith(tuple(f"{top}/" for top in SOURCE_DIRS)):
+                continue
+            for contexts in (data.contexts_by_lineno(measured) or {}).values():
+                for context in contexts:
+                    test = context.split("::", 1)[0]
+                    if test.startswith(f"{TEST_DIR}/"):
+                        mapping.setdefault(test, set()).add(relative)
+        self.coverage = {test: sorted(files) for test, files in mapping.items()}
+        self.dirty = True
+        return True
+
+    def _tests_by_change(self, changed: Iterable[str]) -> dict[str, set[str]]:
+        """The tests each changed path leads to; data files count through the files naming them."""
+        tests = set(self.tests())
+        reachable = self.reachable()
+        referrers: dict[str, set[str]] = {}
+        for relative, entry in self.files.items():
+            for ref in entry.get("refs", []):
+                referrers.setdefault(ref, set()).add(relative)
+        result: dict[str, set[str]] = {}
+        for path in changed:
+            targets = {path}
+            if not path.endswith(".py"):
+                targets |= referrers.get(path.rsplit("/", 1)[-1], set())
+            selected = targets & tests
+            for test, modules in reachable.items():
+                if modules & targets:
+                    selected.add(test)
+            result[path] = selected
+        return result
+
+    def affected_tests(self, changed: Iterable[str]) -> list[str]:
+        selected: set[str] = set()
+        for tests in self._tests_by_change(normalise(changed)).values():
+            selected |= tests
+        return sorted(selected)
+
+    def unmapped(self, changed: Iterable[str]) -> list[str]:
+        """Changed code, tests or data files that no test can be traced to."""
+        return [
+            path
+            for path, tests in self._tests_by_change(normalise(changed)).items()
+            if not tests and (path.startswith(tuple(f"{top}/" for top in MAPPED_DIRS)) or path.endswith(DATA_SUFFIXES))
+        ]
+
+    def _full_run_reason(self, changed: list[str], full_every: int, max_age_hours: float) -> str | None:
+        for path in changed:
+            if path.startswith(FULL_RUN_TRIGGERS) or path.rsplit("/", 1)[-1] == "conftest.py":
+                return f"test infrastructure changed: {path}"
+        last_full = self.state.get("last_full_run")
+        if last_full is None:
+            return "no previous full run recorded"
+        if full_every and self.state.get("runs_since_full", 0) + 1 >= full_every:
+            return f"periodic full run (every {full_every} runs)"
+        if max_age_hours and time.time() - float(last_full) > max_age_hours * 3600:
+            return f"last full run older than {max_age_hours:g}h"
+        return None
+
+    def select(
+        self,
+        changed: Iterable[str],
+        *,
+        full_every: int = FULL_RUN_EVERY,
+        max_age_hours: float = FULL_RUN_MAX_AGE_HOURS,
+        force_full: bool = False,
+        record: bool = True,
+    ) -> Selection:
+        """Choose the tests for this change and (optionally) record the run."""
+        changed_paths = normalise(changed)
+        self.refresh()
+        reason = "forced full run" if force_full else self._full_run_reason(changed_paths, full_every, max_age_hours)
+        if reason is None:
+            unmapped = self.unmapped(changed_paths)
+            if unmapped:
+                more = f" (+{len(unmapped) - 1} more)" if len(unmapped) > 1 else ""
+                reason = f"no test maps to {unmapped[0]}{more}"
+        if reason is not None:
+            # The full-run clock only resets once the run passes (record_full_run)
+            return Selection(self.tests(), True, reason, changed_paths)
+        tests = self.affected_tests(changed_paths)
+        if record:
+            self.state["runs_since_full"] = self.state.get("runs_since_full", 0) + 1
+            self.dirty = True
+        return Selection(tests, False, f"{len(tests)} of {len(self.tests())} test file(s) affected", changed_paths)
+
+    def record_full_run(self) -> None:
+        self.state["last_full_run"] = time.time()
+        self.state["runs_since_full"] = 0
+        self.dirty = True
+
+
+def select_tests(
+    root: Path,
+    changed: Iterable[str],
+    *,
+    cache_path: Path | None = None,
+    coverage_file: Path | None = None,
+    **options: Any,
+) -> Selection:
+    """Build or refresh the map under ``cache_path`` and select tests for ``changed``."""
+    impact = ImpactMap(root, cache_path)
+    if coverage_file is not None:
+        impact.merge_coverage(coverage_file)
+    selection = impact.select(changed, **options)
+    impact.save()
+    return selection
+
+
+def record_full_run(root: Path, cache_path: Path) -> None:
+    """Note that the whole suite just passed, restarting the periodic full-run clock."""
+    impact = ImpactMap(root, cache_path)
+    impact.record_full_run()
+    impact.save()
+
+
+def _default_cache_path(root: Path) -> Path:
+    return root / "logs" / "ci" / MAP_FILENAME
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--root", type=Path, default=Path.cwd(), help="Repository root (default: cwd).")
+    parser.add_argument("--files", nargs="*", help="Changed paths; skips running git diff.")
+    parser.add_argument("--base-ref", default="origin/main", help="Baseline ref for git diff (default: origin/main).")
+    parser.add_argument("--head-ref", default="HEAD", help="Candidate ref for git diff (default: HEAD).")
+    parser.add_argument("--cache", type=Path, help=f"Map cache (default: logs/ci/{MAP_FILENAME}).")
+    parser.add_argument("--coverage-file", type=Path, help="pytest-cov data recorded with --cov-context=test.")
+    parser.add_argument("--full-every", type=int, default=FULL_RUN_EVERY, help="Force a full run every N runs.")
+    parser.add_argument(
+        "--max-age", type=float, default=FULL_RUN_MAX_AGE_HOURS, help="Force a full run after this many hours."
+    )
+    parser.add_argument("--full", action="store_true", help="Select every test.")
+    parser.add_argument("--dry-run", action="store_true", help="Do not record this run in the cache.")
+    parser.add_argument(
+        "--record-full-run", action="store_true", help="Record that the whole suite has just passed, then exit."
+    )
+    parser.add_argument("--json", action="store_true", help="Print the selection as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    if args.record_full_run:
+        record_full_run(root, args.cache or _default_cache_path(root))
+        return 0
+    if args.files is not None:
+        changed = args.files
+    else:
+        try:
+            changed = git_changed_files(root, args.base_ref, args.head_ref)
+        except Exception as exc:
+            print(f"impact map: could not diff {args.base_ref}..{args.head_ref}: {exc}", file=sys.stderr)
+            return 1
+
+    selection = select_tests(
+        root,
+        changed,
+        cache_path=args.cache or _default_cache_path(root),
+        coverage_file=args.coverage_file,
+        full_every=args.full_every,
+        max_age_hours=args.max_age,
+        force_full=args.full,
+        record=not args.dry_run,
+    )
+    if args.json:
+        print(json.dumps(selection.to_dict(), indent=2))
+    else:
+        print(f"impact map: {selection.reason}", file=sys.stderr)
+        for test in selection.tests:
+            print(test)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -7,6 +7,12 @@ import sys
 from collections.abc import Iterable
 from pathlib import Path
 
+# changed_files sits next to this script; keep it importable under `python -m tools.testing...` too.
+if str(Path(__file__).resolve().parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import ChangedFilesIndex, normalise  # noqa: E402, F401 - re-exported
+
 TARGET_FILE = Path("docs/living-docs-reconciliation.md")
 PLACEHOLDER_TOKEN = "YYYY-MM-DD"
 STATUS_TOKEN = "| open |"
@@ -37,43 +43,35 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def normalise(paths: Iterable[str]) -> list[str]:
-    normalised: list[str] = []
-    for raw in paths:
-        if raw is None:
-            continue
-        path = raw.strip()
-        if not path:
-            continue
-        normalised.append(path.replace("\\", "/"))
-    return normalised
+def classify_index(index: ChangedFilesIndex) -> tuple[list[str], list[str]]:
+    ignored = set(index.with_any_prefix(IGNORED_PREFIXES))
+    doc_updates = [
+        path
+        for path in index.with_any_prefix(DOC_PATH_PREFIXES)
+        if path not in ignored and path not in DOC_EXEMPTIONS
+    ]
+    documented = set(doc_updates)
+    non_doc = [
+        path
+        for path in index.excluding(IGNORED_PREFIXES)
+        if path not in documented and path not in DOC_EXEMPTIONS
+    ]
+    return doc_updates, non_doc
 
 
 def classify_changes(paths: Iterable[str]) -> tuple[list[str], list[str]]:
-    doc_updates: list[str] = []
-    relevant: list[str] = []
-    for path in paths:
-        if any(path.startswith(prefix) for prefix in IGNORED_PREFIXES):
-            continue
-        relevant.append(path)
-        if any(path.startswith(prefix) for prefix in DOC_PATH_PREFIXES) and path not in DOC_EXEMPTIONS:
-            doc_updates.append(path)
-    non_doc = [path for path in relevant if path not in doc_updates and path not in DOC_EXEMPTIONS]
-    return doc_updates, non_doc
+    return classify_index(ChangedFilesIndex(paths))
 
 
-def main() -> int:
-    args = parse_args()
-    target = args.root / TARGET_FILE
+def run_checks(
+    root: Path, index: ChangedFilesIndex, fail_on_placeholder: bool = False
+) -> tuple[int, list[str]]:
+    """Return (exit code, stderr lines) for the changed-file index."""
+    target = root / TARGET_FILE
     if not target.exists():
-        print(
-            f"living-doc guard: expected {TARGET_FILE} under {args.root}, but it was not found",
-            file=sys.stderr,
-        )
-        return 1
+        return 1, [f"living-doc guard: expected {TARGET_FILE} under {root}, but it was not found"]
 
-    changed = normalise(args.files or [])
-    doc_updates, non_doc_changes = classify_changes(changed)
+    doc_updates, non_doc_changes = classify_index(index)
 
     open_rows: list[str] = []
     placeholder_present = False
@@ -85,42 +83,43 @@ def main() -> int:
                 continue
             if PLACEHOLDER_TOKEN in stripped:
                 placeholder_present = True
-                if args.fail_on_placeholder and STATUS_TOKEN in stripped:
+                if fail_on_placeholder and STATUS_TOKEN in stripped:
                     open_rows.append(stripped)
                 continue
             if STATUS_TOKEN in stripped:
                 open_rows.append(stripped)
 
     if open_rows:
-        print(
-            "living-doc guard: outstanding documentation gaps detected. Close or remove them before merging.",
-            file=sys.stderr,
-        )
-        for row in open_rows:
-            print(f"  - {row}", file=sys.stderr)
-        return 1
-
-    if args.fail_on_placeholder and placeholder_present:
-        print(
-            "living-doc guard: remove the placeholder row from docs/living-docs-reconciliation.md",
-            file=sys.stderr,
-        )
-        return 1
+        messages = [
+            "living-doc guard: outstanding documentation gaps detected. Close or remove them before merging."
+        ]
+        messages.extend(f"  - {row}" for row in open_rows)
+        return 1, messages
+
+    if fail_on_placeholder and placeholder_present:
+        return 1, ["living-doc guard: remove the placeholder row from docs/living-docs-reconciliation.md"]
 
     if non_doc_changes and not doc_updates:
-        print(
-            "living-doc guard: detected implementation/spec/research updates without accompanying documentation changes.",
-            file=sys.stderr,
+        messages = [
+            "living-doc guard: detected implementation/spec/research updates without accompanying documentation changes."
+        ]
+        messages.extend(f"  - {path}" for path in non_doc_changes)
+        messages.append(
+            "Update a doc/spec/runbook (or log the gap in the reconciliation table) as part of this change."
         )
-        for path in non_doc_changes:
-            print(f"  - {path}", file=sys.stderr)
-        print(
-            "Update a doc/spec/runbook (or log the gap in the reconciliation table) as part of this change.",
-            file=sys.stderr,
-        )
-        return 1
+        return 1, messages
+
+    return 0, []
 
-    return 0
+
+def main() -> int:
+    args = parse_args()
+    code, messages = run_checks(
+        args.root, ChangedFilesIndex(args.files or []), fail_on_placeholder=args.fail_on_placeholder
+    )
+    for message in messages:
+        print(message, file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -7,6 +7,12 @@ import sys
 from collections.abc import Iterable
 from pathlib import Path
 
+# changed_files sits next to this script; keep it importable under `python -m tools.testing...` too.
+if str(Path(__file__).resolve().parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from changed_files import ChangedFilesIndex  # noqa: E402
+
 TEST_INDICATORS = ("tests/", "test_", "_test.py", "Test.")
 
 
@@ -47,14 +53,18 @@ def validate_files(root: Path, files: list[str]) -> list[str]:
     return errors
 
 
+def run_checks(root: Path, index: ChangedFilesIndex) -> tuple[int, list[str]]:
+    """Return (exit code, stderr lines) for the changed-file index."""
+    errors = validate_files(root.resolve(), index.paths)
+    return (1 if errors else 0), errors
+
+
 def main() -> int:
     args = parse_args()
-    errors = validate_files(args.root.resolve(), args.files)
-    if errors:
-        for message in errors:
-            print(message, file=sys.stderr)
-        return 1
-    return 0
+    code, messages = run_checks(args.root, ChangedFilesIndex(args.files or []))
+    for message in messages:
+        print(message, file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover